@@ -0,0 +1,32 @@
+"""
+ASGI config for AppV1 project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+"""
+import os
+from django.core.asgi import get_asgi_application
+from channels.routing import ProtocolTypeRouter, URLRouter
+
+
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'AppV1.settings')
+# Primero se inicializa Django: las rutas importan consumers que usan modelos
+django_asgi_app = get_asgi_application()
+
+from AppV1.autenticacion import JWTAuthMiddlewareStack  # noqa: E402
+from AppV1.routing import websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app, # Manejo de peticiones HTTP
+    "websocket": JWTAuthMiddlewareStack( # Manejo de WebSockets (sesión o ?token=<access>)
+        URLRouter(
+            websocket_urlpatterns # Rutas de WebSocket
+        )
+    ),
+})
+
+
+
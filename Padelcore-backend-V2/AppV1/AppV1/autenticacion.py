@@ -0,0 +1,48 @@
+# AppV1/autenticacion.py
+"""
+Autenticación JWT para los WebSockets.
+
+El API REST y el frontend se autentican con JWT (rest_framework_simplejwt),
+no con sesión, así que con sólo AuthMiddlewareStack un usuario que únicamente
+tiene su token llega como anónimo. El cliente manda el token de acceso en la
+query de la conexión:
+
+    ws://.../ws/partidos/<id>/marcador/?token=<access>
+
+Si el token es válido, scope["user"] es su usuario; si no viene o no es
+válido, queda el de la sesión (o AnonymousUser).
+"""
+from urllib.parse import parse_qs
+
+from channels.auth import AuthMiddlewareStack
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+
+@database_sync_to_async
+def usuario_del_token(token):
+    """Usuario activo dueño del token de acceso, o None."""
+    autenticacion = JWTAuthentication()
+    try:
+        return autenticacion.get_user(autenticacion.get_validated_token(token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """Pone en scope["user"] al dueño del ?token= de la conexión."""
+
+    async def __call__(self, scope, receive, send):
+        token = parse_qs(scope.get("query_string", b"").decode()).get("token")
+        if token:
+            user = await usuario_del_token(token[0])
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await super().__call__(scope, receive, send)
+
+
+def JWTAuthMiddlewareStack(inner):
+    # La sesión primero; si viene un token válido, manda el token
+    return AuthMiddlewareStack(JWTAuthMiddleware(inner))
@@ -0,0 +1,118 @@
+# AppV1/condicional.py
+"""
+GET condicional (ETag / Last-Modified) para list y retrieve.
+
+Los validadores salen sólo de las filas que se van a servir, sin serializar
+nada: en list, la ventana de la página (el mismo range scan por índice que
+usa KeysetPagination, con su cursor y LIMIT) leyendo (pk, campo de
+modificación); en retrieve, la fila del id. Las altas, bajas y ediciones
+dentro de la página cambian el ETag; las de fuera no. Si el cliente manda
+If-None-Match / If-Modified-Since y no hubo cambios se responde 304 vacío.
+
+Cada viewset define `campo_modificado` (un DateTimeField con auto_now) y,
+si su payload incluye datos de otros modelos, `dependencias`: rutas de
+lookup al campo de modificación del relacionado
+('equipo_1__modifiedU'). Su MAX y COUNT se calculan sólo sobre las filas
+servidas, en una consulta.
+
+Los cambios de un ManyToMany (tags, equipos) no pasan por auto_now: el
+modelo dueño toca su campo de modificación con tocar_en_m2m().
+
+Last-Modified tiene resolución de segundos y no ve los borrados; el ETag
+sí, y cuando vienen los dos encabezados manda If-None-Match.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    campo_modificado = None
+    dependencias = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if hasattr(self.paginator, 'ventana'):
+            queryset = self.paginator.ventana(queryset, request)
+        filas = list(queryset.values_list('pk', self.campo_modificado))
+        validadores = self._validadores('list', filas)
+        response = self._no_modificado(validadores) or super().list(request, *args, **kwargs)
+        return self._con_validadores(response, validadores)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            filas = list(
+                queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list('pk', self.campo_modificado)[:1]
+            )
+        except (TypeError, ValueError, ValidationError):
+            filas = []  # Id mal formado: que responda el retrieve normal (404)
+        if not filas:
+            return super().retrieve(request, *args, **kwargs)
+        validadores = self._validadores(self.kwargs[lookup_url_kwarg], filas)
+        response = self._no_modificado(validadores) or super().retrieve(request, *args, **kwargs)
+        return self._con_validadores(response, validadores)
+
+    def _validadores(self, clave, filas):
+        """(etag, last_modified como timestamp) de las filas (pk, modificado) servidas y sus dependencias."""
+        partes = [self.request.accepted_renderer.format, str(clave)]
+        partes += [f"{pk}@{modificado}" for pk, modificado in filas]
+        fechas = [modificado for _, modificado in filas]
+        if self.dependencias and filas:
+            agregados = {}
+            for i, ruta in enumerate(self.dependencias):
+                relacion = ruta.rsplit('__', 1)[0]
+                agregados[f'ultimo_{i}'] = Max(ruta)
+                agregados[f'total_{i}'] = Count(relacion, distinct=True)
+            agregado = self.get_queryset().model.objects.filter(
+                pk__in=[pk for pk, _ in filas],
+            ).aggregate(**agregados)
+            for i in range(len(self.dependencias)):
+                partes += [str(agregado[f'total_{i}']), str(agregado[f'ultimo_{i}'])]
+                fechas.append(agregado[f'ultimo_{i}'])
+        etag = 'W/"%s"' % hashlib.md5(':'.join(partes).encode()).hexdigest()
+        fechas = [f for f in fechas if f is not None]
+        return etag, int(max(fechas).timestamp()) if fechas else None
+
+    def _no_modificado(self, validadores):
+        """304 si el cliente ya tiene esta versión; None si hay que responder completo."""
+        etag, last_modified = validadores
+        return get_conditional_response(self.request, etag=etag, last_modified=last_modified)
+
+    def _con_validadores(self, response, validadores):
+        etag, last_modified = validadores
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            # Sin esto el navegador podría reusar la copia sin preguntar
+            patch_cache_control(response, no_cache=True)
+        return response
+
+
+def tocar_en_m2m(modelo, campo, sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Para llamarse desde un receiver de m2m_changed con sus mismos kwargs:
+    actualiza `campo`, el auto_now del dueño de la relación, en las filas de
+    `modelo` afectadas, con un UPDATE que no dispara post_save.
+    """
+    if not reverse:
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        ids = [instance.pk]
+    elif action in ('post_add', 'post_remove'):
+        ids = list(pk_set)  # tag.torneos.add(...): instance es el otro lado
+    elif action == 'pre_clear':
+        # Desde el otro lado Django no manda los ids: se leen antes de borrar
+        hacia_dueno = next(f.name for f in sender._meta.fields if f.related_model is modelo)
+        hacia_otro = next(f.name for f in sender._meta.fields if f.related_model is type(instance))
+        ids = sender.objects.filter(**{hacia_otro: instance}).values(hacia_dueno)
+    else:
+        return
+    modelo.objects.filter(pk__in=ids).update(**{campo: timezone.now()})
@@ -0,0 +1,175 @@
+# AppV1/pagination.py
+"""
+Paginación por llave (keyset / cursor) sobre llaves compuestas.
+
+A diferencia de LIMIT/OFFSET, cada página filtra "después de la última fila
+vista" sobre un índice de la BD, así que la página N cuesta lo mismo que la 1.
+El cursor es opaco para el cliente: sólo sigue los links next/previous.
+
+Cada viewset usa una subclase que define `ordering`. El último campo debe
+ser único (normalmente el id) para que el orden sea estable, y debería
+existir un índice con esos mismos campos.
+"""
+import base64
+import datetime
+import json
+from uuid import UUID
+
+from django.db.models import Q
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    ordering = ('-id',)
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor['r'])
+
+        results = list(self.ventana(queryset, request))
+        hay_mas = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_previous, self.has_next = hay_mas, True
+        else:
+            self.has_previous, self.has_next = cursor is not None, hay_mas
+
+        self.page = results
+        return results
+
+    def ventana(self, queryset, request):
+        """
+        Las filas de la página que pide `request`, más la que decide si hay
+        siguiente, como queryset sin evaluar (orden del índice, cursor y LIMIT).
+        """
+        cursor = self.decode_cursor(request)
+        ordering = self._ordering(bool(cursor and cursor['r']))
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self._despues_de(cursor['v'], ordering))
+        return queryset[:self.get_page_size(request) + 1]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Página vacía: regresar al inicio
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    # -- Cursor ---------------------------------------------------------------
+
+    def encode_cursor(self, obj, reverse):
+        valores = [_a_json(_valor(obj, campo.lstrip('-'))) for campo in self.ordering]
+        raw = json.dumps({'v': valores, 'r': int(reverse)}, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(raw.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            if len(cursor['v']) != len(self.ordering):
+                raise ValueError
+            cursor['r'] = bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    # -- Filtro ---------------------------------------------------------------
+
+    def _ordering(self, reverse):
+        if not reverse:
+            return list(self.ordering)
+        return [c[1:] if c.startswith('-') else f'-{c}' for c in self.ordering]
+
+    def _despues_de(self, valores, ordering):
+        """
+        (a, b, c) > (x, y, z) expandido a
+        a > x  OR  (a = x AND b > y)  OR  (a = x AND b = y AND c > z),
+        más una cota a >= x para que la BD haga un range scan del índice.
+        """
+        campos = [c.lstrip('-') for c in ordering]
+        lookups = ['lt' if c.startswith('-') else 'gt' for c in ordering]
+
+        condicion = Q()
+        for i, campo in enumerate(campos):
+            q = Q(**{f'{campo}__{lookups[i]}': valores[i]})
+            for anterior, valor in zip(campos[:i], valores[:i]):
+                q &= Q(**{anterior: valor})
+            condicion |= q
+        cota = Q(**{f'{campos[0]}__{lookups[0]}e': valores[0]})
+        return cota & condicion
+
+
+class ConteoMixin:
+    """
+    GET <listado>/conteo/ => {"count": n}, con los mismos filtros que el listado.
+    La paginación por llave no cuenta filas; quien sólo necesita el total lo
+    pide aquí en lugar de recorrer las páginas. El get_queryset del viewset
+    debe aplicar sus filtros también cuando action == 'conteo'.
+    """
+
+    @action(detail=False, methods=['get'])
+    def conteo(self, request):
+        return Response({"count": self.filter_queryset(self.get_queryset()).count()})
+
+
+def _valor(obj, campo):
+    for parte in campo.split('__'):
+        obj = getattr(obj, parte)
+    return obj
+
+
+def _a_json(valor):
+    if isinstance(valor, (datetime.date, datetime.time)):  # incluye datetime
+        return valor.isoformat()
+    if isinstance(valor, UUID):
+        return str(valor)
+    return valor
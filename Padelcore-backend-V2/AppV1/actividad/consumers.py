@@ -0,0 +1,48 @@
+import json
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+from . import outbox
+
+class ActividadConsumer(AsyncWebsocketConsumer):
+    """
+    ws/actividad/?since=<seq>
+    Con `since`, al conectarse primero recibe lo que pasó después de ese seq
+    (o {"recargar": true} si ya no se puede armar) y luego lo nuevo.
+    """
+
+    async def connect(self):
+        # Te suscribes a un grupo "actividad"
+        await self.channel_layer.group_add("actividad", self.channel_name)
+        await self.accept()
+
+        self.seq = 0  # Último seq mandado a este cliente, para no repetir
+        since = parse_qs(self.scope.get('query_string', b'').decode()).get('since', [''])[0]
+        if since.isdigit():
+            perdidos = await database_sync_to_async(outbox.desde)("actividad", int(since))
+            if perdidos is None:
+                await self.send(text_data=json.dumps({"recargar": True}))
+                return
+            self.seq = int(since)
+            for data in perdidos:
+                await self.actividad_message({"data": data})
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard("actividad", self.channel_name)
+
+    async def receive(self, text_data):
+        # Si deseas procesar mensajes del cliente al servidor
+        pass
+
+    # Función para manejar mensajes: "type": "actividad_message"
+    async def actividad_message(self, event):
+        data = event['data']
+        # Lo que llegó en vivo mientras se mandaba el replay ya se mandó
+        if data.get('seq') is not None:
+            if data['seq'] <= self.seq:
+                return
+            self.seq = data['seq']
+        # Mandamos el JSON al front
+        await self.send(text_data=json.dumps(data))
@@ -0,0 +1,57 @@
+# actividad/management/commands/cleanup_actividad.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from datetime import timedelta
+
+from actividad.models import ActividadReciente, Evento
+
+class Command(BaseCommand):
+    help = ('Elimina por lotes las actividades (y los eventos ya enviados del outbox) '
+            'fuera de la ventana de retención. Si se interrumpe, basta con volver a correrlo.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2,
+                            help='Días de actividad que se conservan (default 2)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Filas por lote de borrado (default 1000)')
+        parser.add_argument('--pausa', type=float, default=0,
+                            help='Segundos de espera entre lotes para no competir con el tráfico (default 0)')
+
+    def handle(self, *args, **options):
+        # 1) Calcula la fecha límite
+        limite = timezone.now() - timedelta(days=options['days'])
+
+        # 2) Borra por lotes cortos, los más viejos primero. Cada lote es su propia
+        #    transacción: los locks duran un lote y lo borrado no se pierde si se corta.
+        actividades = self.borrar(
+            ActividadReciente.objects.filter(fecha__lte=limite).order_by('fecha', 'id'), options,
+        )
+        # Los pendientes de mandar no se tocan aunque sean viejos, y el último de cada
+        # grupo se queda para que su seq siga contando desde ahí
+        ultimos = [
+            Evento.objects.filter(grupo=grupo, seq__isnull=False).order_by('-seq').values_list('pk', flat=True)[0]
+            for grupo in Evento.objects.filter(seq__isnull=False).values_list('grupo', flat=True).distinct()
+        ]
+        eventos = self.borrar(
+            Evento.objects.filter(enviado_en__lte=limite).exclude(pk__in=ultimos).order_by('enviado_en', 'id'),
+            options,
+        )
+
+        # 3) Mensaje en consola
+        self.stdout.write(self.style.SUCCESS(
+            f'Se eliminaron {actividades} actividades y {eventos} eventos con más de {options["days"]} días'
+        ))
+
+    def borrar(self, viejas, options):
+        total = 0
+        while True:
+            ids = list(viejas.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                return total
+            viejas.model.objects.filter(pk__in=ids).delete()
+            total += len(ids)
+            if options['pausa']:
+                time.sleep(options['pausa'])
@@ -0,0 +1,49 @@
+# actividad/management/commands/relevar_eventos.py
+
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from actividad import outbox
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = ('Relay del outbox: manda a Channels los eventos confirmados, en lotes y en '
+            'orden. Corre hasta que se detenga (o usa --una-vez).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Eventos que se mandan por pasada (default 500)')
+        parser.add_argument('--intervalo', type=float, default=0.2,
+                            help='Segundos de espera cuando no hay eventos (default 0.2)')
+        parser.add_argument('--ventana', type=float, default=outbox.VENTANA,
+                            help=f'Segundos que se juntan las ráfagas de actividad (default {outbox.VENTANA})')
+        parser.add_argument('--max-rafaga', type=int, default=outbox.MAX_RAFAGA,
+                            help=f'Eventos que cierran una ráfaga antes de la ventana (default {outbox.MAX_RAFAGA})')
+        parser.add_argument('--una-vez', action='store_true',
+                            help='Manda lo pendiente (sin esperar ráfagas) y termina')
+
+    def handle(self, *args, **options):
+        ventana = 0 if options['una_vez'] else options['ventana']
+        total = 0
+        while True:
+            close_old_connections()  # El relay vive mucho: no reusar conexiones caídas
+            try:
+                enviados = outbox.relevar(options['batch_size'], ventana, options['max_rafaga'])
+            except Exception:
+                # Redis caído: nada se marcó, el lote sale en la siguiente pasada
+                logger.exception("No se pudo relevar el lote de eventos")
+                if options['una_vez']:
+                    raise
+                enviados = 0
+            total += enviados
+            if enviados:
+                continue  # Puede haber más pendientes
+            if options['una_vez']:
+                break
+            time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS(f'Sin pendientes: {total} eventos enviados.'))
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actividad', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='actividadreciente',
+            index=models.Index(fields=['-fecha', '-id'], name='actividad_fecha_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actividad', '0002_actividadreciente_actividad_fecha_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Evento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('grupo', models.CharField(max_length=50)),
+                ('tipo', models.CharField(max_length=50)),
+                ('data', models.JSONField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('enviado_en', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('enviado_en__isnull', True)), fields=['id'], name='evento_pendiente_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actividad', '0003_evento_outbox'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='actividadreciente',
+            index=models.Index(condition=models.Q(('aprobacion_id__isnull', False)), fields=['aprobacion_id', 'estado'], name='actividad_aprobacion_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(condition=models.Q(('enviado_en__isnull', False)), fields=['enviado_en', 'id'], name='evento_enviado_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actividad', '0004_indices_limpieza'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='seq',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='evento',
+            constraint=models.UniqueConstraint(fields=('grupo', 'seq'), name='evento_grupo_seq_uniq'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import models
+from django.utils import timezone
+
+class ActividadReciente(models.Model):
+    TIPO_CHOICES = (
+        ('usuario', 'Usuario'),
+        ('partido', 'Partido'),
+        ('torneo', 'Torneo'),
+    )
+    ESTADO_CHOICES = (
+        ('pending', 'Pendiente'),
+        ('approved', 'Aprobado'),
+        ('rejected', 'Rechazado'),
+        ('directo', 'Directo'),
+    )
+
+    fecha = models.DateTimeField(default=timezone.now)  # Para ordenar
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES)
+    descripcion = models.TextField()
+    estado = models.CharField(max_length=10, choices=ESTADO_CHOICES, blank=True, default='')
+    aprobacion_id = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Paginación por llave (fecha, id) del listado más reciente primero
+            # (también lo usa cleanup_actividad para recorrer las viejas por fecha)
+            models.Index(fields=['-fecha', '-id'], name='actividad_fecha_id_idx'),
+            # approve/reject buscan la actividad pendiente de sus solicitudes
+            models.Index(
+                fields=['aprobacion_id', 'estado'], name='actividad_aprobacion_idx',
+                condition=models.Q(aprobacion_id__isnull=False),
+            ),
+        ]
+
+    # Opcional: un toString
+    def __str__(self):
+        return f"[{self.tipo}] {self.descripcion} ({self.estado}) - {self.fecha}"
+
+
+class Evento(models.Model):
+    """
+    Mensaje de WebSocket pendiente (outbox). Se escribe con actividad/outbox.py
+    en la misma transacción que el cambio que anuncia, y el comando
+    relevar_eventos lo manda al grupo de Channels una vez confirmado.
+    """
+    grupo = models.CharField(max_length=50)  # Grupo de Channels: "actividad", "aprobaciones"...
+    tipo = models.CharField(max_length=50)  # Handler del consumer: "actividad_message"...
+    data = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+    enviado_en = models.DateTimeField(null=True, blank=True)
+    # Número de secuencia dentro del grupo, consecutivo y en el orden de envío.
+    # Lo asigna el relay al mandarlo; el cliente lo usa para pedir lo que le faltó.
+    seq = models.PositiveBigIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # También es el índice del replay (grupo, seq > n)
+            models.UniqueConstraint(fields=['grupo', 'seq'], name='evento_grupo_seq_uniq'),
+        ]
+        indexes = [
+            # Sólo los pendientes: el relay los lee en orden de id
+            models.Index(fields=['id'], name='evento_pendiente_idx', condition=models.Q(enviado_en__isnull=True)),
+            # Los enviados, por antigüedad, para cleanup_actividad
+            models.Index(fields=['enviado_en', 'id'], name='evento_enviado_idx', condition=models.Q(enviado_en__isnull=False)),
+        ]
+
+    def __str__(self):
+        return f"{self.grupo}/{self.tipo} #{self.id}"
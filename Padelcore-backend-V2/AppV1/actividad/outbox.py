@@ -0,0 +1,159 @@
+# actividad/outbox.py
+"""
+Outbox de los mensajes de WebSocket.
+
+Las vistas no llaman a group_send: publicar() guarda un Evento en la misma
+transacción que el cambio. Si la transacción se revierte, el evento también;
+si se confirma, el evento queda guardado aunque Redis esté caído. El request
+ya no espera a Redis.
+
+El comando relevar_eventos llama a relevar() en un loop: toma los
+pendientes en orden de id, los manda en una sola pasada por el event loop y
+los marca enviados en la misma transacción. Si group_send falla no se marca
+nada y el lote se reintenta completo (entrega al menos una vez).
+
+El orden se mantiene porque los pendientes se bloquean con FOR UPDATE (sin
+SKIP LOCKED): un segundo relay espera al primero en lugar de adelantarse.
+
+Al mandarlo, cada evento recibe `seq`: consecutivo dentro de su grupo y en
+el mismo orden en que salió, y va en el mensaje. Un cliente que se reconecta
+pide sólo lo que siguió a su último seq (desde()); si eso ya se borró
+(cleanup_actividad) o son demasiados, se le pide recargar completo.
+
+Ráfagas: en los grupos de AGRUPABLES los eventos del mismo tipo de
+actividad no salen uno por uno. El relay los retiene hasta que el más viejo
+cumple `ventana` segundos o se juntan `max_rafaga`, y entonces manda uno
+solo que los resume ("37 nuevos jugadores registrados"). Un evento que
+llega solo sale igual que siempre, con la demora de la ventana. Así una
+jornada de inscripciones cuesta un mensaje por ventana en Redis y en cada
+dashboard, no uno por jugador.
+"""
+import datetime
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Evento
+
+MAX_REPLAY = 500  # Eventos que se reenvían a un cliente; con más conviene recargar
+
+AGRUPABLES = ('actividad',)  # Grupos cuyas ráfagas se resumen
+VENTANA = 2.0  # Segundos que se retiene una ráfaga antes de mandarla
+MAX_RAFAGA = 100  # Eventos que cierran la ráfaga aunque no termine la ventana
+RESUMENES = {
+    'usuario': "{n} nuevos jugadores registrados",
+    'torneo': "{n} actividades de torneos",
+    'partido': "{n} actividades de partidos",
+}
+
+
+def publicar(grupo, tipo, data):
+    """Encola un mensaje para el grupo; sale sólo si la transacción actual se confirma."""
+    return Evento.objects.create(grupo=grupo, tipo=tipo, data=data)
+
+
+def relevar(lote=500, ventana=VENTANA, max_rafaga=MAX_RAFAGA):
+    """
+    Manda hasta `lote` eventos pendientes en orden, con las ráfagas que ya
+    cerraron resumidas. Regresa cuántos mensajes salieron.
+    """
+    with transaction.atomic():
+        pendientes = list(
+            Evento.objects.select_for_update()
+            .filter(enviado_en__isnull=True)
+            .order_by('id')[:lote]
+        )
+        if not pendientes:
+            return 0
+        ahora = timezone.now()
+        # Con el lote lleno no se retiene nada: lo que sigue en la cola ya es otra pasada
+        cierre = ahora if len(pendientes) == lote else ahora - datetime.timedelta(seconds=ventana)
+        eventos, absorbidos = _agrupar(pendientes, cierre, max_rafaga)
+        if not eventos:
+            return 0
+        siguiente = {}
+        for evento in eventos:
+            if evento.grupo not in siguiente:
+                siguiente[evento.grupo] = ultimo(evento.grupo) + 1
+            evento.seq = siguiente[evento.grupo]
+            evento.enviado_en = ahora
+            siguiente[evento.grupo] += 1
+        for evento in absorbidos:
+            evento.enviado_en = ahora  # Van dentro del resumen; sin seq propio
+        async_to_sync(_mandar)(get_channel_layer(), eventos)
+        Evento.objects.bulk_update(eventos + absorbidos, ['data', 'seq', 'enviado_en'])
+    return len(eventos)
+
+
+def _agrupar(pendientes, cierre, max_rafaga):
+    """
+    (eventos que salen en orden de id, eventos absorbidos por un resumen).
+    Las ráfagas que siguen abiertas (su primer evento es posterior a `cierre`
+    y no llegan a `max_rafaga`) se quedan pendientes.
+    """
+    salen, absorbidos, rafagas = [], [], {}
+    for evento in pendientes:
+        if evento.grupo in AGRUPABLES:
+            rafagas.setdefault((evento.grupo, evento.tipo, evento.data.get('tipo')), []).append(evento)
+        else:
+            salen.append(evento)
+    for rafaga in rafagas.values():
+        if rafaga[0].created_at > cierre and len(rafaga) < max_rafaga:
+            continue
+        primero = rafaga[0]  # Ocupa el lugar de la ráfaga y guarda el resumen para el replay
+        if len(rafaga) > 1:
+            primero.data = _resumen([e.data for e in rafaga])
+            absorbidos.extend(rafaga[1:])
+        salen.append(primero)
+    salen.sort(key=lambda e: e.id)
+    return salen, absorbidos
+
+
+def _resumen(datos):
+    """Un mensaje con la forma de una actividad que resume varias."""
+    tipo = datos[0].get('tipo')
+    return {
+        "id": datos[-1].get('id'),
+        "fecha": datos[-1].get('fecha'),
+        "tipo": tipo,
+        "descripcion": RESUMENES.get(tipo, "{n} actividades nuevas").format(n=len(datos)),
+        "estado": datos[-1].get('estado', ''),
+        "resumen": True,
+        "ids": [d.get('id') for d in datos],
+    }
+
+
+async def _mandar(channel_layer, eventos):
+    for evento in eventos:
+        await channel_layer.group_send(
+            evento.grupo, {"type": evento.tipo, "data": mensaje(evento.seq, evento.data)},
+        )
+
+
+def mensaje(seq, data):
+    """Lo que recibe el cliente: el data del evento más su seq."""
+    return {**data, "seq": seq}
+
+
+def ultimo(grupo):
+    """Último seq enviado del grupo (0 si no hay)."""
+    return Evento.objects.filter(grupo=grupo).aggregate(seq=Max('seq'))['seq'] or 0
+
+
+def desde(grupo, seq, limite=MAX_REPLAY):
+    """
+    Mensajes del grupo posteriores a `seq`, en orden. None si no se puede
+    armar el delta completo y el cliente debe recargar.
+    """
+    eventos = list(
+        Evento.objects.filter(grupo=grupo, seq__gt=seq)
+        .order_by('seq').values_list('seq', 'data')[:limite + 1]
+    )
+    if len(eventos) > limite or (eventos and eventos[0][0] != seq + 1):
+        return None  # Demasiados, o los siguientes a `seq` ya se borraron
+    if not eventos and seq > ultimo(grupo):
+        return None  # Un seq que nunca existió aquí (p. ej. otra BD)
+    return [mensaje(s, data) for s, data in eventos]
@@ -0,0 +1,119 @@
+import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from AppV1.routing import websocket_urlpatterns
+from . import outbox
+from .models import ActividadReciente, Evento
+
+application = URLRouter(websocket_urlpatterns)
+
+
+class CleanupActividadTest(TestCase):
+    """cleanup_actividad borra por lotes sólo lo que salió de la ventana de retención."""
+
+    def test_borrado_por_lotes(self):
+        ahora = timezone.now()
+        ActividadReciente.objects.bulk_create([
+            ActividadReciente(fecha=ahora - datetime.timedelta(days=i % 10), tipo='usuario', descripcion=str(i))
+            for i in range(100)
+        ])
+        viejo = ahora - datetime.timedelta(days=5)
+        Evento.objects.bulk_create([
+            Evento(grupo='actividad', tipo='actividad_message', data={}, enviado_en=viejo),
+            Evento(grupo='actividad', tipo='actividad_message', data={}, enviado_en=ahora),
+            Evento(grupo='actividad', tipo='actividad_message', data={}, created_at=viejo),  # Sin mandar
+            Evento(grupo='aprobaciones', tipo='aprobacion_message', data={}, enviado_en=viejo, seq=1),
+            Evento(grupo='aprobaciones', tipo='aprobacion_message', data={}, enviado_en=viejo, seq=2),  # Último
+        ])
+
+        salida = StringIO()
+        # 70 viejas en lotes de 25: 3 lotes, cada uno un SELECT de ids y un DELETE (más el de
+        # eventos), y 2 consultas para el último evento de cada grupo
+        with self.assertNumQueries(3 * 2 + 1 + 2 + 2 + 1):
+            call_command('cleanup_actividad', days=3, batch_size=25, stdout=salida)
+        self.assertIn('70 actividades y 2 eventos', salida.getvalue())
+        self.assertEqual(ActividadReciente.objects.count(), 30)
+        self.assertEqual(Evento.objects.count(), 3)
+        self.assertTrue(Evento.objects.filter(grupo='aprobaciones', seq=2).exists())
+
+
+class StreamActividadTest(TestCase):
+    """Cada evento lleva un seq consecutivo por grupo; al reconectar sólo se manda lo que faltó."""
+
+    def publicar(self, n, grupo='actividad'):
+        for i in range(n):
+            outbox.publicar(grupo, 'actividad_message', {"id": i})
+        with patch.object(outbox, 'AGRUPABLES', ()):  # Uno por uno, sin resumir ráfagas
+            outbox.relevar()
+
+    def test_since(self):
+        self.publicar(3)
+        self.publicar(2, grupo='aprobaciones')
+        self.publicar(2)
+        self.assertEqual(
+            list(Evento.objects.filter(grupo='actividad').order_by('id').values_list('seq', flat=True)),
+            [1, 2, 3, 4, 5],
+        )
+        client = APIClient()
+        self.assertEqual(client.get('/api/actividades/')['X-Actividad-Seq'], '5')
+
+        response = client.get('/api/actividades/', {'since': 3})
+        self.assertEqual(response.data, {"seq": 5, "results": [{"id": 0, "seq": 4}, {"id": 1, "seq": 5}]})
+        self.assertEqual(client.get('/api/actividades/', {'since': 5}).data, {"seq": 5, "results": []})
+        self.assertEqual(client.get('/api/actividades/', {'since': 9}).status_code, 410)
+        self.assertEqual(client.get('/api/actividades/', {'since': 'x'}).status_code, 400)
+
+        Evento.objects.filter(grupo='actividad', seq__lte=2).delete()  # Lo que borra cleanup_actividad
+        self.assertEqual(client.get('/api/actividades/', {'since': 1}).status_code, 410)
+        self.assertEqual(len(client.get('/api/actividades/', {'since': 2}).data['results']), 3)
+
+    async def test_replay_al_reconectar(self):
+        await database_sync_to_async(self.publicar)(3)
+        cliente = WebsocketCommunicator(application, '/ws/actividad/?since=1')
+        self.assertTrue((await cliente.connect())[0])
+        self.assertEqual([(await cliente.receive_json_from())['seq'] for _ in range(2)], [2, 3])
+        await database_sync_to_async(self.publicar)(1)
+        self.assertEqual(await cliente.receive_json_from(), {"id": 0, "seq": 4})
+        await cliente.disconnect()
+
+        perdido = WebsocketCommunicator(application, '/ws/actividad/?since=99')
+        await perdido.connect()
+        self.assertEqual(await perdido.receive_json_from(), {"recargar": True})
+        await perdido.disconnect()
+
+
+class RafagaActividadTest(TestCase):
+    """Las ráfagas del mismo tipo salen como un solo mensaje al cerrar la ventana o llenarse."""
+
+    def registrar(self, n, tipo='usuario'):
+        for i in range(n):
+            outbox.publicar('actividad', 'actividad_message', {"id": i, "tipo": tipo, "descripcion": str(i)})
+
+    def test_resumen(self):
+        self.registrar(37)
+        self.registrar(1, tipo='torneo')
+        outbox.publicar('aprobaciones', 'aprobacion_message', {"id": 1})
+        self.assertEqual(outbox.relevar(), 1)  # Sólo lo que no se agrupa; la ventana sigue abierta
+
+        self.assertEqual(outbox.relevar(max_rafaga=30), 1)  # Se llenó la de usuarios
+        Evento.objects.filter(enviado_en__isnull=True).update(
+            created_at=timezone.now() - datetime.timedelta(seconds=outbox.VENTANA + 1),
+        )
+        self.assertEqual(outbox.relevar(), 1)  # Cerró la ventana del torneo, que sale tal cual
+        self.assertFalse(Evento.objects.filter(enviado_en__isnull=True).exists())
+
+        resumen, torneo = outbox.desde('actividad', 0)
+        self.assertEqual(
+            (resumen['seq'], resumen['descripcion'], resumen['ids'], resumen['id']),
+            (1, "37 nuevos jugadores registrados", list(range(37)), 36),
+        )
+        self.assertEqual(torneo, {"id": 0, "tipo": 'torneo', "descripcion": '0', "seq": 2})
@@ -0,0 +1,46 @@
+from rest_framework import status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from AppV1.pagination import KeysetPagination
+from . import outbox
+from .models import ActividadReciente
+from .serializers import ActividadRecienteSerializer
+
+
+class ActividadPagination(KeysetPagination):
+    ordering = ('-fecha', '-id')  # Índice actividad_fecha_id_idx
+
+
+# Create your views here.
+class ActividadRecienteViewSet(viewsets.ReadOnlyModelViewSet):#Es sólo de lectura
+    queryset = ActividadReciente.objects.all().order_by('-fecha', '-id')
+    serializer_class = ActividadRecienteSerializer
+    pagination_class = ActividadPagination
+
+    def list(self, request, *args, **kwargs):
+        """
+        GET /api/actividades/ => listado paginado; el header X-Actividad-Seq es
+        el último seq del stream "actividad" al momento de leerlo.
+        GET /api/actividades/?since=<seq> => sólo los mensajes posteriores a ese
+        seq, como los del WebSocket: {"seq": último, "results": [...]}; 410 si
+        ya no se pueden armar y hay que recargar completo.
+        """
+        since = request.query_params.get('since')
+        if since is None:
+            seq = outbox.ultimo("actividad")  # Antes del listado: a lo más se repite algo
+            response = super().list(request, *args, **kwargs)
+            response['X-Actividad-Seq'] = str(seq)
+            return response
+
+        if not since.isdigit():
+            raise ValidationError({"since": "Debe ser un entero no negativo."})
+        perdidos = outbox.desde("actividad", int(since))
+        if perdidos is None:
+            return Response(
+                {"detail": "Ya no hay historial desde ese seq, recarga el listado."},
+                status=status.HTTP_410_GONE,
+            )
+        return Response({
+            "seq": perdidos[-1]['seq'] if perdidos else int(since),
+            "results": perdidos,
+        })
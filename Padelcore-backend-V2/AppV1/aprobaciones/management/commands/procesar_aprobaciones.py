@@ -0,0 +1,39 @@
+# aprobaciones/management/commands/procesar_aprobaciones.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from aprobaciones import trabajos
+
+class Command(BaseCommand):
+    help = ('Worker de la cola de aprobaciones: toma trabajos en lotes, crea los '
+            'Torneo/Partido aprobados y genera los fixtures. Corre hasta que se detenga (o usa --una-vez).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=trabajos.LOTE,
+                            help=f'Trabajos que se toman por pasada (default {trabajos.LOTE})')
+        parser.add_argument('--intervalo', type=float, default=1.0,
+                            help='Segundos de espera cuando la cola está vacía (default 1)')
+        parser.add_argument('--una-vez', action='store_true',
+                            help='Vacía la cola y termina')
+
+    def handle(self, *args, **options):
+        total = fallidos = 0
+        while True:
+            close_old_connections()  # El worker vive mucho: no reusar conexiones caídas
+            ejecutados, con_error = trabajos.procesar(options['batch_size'])
+            total += ejecutados
+            fallidos += con_error
+            if con_error:
+                self.stdout.write(self.style.WARNING(f'{con_error} trabajos fallaron en esta pasada.'))
+            if ejecutados:
+                continue  # Puede haber más en la cola
+            if options['una_vez']:
+                break
+            time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Cola vacía: {total} trabajos ejecutados, {fallidos} con error.'
+        ))
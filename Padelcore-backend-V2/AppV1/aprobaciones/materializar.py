@@ -0,0 +1,163 @@
+# aprobaciones/materializar.py
+"""
+Aprobar o rechazar solicitudes en lote.
+
+Las filas pendientes se bloquean con SELECT ... FOR UPDATE SKIP LOCKED: si
+otro admin está procesando alguna, ésta se omite en lugar de esperarlo (y
+de aprobarla dos veces). Todo pasa en una transacción:
+
+- Torneos: cada solicitud se valida con SolicitudTorneoSerializer; luego un
+  bulk_create de Tag para los nombres nuevos, uno de Torneo y uno de la
+  tabla de tags.
+- Partidos: el mismo camino que la importación masiva
+  (partidos/importacion.py): validación por lote, choques de horario,
+  bulk_create de partidos y equipos, participaciones y ranking.
+- Las solicitudes con datos inválidos se quedan pendientes y se reportan.
+- Estados y ActividadReciente se actualizan con un UPDATE / bulk_update.
+
+En la misma transacción se deja un solo mensaje para el grupo "aprobaciones"
+en el outbox (actividad/outbox.py).
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from actividad import outbox
+from actividad.models import ActividadReciente
+from partidos.importacion import importar
+from torneos.models import Tag, Torneo
+from .models import Aprobacion
+from .serializers import SolicitudTorneoSerializer
+
+MAX_IDS = 1000  # Solicitudes por request
+
+
+def aprobar(ids):
+    """
+    Aprueba las solicitudes pendientes de `ids` y crea sus Torneo/Partido.
+    Regresa {"aprobadas", "omitidas", "errores", "torneos", "partidos"}, donde
+    torneos/partidos mapean id de solicitud => id creado.
+    """
+    with transaction.atomic():
+        pendientes, omitidas = _bloquear(ids)
+        errores = []
+        torneos = _crear_torneos([a for a in pendientes if a.tipo == 'tournament'], errores)
+        partidos = _crear_partidos([a for a in pendientes if a.tipo == 'match'], errores)
+        for a in pendientes:
+            if a.tipo not in ('tournament', 'match'):
+                errores.append({"id": a.id, "errores": {"tipo": "Tipo no soportado."}})
+
+        aprobadas = [a for a in pendientes if a.id in torneos or a.id in partidos]
+        _cerrar(aprobadas, 'approved')
+    return {
+        "aprobadas": [a.id for a in aprobadas],
+        "omitidas": omitidas,
+        "errores": sorted(errores, key=lambda e: e['id']),
+        "torneos": torneos,
+        "partidos": partidos,
+    }
+
+
+def rechazar(ids):
+    """Rechaza las solicitudes pendientes de `ids`. Regresa {"rechazadas", "omitidas"}."""
+    with transaction.atomic():
+        pendientes, omitidas = _bloquear(ids)
+        _cerrar(pendientes, 'rejected')
+    return {"rechazadas": [a.id for a in pendientes], "omitidas": omitidas}
+
+
+def _bloquear(ids):
+    """(pendientes bloqueadas por esta transacción, ids omitidos)."""
+    ids = list(dict.fromkeys(ids))
+    pendientes = list(
+        Aprobacion.objects.select_for_update(skip_locked=True)
+        .filter(pk__in=ids, status='pending').order_by('pk')
+    )
+    tomadas = {a.id for a in pendientes}
+    return pendientes, [i for i in ids if i not in tomadas]
+
+
+def _crear_torneos(solicitudes, errores):
+    validas = []  # (solicitud, datos validados)
+    for a in solicitudes:
+        serializer = SolicitudTorneoSerializer(data=a.data)
+        if serializer.is_valid():
+            validas.append((a, serializer.validated_data))
+        else:
+            errores.append({"id": a.id, "errores": serializer.errors})
+    if not validas:
+        return {}
+
+    nombres = {nombre for _, datos in validas for nombre in datos['tags']}
+    Tag.objects.bulk_create([Tag(nombre=nombre) for nombre in nombres], ignore_conflicts=True)
+    tags = dict(Tag.objects.filter(nombre__in=nombres).values_list('nombre', 'id'))
+
+    creados = Torneo.objects.bulk_create([
+        Torneo(**{campo: valor for campo, valor in datos.items() if campo != 'tags'})
+        for _, datos in validas
+    ])
+    Torneo.tags.through.objects.bulk_create([
+        Torneo.tags.through(torneo_id=torneo.id, tag_id=tags[nombre])
+        for torneo, (_, datos) in zip(creados, validas)
+        for nombre in set(datos['tags'])
+    ])
+    return {a.id: torneo.id for (a, _), torneo in zip(validas, creados)}
+
+
+def _crear_partidos(solicitudes, errores):
+    if not solicitudes:
+        return {}
+    # `data` de una solicitud de partido tiene la misma forma que una fila de importación
+    creados, fallidas = importar(a.data for a in solicitudes)
+    por_fila = {e['fila']: e['errores'] for e in fallidas}
+    aceptadas = []
+    for numero, a in enumerate(solicitudes, start=1):
+        if numero in por_fila:
+            errores.append({"id": a.id, "errores": por_fila[numero]})
+        else:
+            aceptadas.append(a)
+    return {a.id: partido_id for a, partido_id in zip(aceptadas, creados)}
+
+
+DESCRIPCIONES = {
+    ('approved', 'tournament'): "Aprobado Torneo: {nombre}",
+    ('approved', 'match'): "Aprobado Partido (creado)",
+    ('rejected', 'tournament'): "Rechazado Torneo: {nombre}",
+    ('rejected', 'match'): "Rechazado Partido",
+}
+
+
+def _cerrar(solicitudes, estado):
+    """Marca las solicitudes, actualiza su actividad pendiente y deja el aviso en el outbox."""
+    if not solicitudes:
+        return
+    ids = [a.id for a in solicitudes]
+    Aprobacion.objects.filter(pk__in=ids).update(status=estado)
+    for a in solicitudes:
+        a.status = estado
+
+    por_id = {a.id: a for a in solicitudes}
+    ahora = timezone.now()
+    actividades = list(ActividadReciente.objects.filter(aprobacion_id__in=ids, estado='pending'))
+    for actividad in actividades:
+        a = por_id[actividad.aprobacion_id]
+        nombre = a.data.get('nombre', 'Sin nombre') if isinstance(a.data, dict) else 'Sin nombre'
+        actividad.descripcion = DESCRIPCIONES.get((estado, a.tipo), actividad.descripcion).format(nombre=nombre)
+        actividad.estado = estado
+        actividad.fecha = ahora
+    ActividadReciente.objects.bulk_update(actividades, ['descripcion', 'estado', 'fecha'])
+
+    _notificar(solicitudes, estado)
+
+
+def _notificar(solicitudes, estado):
+    verbo = "aprobó" if estado == 'approved' else "rechazó"
+    if len(solicitudes) == 1:
+        a = solicitudes[0]
+        data = {"id": a.id, "tipo": a.tipo, "status": estado, "detalle": f"Se {verbo} la solicitud"}
+    else:
+        data = {
+            "ids": [a.id for a in solicitudes],
+            "status": estado,
+            "detalle": f"Se {verbo} un lote de {len(solicitudes)} solicitudes",
+        }
+    outbox.publicar("aprobaciones", "aprobacion_message", data)
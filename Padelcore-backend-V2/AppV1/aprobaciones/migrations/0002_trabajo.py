@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:16
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprobaciones', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Trabajo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('accion', models.CharField(choices=[('aprobar', 'Aprobar'), ('rechazar', 'Rechazar')], max_length=10)),
+                ('ids', models.JSONField()),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('hecho', 'Hecho'), ('fallido', 'Fallido')], default='pendiente', max_length=10)),
+                ('intentos', models.PositiveSmallIntegerField(default=0)),
+                ('disponible_en', models.DateTimeField(default=django.utils.timezone.now)),
+                ('resultado', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('estado__in', ['pendiente', 'procesando'])), fields=['disponible_en', 'id'], name='trabajo_cola_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprobaciones', '0002_trabajo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trabajo',
+            name='datos',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='trabajo',
+            name='accion',
+            field=models.CharField(choices=[('aprobar', 'Aprobar'), ('rechazar', 'Rechazar'), ('fixture', 'Generar fixture')], max_length=10),
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import models
+from django.utils import timezone
+
+class Aprobacion(models.Model):
+    TIPO_CHOICES = (
+        ('tournament', 'Tournament'),
+        ('match', 'Match'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('approved', 'Approved'),
+        ('rejected', 'Rejected'),
+    )
+
+    tipo = models.CharField(max_length=10, choices=TIPO_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    data = models.JSONField()  # Aquí guardas la info necesaria para crear Torneo o Partido
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.tipo} - {self.status} - creado {self.created_at}"
+
+
+class Trabajo(models.Model):
+    """
+    Trabajo de la cola de aprobaciones (aprobaciones/trabajos.py): aprobar o
+    rechazar solicitudes, o generar el fixture de un torneo, fuera del request
+    del admin. Lo ejecuta el comando procesar_aprobaciones.
+    """
+    ACCION_CHOICES = (
+        ('aprobar', 'Aprobar'),
+        ('rechazar', 'Rechazar'),
+        ('fixture', 'Generar fixture'),
+    )
+    ESTADO_CHOICES = (
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('hecho', 'Hecho'),
+        ('fallido', 'Fallido'),  # Agotó sus intentos (dead letter)
+    )
+
+    accion = models.CharField(max_length=10, choices=ACCION_CHOICES)
+    ids = models.JSONField()  # Ids de Aprobacion; en 'fixture', [id del Torneo]
+    datos = models.JSONField(blank=True, null=True)  # Parámetros de la acción (los del fixture)
+    estado = models.CharField(max_length=10, choices=ESTADO_CHOICES, default='pendiente')
+    intentos = models.PositiveSmallIntegerField(default=0)
+    # Pendiente: desde cuándo se puede tomar. Procesando: hasta cuándo es del worker que lo tomó.
+    disponible_en = models.DateTimeField(default=timezone.now)
+    resultado = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Sólo los trabajos vivos: los hechos no crecen el índice de la cola
+            models.Index(
+                fields=['disponible_en', 'id'], name='trabajo_cola_idx',
+                condition=models.Q(estado__in=['pendiente', 'procesando']),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.accion} {len(self.ids)} - {self.estado} ({self.intentos} intentos)"
@@ -0,0 +1,32 @@
+# pendientes/serializers.py
+from decimal import Decimal
+
+from rest_framework import serializers
+from .models import Aprobacion, Trabajo
+
+class AprobacionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Aprobacion
+        fields = '__all__'
+
+
+class TrabajoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Trabajo
+        fields = ['id', 'accion', 'ids', 'datos', 'estado', 'intentos', 'resultado', 'error', 'created_at', 'updated_at']
+
+
+class SolicitudTorneoSerializer(serializers.Serializer):
+    """
+    `data` de una solicitud de torneo, validado antes de aprobarla
+    (aprobaciones/materializar.py). Los tags van por nombre y se crean si no existen.
+    """
+    nombre = serializers.CharField(max_length=255)
+    sede = serializers.CharField(max_length=255)
+    fecha_inicio = serializers.DateField()
+    fecha_fin = serializers.DateField()
+    premio_dinero = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal(0), default=Decimal(0))
+    puntos = serializers.IntegerField(default=0)
+    factor_k = serializers.IntegerField(min_value=0, default=32)
+    imagen_url = serializers.URLField(max_length=500, allow_blank=True, default='')
+    tags = serializers.ListField(child=serializers.CharField(max_length=50), default=list)
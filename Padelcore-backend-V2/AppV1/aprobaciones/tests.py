@@ -0,0 +1,229 @@
+import datetime
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from actividad import outbox
+from actividad.models import ActividadReciente, Evento
+from partidos.models import Partido, Participacion
+from torneos.models import Tag, Torneo
+from usuarios.models import Usuario
+from .models import Aprobacion, Trabajo
+from . import trabajos
+
+
+class AprobacionListQueriesTest(TestCase):
+    """El listado de aprobaciones es una sola consulta: `data` va en la misma fila."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Aprobacion.objects.bulk_create([
+            Aprobacion(
+                tipo='match' if i % 2 else 'tournament',
+                data={'nombre': f"Torneo {i}", 'equipo_1_ids': [], 'equipo_2_ids': []},
+            )
+            for i in range(500)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_consultas_constantes(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/aprobaciones/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 500)
+
+
+class AprobacionLoteTest(TestCase):
+    """Aprobar/rechazar en lote: una transacción, bulk writes y un solo mensaje por WebSocket."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jugadores = Usuario.objects.bulk_create([
+            Usuario(email=f"a{i}@test.com", nombre_completo=f"A {i}") for i in range(8)
+        ])
+        cls.base = Torneo.objects.create(
+            nombre="Base", sede="Sede", fecha_inicio=datetime.date(2025, 1, 1),
+            fecha_fin=datetime.date(2025, 1, 31), imagen_url="https://example.com/t.png",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def solicitud(self, tipo, **data):
+        aprobacion = Aprobacion.objects.create(tipo=tipo, data=data)
+        ActividadReciente.objects.create(tipo='torneo', descripcion="pendiente", estado='pending', aprobacion_id=aprobacion.id)
+        return aprobacion
+
+    def torneo(self, i, **cambios):
+        data = {
+            'nombre': f"Torneo {i}", 'sede': "Sede", 'fecha_inicio': '2025-02-01',
+            'fecha_fin': '2025-02-02', 'tags': ['Open', f"Tag {i % 3}"],
+        }
+        data.update(cambios)
+        return self.solicitud('tournament', **data)
+
+    def partido(self, i):
+        ids = [str(self.jugadores[(2 * i + j) % 8].id) for j in range(4)]
+        return self.solicitud(
+            'match', torneo=self.base.id, fecha=f'2025-01-{i + 1:02d}', hora='10:00',
+            equipo_1_ids=ids[:2], equipo_2_ids=ids[2:],
+        )
+
+    def ejecutar(self, response):
+        """Corre la cola como lo haría procesar_aprobaciones y regresa el trabajo del response."""
+        self.assertEqual(response.status_code, 202)
+        trabajos.procesar()
+        return self.client.get(response.data['url']).data
+
+    def test_aprobar_lote(self):
+        torneos = [self.torneo(i) for i in range(30)]
+        partidos = [self.partido(i) for i in range(20)]
+        invalida = self.torneo(99, sede='')
+        ya_rechazada = self.torneo(98)
+        ya_rechazada.status = 'rejected'
+        ya_rechazada.save()
+        ids = [a.id for a in torneos + partidos + [invalida, ya_rechazada]]
+
+        response = self.client.post('/api/aprobaciones/batch-approve/', {'ids': ids}, format='json')
+        self.assertEqual(Torneo.objects.count(), 1)  # Nada se crea dentro del request
+        trabajo = self.ejecutar(response)
+
+        self.assertEqual(trabajo['estado'], 'hecho')
+        resultado = trabajo['resultado']
+        self.assertEqual(len(resultado['aprobadas']), 50)
+        self.assertEqual(resultado['omitidas'], [ya_rechazada.id])
+        self.assertEqual([e['id'] for e in resultado['errores']], [invalida.id])
+        self.assertEqual(list(Evento.objects.values_list('data__ids', flat=True)), [resultado['aprobadas']])
+        self.assertEqual(Torneo.objects.filter(nombre__startswith="Torneo ").count(), 30)
+        self.assertEqual(Tag.objects.count(), 4)
+        self.assertEqual(Partido.objects.count(), 20)
+        self.assertEqual(Participacion.objects.count(), 80)
+        self.assertEqual(Aprobacion.objects.filter(status='pending').get(), invalida)
+        self.assertEqual(ActividadReciente.objects.filter(estado='approved').count(), 50)
+
+        # Repetir el lote no crea nada
+        response = self.client.post('/api/aprobaciones/batch-approve/', {'ids': ids}, format='json')
+        self.assertEqual(self.ejecutar(response)['resultado']['aprobadas'], [])
+
+    def test_torneos_invalidos_no_tumban_el_lote(self):
+        buena = self.torneo(1, premio_dinero='1500.50', puntos=100, factor_k=40)
+        malas = [
+            self.torneo(2, premio_dinero='mucho'),
+            self.torneo(3, puntos='x'),
+            self.torneo(4, factor_k=-1),
+            self.torneo(5, tags='Open'),
+            self.torneo(6, tags=['x' * 51]),
+            self.torneo(7, fecha_fin='mañana'),
+        ]
+        ids = [buena.id] + [a.id for a in malas]
+        resultado = self.ejecutar(
+            self.client.post('/api/aprobaciones/batch-approve/', {'ids': ids}, format='json')
+        )['resultado']
+
+        self.assertEqual(resultado['aprobadas'], [buena.id])
+        self.assertEqual(
+            [(e['id'], list(e['errores'])) for e in resultado['errores']],
+            [(a.id, [campo]) for a, campo in zip(malas, ['premio_dinero', 'puntos', 'factor_k', 'tags', 'tags', 'fecha_fin'])],
+        )
+        torneo = Torneo.objects.get(pk=resultado['torneos'][str(buena.id)])
+        self.assertEqual((torneo.premio_dinero, torneo.puntos, torneo.factor_k), (Decimal('1500.50'), 100, 40))
+        self.assertEqual(Aprobacion.objects.filter(status='pending').count(), len(malas))
+
+    def test_individual_y_rechazo(self):
+        torneo, otro = self.torneo(1), self.torneo(2)
+        trabajo = self.ejecutar(self.client.patch(f'/api/aprobaciones/{torneo.id}/approve/'))
+        torneo_id = trabajo['resultado']['torneos'][str(torneo.id)]
+        self.assertEqual(set(Torneo.objects.get(pk=torneo_id).tags.values_list('nombre', flat=True)),
+                         {'Open', 'Tag 1'})
+        self.assertEqual(self.client.patch(f'/api/aprobaciones/{torneo.id}/approve/').status_code, 400)
+
+        response = self.client.post('/api/aprobaciones/batch-reject/', {'ids': [torneo.id, otro.id]}, format='json')
+        resultado = self.ejecutar(response)['resultado']
+        self.assertEqual((resultado['rechazadas'], resultado['omitidas']), ([otro.id], [torneo.id]))
+        self.assertEqual(self.client.post('/api/aprobaciones/batch-reject/', {'ids': 'x'}, format='json').status_code, 400)
+
+
+class TrabajoColaTest(TestCase):
+    """La cola reintenta con espera y manda a 'fallido' al agotar los intentos."""
+
+    def test_reintentos_y_dead_letter(self):
+        trabajo = trabajos.encolar('aprobar', [1])
+        with patch.dict(trabajos.ACCIONES, aprobar=Mock(side_effect=RuntimeError("BD caída"))):
+            self.assertEqual(trabajos.procesar(), (1, 1))
+            trabajo.refresh_from_db()
+            self.assertEqual((trabajo.estado, trabajo.intentos), ('pendiente', 1))
+            self.assertIn("BD caída", trabajo.error)
+            self.assertEqual(trabajos.procesar(), (0, 0))  # Esperando su reintento
+
+            for intento in range(2, trabajos.MAX_INTENTOS + 1):
+                Trabajo.objects.filter(pk=trabajo.pk).update(disponible_en=timezone.now())
+                trabajos.procesar()
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.intentos), ('fallido', trabajos.MAX_INTENTOS))
+
+    def test_plazo_vencido_vuelve_a_la_cola(self):
+        trabajo = trabajos.encolar('rechazar', [])
+        self.assertEqual(trabajos.reclamar(), [trabajo])
+        self.assertEqual(trabajos.reclamar(), [])  # Lo tiene otro worker
+        Trabajo.objects.filter(pk=trabajo.pk).update(disponible_en=timezone.now())  # El worker murió
+        self.assertEqual(trabajos.procesar(), (1, 0))
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.intentos), ('hecho', 2))
+
+
+    def test_trabajo_que_tumba_al_worker(self):
+        """Si el worker muere en cada intento, al agotarlos el trabajo queda 'fallido' y no se reclama más."""
+        trabajo = trabajos.encolar('aprobar', [1])
+        for _ in range(trabajos.MAX_INTENTOS):
+            self.assertEqual(trabajos.reclamar(), [trabajo])
+            Trabajo.objects.filter(pk=trabajo.pk).update(disponible_en=timezone.now())  # Murió sin terminar
+        self.assertEqual(trabajos.reclamar(), [])
+        trabajo.refresh_from_db()
+        self.assertEqual((trabajo.estado, trabajo.intentos), ('fallido', trabajos.MAX_INTENTOS))
+        self.assertIn("no terminó", trabajo.error)
+
+    def test_plazo_por_trabajo(self):
+        primero, segundo = trabajos.encolar('rechazar', []), trabajos.encolar('rechazar', [])
+        reclamados = trabajos.reclamar()
+        self.assertEqual(reclamados, [primero, segundo])
+        # El primero tardó más que el plazo y otro worker tomó el segundo
+        Trabajo.objects.filter(pk=segundo.pk).update(disponible_en=timezone.now())
+        self.assertEqual(trabajos.reclamar(), [segundo])
+        self.assertTrue(trabajos.renovar(reclamados[0]))
+        self.assertFalse(trabajos.renovar(reclamados[1]))
+
+
+class OutboxTest(TestCase):
+    """Los avisos por WebSocket pasan por el outbox: sólo salen si el cambio se confirmó, y en orden."""
+
+    def test_relay_en_orden(self):
+        response = APIClient().post('/api/aprobaciones/', {'tipo': 'tournament', 'data': {'nombre': "Uno"}}, format='json')
+        self.assertEqual(response.status_code, 201)
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            outbox.publicar("aprobaciones", "aprobacion_message", {"id": 0})
+            raise RuntimeError("Se revierte el cambio")
+        outbox.publicar("aprobaciones", "aprobacion_message", {"id": "dos"})
+        self.assertEqual(Evento.objects.count(), 2)
+
+        capa = get_channel_layer()
+        canal = async_to_sync(capa.new_channel)()
+        async_to_sync(capa.group_add)("aprobaciones", canal)
+        with self.assertNumQueries(5):  # SELECT ... FOR UPDATE, último seq del grupo y UPDATE, en un savepoint
+            self.assertEqual(outbox.relevar(), 2)
+        recibidos = [async_to_sync(capa.receive)(canal)['data']['id'] for _ in range(2)]
+        self.assertEqual(recibidos, [response.data['id'], "dos"])
+        self.assertEqual(outbox.relevar(), 0)
+
+    def test_redis_caido_no_marca(self):
+        outbox.publicar("aprobaciones", "aprobacion_message", {})
+        with patch('actividad.outbox._mandar', side_effect=ConnectionError), self.assertRaises(ConnectionError):
+            outbox.relevar()
+        self.assertTrue(Evento.objects.filter(enviado_en__isnull=True).exists())
@@ -0,0 +1,134 @@
+# aprobaciones/trabajos.py
+"""
+Cola de trabajos guardada en la misma BD (sin broker).
+
+approve/reject y el fixture de un torneo (POST /api/torneos/<id>/fixture/)
+sólo llaman a encolar() y responden de inmediato con el id del trabajo. El
+comando procesar_aprobaciones llama a procesar() en un loop:
+
+1) reclamar(): toma hasta `lote` trabajos disponibles con
+   SELECT ... FOR UPDATE SKIP LOCKED (varios workers no se pisan), los marca
+   'procesando' con un plazo (VISIBILIDAD) y suma un intento.
+2) renovar(): justo antes de ejecutar cada trabajo del lote le da un plazo
+   nuevo, así los últimos no vencen mientras corren los primeros. Si ya
+   venció y otro worker lo tomó, se salta.
+3) ejecutar(): corre la acción (aprobaciones/materializar.py o
+   torneos/programacion.py) y marca el trabajo 'hecho' en la misma
+   transacción, con la fila del trabajo bloqueada: mientras corre ningún
+   otro worker lo reclama aunque se le venza el plazo. Si falla vuelve a
+   'pendiente' con espera exponencial; al agotar MAX_INTENTOS queda
+   'fallido' (dead letter) con el error guardado. Los errores de DEFINITIVOS
+   (un fixture que no cabe) no se arreglan reintentando: pasan directo a 'fallido'.
+
+Si un worker muere a media ejecución, su trabajo vuelve a estar disponible
+al vencer el plazo. Cada reclamo cuenta como intento: un trabajo que tumba
+al worker MAX_INTENTOS veces pasa a 'fallido' en el siguiente reclamar()
+en vez de volver a la cola para siempre. Repetir un trabajo es seguro:
+la acción y el 'hecho' se confirman juntos, y además materializar sólo toca
+solicitudes que sigan pendientes.
+"""
+import datetime
+import logging
+import traceback
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from torneos import programacion
+from torneos.fixture import FixtureError
+from .models import Trabajo
+from . import materializar
+
+logger = logging.getLogger(__name__)
+
+MAX_INTENTOS = 5
+ESPERA_BASE = 10  # Segundos antes del 2.º intento; se duplica en cada fallo
+VISIBILIDAD = 300  # Segundos que un trabajo tomado es del worker antes de volver a la cola
+LOTE = 5  # Trabajos por reclamo; pocos, cada uno puede tardar
+
+ACCIONES = {
+    'aprobar': lambda trabajo: materializar.aprobar(trabajo.ids),
+    'rechazar': lambda trabajo: materializar.rechazar(trabajo.ids),
+    'fixture': lambda trabajo: programacion.generar(trabajo.ids[0], trabajo.datos),
+}
+
+# Errores que no se arreglan reintentando
+DEFINITIVOS = (FixtureError,)
+
+
+def encolar(accion, ids, datos=None):
+    return Trabajo.objects.create(accion=accion, ids=list(ids), datos=datos)
+
+
+def reclamar(lote=LOTE):
+    """
+    Toma hasta `lote` trabajos disponibles (pendientes o con el plazo vencido).
+    Los que vencieron ya con MAX_INTENTOS (el worker murió cada vez) pasan a 'fallido'.
+    """
+    ahora = timezone.now()
+    with transaction.atomic():
+        # SKIP LOCKED: un trabajo bloqueado todavía está corriendo (ver ejecutar)
+        agotados = Trabajo.objects.select_for_update(skip_locked=True).filter(
+            estado='procesando', disponible_en__lte=ahora, intentos__gte=MAX_INTENTOS,
+        )
+        Trabajo.objects.filter(pk__in=list(agotados.values_list('pk', flat=True))).update(
+            estado='fallido',
+            error=f"El worker no terminó el trabajo en {MAX_INTENTOS} intentos.",
+        )
+        trabajos = list(
+            Trabajo.objects.select_for_update(skip_locked=True)
+            .filter(estado__in=('pendiente', 'procesando'), disponible_en__lte=ahora, intentos__lt=MAX_INTENTOS)
+            .order_by('disponible_en', 'id')[:lote]
+        )
+        Trabajo.objects.filter(pk__in=[t.pk for t in trabajos]).update(
+            estado='procesando',
+            disponible_en=ahora + datetime.timedelta(seconds=VISIBILIDAD),
+            intentos=F('intentos') + 1,
+        )
+    for trabajo in trabajos:
+        trabajo.intentos += 1
+    return trabajos
+
+
+def renovar(trabajo):
+    """Extiende el plazo de un trabajo reclamado. False si ya no es de este worker."""
+    return Trabajo.objects.filter(
+        pk=trabajo.pk, estado='procesando', intentos=trabajo.intentos,
+    ).update(disponible_en=timezone.now() + datetime.timedelta(seconds=VISIBILIDAD)) == 1
+
+
+def ejecutar(trabajo):
+    """Corre un trabajo ya reclamado. Regresa True si terminó bien."""
+    try:
+        with transaction.atomic():
+            # Mientras corre la fila queda bloqueada: reclamar() (SKIP LOCKED) no lo vuelve a tomar
+            Trabajo.objects.select_for_update().filter(pk=trabajo.pk).first()
+            resultado = ACCIONES[trabajo.accion](trabajo)
+            Trabajo.objects.filter(pk=trabajo.pk).update(estado='hecho', resultado=resultado, error='')
+    except DEFINITIVOS as exc:
+        Trabajo.objects.filter(pk=trabajo.pk).update(estado='fallido', error=str(exc))
+        return False
+    except Exception:
+        logger.exception("Falló el trabajo %s %s (intento %s)", trabajo.accion, trabajo.pk, trabajo.intentos)
+        cambios = {'error': traceback.format_exc()}
+        if trabajo.intentos >= MAX_INTENTOS:
+            cambios['estado'] = 'fallido'
+        else:
+            espera = ESPERA_BASE * 2 ** (trabajo.intentos - 1)
+            cambios['estado'] = 'pendiente'
+            cambios['disponible_en'] = timezone.now() + datetime.timedelta(seconds=espera)
+        Trabajo.objects.filter(pk=trabajo.pk).update(**cambios)
+        return False
+    return True
+
+
+def procesar(lote=LOTE):
+    """Una pasada: reclama y ejecuta un lote. Regresa (ejecutados, fallidos)."""
+    ejecutados = fallidos = 0
+    for trabajo in reclamar(lote):
+        if not renovar(trabajo):
+            continue  # Se le venció el plazo y lo tomó otro worker
+        ejecutados += 1
+        fallidos += not ejecutar(trabajo)
+    return ejecutados, fallidos
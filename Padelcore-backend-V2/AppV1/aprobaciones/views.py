@@ -0,0 +1,150 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.generics import get_object_or_404
+from rest_framework.reverse import reverse
+from .models import Aprobacion, Trabajo
+from .serializers import AprobacionSerializer, TrabajoSerializer
+from . import materializar, trabajos
+from actividad import outbox
+from actividad.models import ActividadReciente
+from django.db import transaction
+from django.utils import timezone
+
+class AprobacionViewSet(viewsets.ModelViewSet):
+    queryset = Aprobacion.objects.all()
+    serializer_class = AprobacionSerializer
+
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        """
+        Se llama automáticamente al hacer POST /api/aprobaciones/.
+        Crea el registro Aprobacion en la base de datos y, en la misma
+        transacción, deja en el outbox el mensaje para el grupo "aprobaciones".
+        """
+        instance = serializer.save()  # Guardamos la nueva aprobación en la BD
+        # Crear registro en ActividadReciente
+        # según el tipo (tournament/match).
+        if instance.tipo == 'tournament':
+            nombre_torneo = instance.data.get('nombre', 'Sin nombre')
+            ActividadReciente.objects.create(
+                fecha=timezone.now(),
+                tipo='torneo',  # o 'tournament' si prefieres
+                descripcion=f"Registro Torneo: {nombre_torneo}",
+                estado='pending',
+                aprobacion_id=instance.id,
+            )
+        elif instance.tipo == 'match':
+            ActividadReciente.objects.create(
+                fecha=timezone.now(),
+                tipo='partido',
+                descripcion="Registro Partido (pendiente)",
+                estado='pending',
+                aprobacion_id=instance.id,
+            )
+        # Si en el futuro hubiera otro tipo, else: pass
+
+        # 1. Preparamos la data a enviar al consumidor
+        data = {
+            "id": instance.id,
+            "tipo": instance.tipo,
+            "status": instance.status,
+            "detalle": "Se creó una nueva aprobación en estado pending",
+        }
+
+        # 2. El relay (relevar_eventos) lo manda a todos los WebSockets al confirmarse
+        outbox.publicar(
+            "aprobaciones",  # El mismo nombre que usaste en consumers.py (group_add("aprobaciones", ...))
+            "aprobacion_message",  # Debe coincidir con tu método en consumers.py
+            data,
+        )
+
+    def _encolar(self, accion, ids):
+        """Encola el trabajo y responde 202 con su id; lo ejecuta procesar_aprobaciones."""
+        trabajo = trabajos.encolar(accion, ids)
+        return Response(
+            {
+                "detail": "La solicitud se está procesando.",
+                "trabajo_id": trabajo.id,
+                "estado": trabajo.estado,
+                "url": reverse('aprobacion-trabajo', kwargs={'trabajo_id': trabajo.id}, request=self.request),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=True, methods=['patch'])
+    def approve(self, request, pk=None):
+        """
+        PATCH /api/aprobaciones/<id>/approve/
+        Encola la creación del Torneo/Partido real (aprobaciones/trabajos.py) y
+        responde de inmediato con el trabajo; el cambio llega por WebSocket.
+        """
+        instance = self.get_object()
+
+        if instance.status != 'pending':
+            return Response(
+                {"detail": "Este registro ya fue procesado."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return self._encolar('aprobar', [instance.id])
+
+    # ------------------------------------------------------------------------------------
+    # (3) Acción para RECHAZAR la aprobación
+    # ------------------------------------------------------------------------------------
+    @action(detail=True, methods=['patch'])
+    def reject(self, request, pk=None):
+        """
+        PATCH /api/aprobaciones/<id>/reject/
+        Encola el cambio a 'rejected', no se crea nada real en la BD.
+        Notifica por WebSocket el cambio de estado también.
+        """
+        instance = self.get_object()
+
+        if instance.status != 'pending':
+            return Response(
+                {"detail": "Este registro ya fue procesado."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return self._encolar('rechazar', [instance.id])
+
+    # ------------------------------------------------------------------------------------
+    # (4) Aprobar / rechazar en lote
+    # ------------------------------------------------------------------------------------
+    def _ids(self, request):
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError({"ids": "Se requiere una lista de ids."})
+        if len(ids) > materializar.MAX_IDS:
+            raise ValidationError({"ids": f"Máximo {materializar.MAX_IDS} por request."})
+        try:
+            return [int(i) for i in ids]
+        except (TypeError, ValueError):
+            raise ValidationError({"ids": "Los ids deben ser enteros."})
+
+    @action(detail=False, methods=['post'], url_path='batch-approve')
+    def batch_approve(self, request):
+        """
+        POST /api/aprobaciones/batch-approve/  {"ids": [1, 2, ...]}
+        Encola la aprobación de todas en un trabajo (una transacción). En su
+        resultado, las que otro admin estaba procesando o que ya no estaban
+        pendientes vienen en `omitidas`; las que tienen datos inválidos (o
+        encimarían a un jugador) en `errores`.
+        """
+        return self._encolar('aprobar', self._ids(request))
+
+    @action(detail=False, methods=['post'], url_path='batch-reject')
+    def batch_reject(self, request):
+        """POST /api/aprobaciones/batch-reject/  {"ids": [1, 2, ...]}"""
+        return self._encolar('rechazar', self._ids(request))
+
+    @action(detail=False, methods=['get'], url_path=r'trabajos/(?P<trabajo_id>\d+)', url_name='trabajo')
+    def trabajo(self, request, trabajo_id=None):
+        """
+        GET /api/aprobaciones/trabajos/<id>/
+        Estado del trabajo: pendiente, procesando, hecho (con su resultado) o
+        fallido (agotó sus intentos; con el último error).
+        """
+        trabajo = get_object_or_404(Trabajo, pk=trabajo_id)
+        return Response(TrabajoSerializer(trabajo).data)
@@ -0,0 +1,154 @@
+# partidos/agenda.py
+"""
+Detección de jugadores con dos partidos encimados.
+
+Un partido ocupa [inicio, inicio + duracion), con la duración guardada en
+Partido (y copiada en Participacion); dos partidos de un jugador se enciman
+si cada uno empieza antes de que termine el otro. Ningún partido dura más
+de DURACION_MAXIMA, así que los candidatos a chocar con uno que empieza en
+`inicio` son los que empiezan dentro de (inicio - DURACION_MAXIMA, fin): un
+rango acotado por jugador sobre su lista ordenada de inicios.
+
+- conflictos(): un partido nuevo contra la BD. Es un range scan por jugador
+  sobre participacion_usuario_idx (usuario, fecha, hora), O(log n).
+- Agenda: la misma idea en memoria para la importación masiva: se carga con
+  una consulta por lote y cada revisión es un bisect, O(log n); los partidos
+  aceptados se van agregando para detectar choques dentro del mismo archivo.
+- conflictos_torneo(): reporte de un torneo en una sola pasada (sweep line)
+  sobre las participaciones de sus jugadores ordenadas por el índice.
+"""
+import datetime
+from bisect import bisect_right
+from collections import defaultdict
+
+from django.db.models import Max, Min, Q
+
+from .models import Participacion, DURACION_DEFAULT, DURACION_MAXIMA as MINUTOS_MAXIMOS
+
+DURACION_MAXIMA = datetime.timedelta(minutes=MINUTOS_MAXIMOS)  # Hasta dónde hay que mirar hacia atrás
+
+
+def _entre(desde, hasta):
+    """(fecha, hora) estrictamente entre dos datetimes; la cota en fecha deja usar el índice."""
+    return (
+        Q(fecha__gte=desde.date(), fecha__lte=hasta.date())
+        & (Q(fecha__gt=desde.date()) | Q(fecha=desde.date(), hora__gt=desde.time()))
+        & (Q(fecha__lt=hasta.date()) | Q(fecha=hasta.date(), hora__lt=hasta.time()))
+    )
+
+
+def mensaje(user_id, partido_id, inicio):
+    return f"El jugador {user_id} ya juega el partido {partido_id} a las {inicio:%Y-%m-%d %H:%M}."
+
+
+def conflictos(jugadores, fecha, hora, duracion=DURACION_DEFAULT, excluir=None):
+    """
+    Partidos de `jugadores` que se enciman con uno que empieza en (fecha, hora)
+    y dura `duracion` minutos. Regresa una lista de mensajes (vacía si no hay
+    choques). `excluir` es el propio partido cuando se está editando.
+    """
+    inicio = datetime.datetime.combine(fecha, hora)
+    fin = inicio + datetime.timedelta(minutes=duracion)
+    candidatos = Participacion.objects.filter(
+        _entre(inicio - DURACION_MAXIMA, fin), usuario_id__in=jugadores,
+    )
+    if excluir is not None:
+        candidatos = candidatos.exclude(partido_id=excluir)
+    choques = []
+    for user_id, partido_id, f, h, minutos in (
+        candidatos.order_by('usuario_id', 'fecha', 'hora')
+        .values_list('usuario_id', 'partido_id', 'fecha', 'hora', 'duracion')
+    ):
+        otro = datetime.datetime.combine(f, h)
+        if otro + datetime.timedelta(minutes=minutos) > inicio:
+            choques.append(mensaje(user_id, partido_id, otro))
+    return choques
+
+
+class Agenda:
+    """Inicios y fines de partido por jugador, ordenados por inicio, para revisar muchos partidos sin ir a la BD."""
+
+    def __init__(self):
+        self._inicios = defaultdict(list)  # jugador -> [datetime] ordenada
+        self._partidos = defaultdict(list)  # jugador -> [(fin, partido_id)] en el mismo orden
+
+    @classmethod
+    def cargar(cls, jugadores, desde, hasta):
+        """Partidos existentes de `jugadores` que podrían chocar con algo entre las fechas dadas."""
+        agenda = cls()
+        filas = Participacion.objects.filter(
+            _entre(
+                datetime.datetime.combine(desde, datetime.time.min) - DURACION_MAXIMA,
+                datetime.datetime.combine(hasta, datetime.time.max) + DURACION_MAXIMA,
+            ),
+            usuario_id__in=jugadores,
+        ).values_list('usuario_id', 'partido_id', 'fecha', 'hora', 'duracion')
+        for user_id, partido_id, fecha, hora, duracion in filas.iterator(chunk_size=5000):
+            agenda.agregar([user_id], datetime.datetime.combine(fecha, hora), duracion, partido_id)
+        return agenda
+
+    def agregar(self, jugadores, inicio, duracion=DURACION_DEFAULT, partido_id=None):
+        fin = inicio + datetime.timedelta(minutes=duracion)
+        for user_id in jugadores:
+            inicios = self._inicios[user_id]
+            i = bisect_right(inicios, inicio)
+            inicios.insert(i, inicio)
+            self._partidos[user_id].insert(i, (fin, partido_id))
+
+    def conflictos(self, jugadores, inicio, duracion=DURACION_DEFAULT):
+        """Mensajes de choque del partido que empieza en `inicio` (lista vacía si no hay)."""
+        fin = inicio + datetime.timedelta(minutes=duracion)
+        choques = []
+        for user_id in jugadores:
+            inicios = self._inicios.get(user_id, ())
+            i = bisect_right(inicios, inicio - DURACION_MAXIMA)
+            while i < len(inicios) and inicios[i] < fin:
+                fin_otro, otro = self._partidos[user_id][i]
+                if fin_otro > inicio:
+                    choques.append(mensaje(user_id, otro if otro is not None else "de esta carga", inicios[i]))
+                    break  # Con un choque por jugador alcanza
+                i += 1
+        return choques
+
+
+def conflictos_torneo(torneo_id):
+    """
+    Todos los pares de partidos encimados de algún jugador del torneo, donde al
+    menos uno es del torneo. Una consulta ordenada por (usuario, fecha, hora) y
+    una pasada: por jugador se guardan los partidos que aún no terminan.
+    """
+    del_torneo = Participacion.objects.filter(torneo_id=torneo_id)
+    rango = del_torneo.aggregate(desde=Min('fecha'), hasta=Max('fecha'))
+    if rango['desde'] is None:
+        return []
+    filas = (
+        Participacion.objects.filter(
+            _entre(
+                datetime.datetime.combine(rango['desde'], datetime.time.min) - DURACION_MAXIMA,
+                datetime.datetime.combine(rango['hasta'], datetime.time.max) + DURACION_MAXIMA,
+            ),
+            usuario_id__in=del_torneo.values('usuario_id'),
+        )
+        .order_by('usuario_id', 'fecha', 'hora', 'partido_id')
+        .values_list('usuario_id', 'partido_id', 'torneo_id', 'fecha', 'hora', 'duracion')
+    )
+
+    reporte = []
+    actual, ventana = None, []
+    for user_id, partido_id, otro_torneo, fecha, hora, duracion in filas.iterator(chunk_size=5000):
+        if user_id != actual:
+            actual, ventana = user_id, []
+        inicio = datetime.datetime.combine(fecha, hora)
+        # Con duraciones distintas el primero en empezar no es el primero en terminar
+        ventana = [previo for previo in ventana if previo[3] > inicio]
+        for inicio_previo, previo, torneo_previo, _ in ventana:
+            if torneo_id in (otro_torneo, torneo_previo):
+                reporte.append({
+                    "jugador": user_id,
+                    "partido": previo,
+                    "inicio": inicio_previo,
+                    "otro_partido": partido_id,
+                    "otro_inicio": inicio,
+                })
+        ventana.append((inicio, partido_id, otro_torneo, inicio + datetime.timedelta(minutes=duracion)))
+    return reporte
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class PartidosConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'partidos'
+
+    def ready(self):
+        # Conecta los signals que mantienen la tabla Participacion
+        from . import signals  # noqa: F401
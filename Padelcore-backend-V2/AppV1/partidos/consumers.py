@@ -0,0 +1,86 @@
+# partidos/consumers.py
+import asyncio
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from . import marcador
+
+# Máximo de estados por segundo que se mandan a los espectadores de un partido
+INTERVALO = 0.2
+
+# Coalescencia por partido (por proceso): el primer cambio sale de inmediato;
+# los que lleguen en los siguientes INTERVALO segundos se reemplazan entre sí
+# y sólo sale el último. Cada group_send cuesta una escritura en Redis por
+# espectador, así que con miles en una final no importa lo rápido que anote
+# el árbitro: son a lo más 5 mensajes por segundo.
+_pendientes = {}  # partido_id -> último estado sin mandar
+_emisores = {}  # partido_id -> tarea que está mandando
+
+
+async def publicar(channel_layer, estado):
+    partido_id = estado['partido']
+    pendiente = _pendientes.get(partido_id)
+    if pendiente is None or pendiente['v'] < estado['v']:
+        _pendientes[partido_id] = estado
+    if partido_id not in _emisores:
+        _emisores[partido_id] = asyncio.ensure_future(_emitir(channel_layer, partido_id))
+
+
+async def _emitir(channel_layer, partido_id):
+    try:
+        while partido_id in _pendientes:
+            estado = _pendientes.pop(partido_id)
+            await channel_layer.group_send(
+                marcador.grupo(partido_id),
+                {"type": "marcador_estado", "estado": estado},
+            )
+            await asyncio.sleep(INTERVALO)
+    finally:
+        _emisores.pop(partido_id, None)
+
+
+class MarcadorConsumer(AsyncJsonWebsocketConsumer):
+    """
+    ws/partidos/<id>/marcador/
+    Espectadores: al conectarse reciben el snapshot del marcador y después
+    cada estado nuevo (a lo más 5 por segundo).
+    Árbitro (usuario staff, autenticado con ?token=<access> o por sesión;
+    ver AppV1/autenticacion.py): manda {"accion": "punto", "equipo": 1|2} o
+    {"accion": "deshacer"} y recibe el estado resultante de inmediato.
+    """
+
+    async def connect(self):
+        self.partido_id = int(self.scope['url_route']['kwargs']['partido_id'])
+        self.grupo = None
+        estado = await database_sync_to_async(marcador.snapshot)(self.partido_id)
+        if estado is None:
+            await self.close(code=4004)
+            return
+        self.grupo = marcador.grupo(self.partido_id)
+        await self.channel_layer.group_add(self.grupo, self.channel_name)
+        await self.accept()
+        await self.send_json(estado)
+
+    async def disconnect(self, close_code):
+        if self.grupo:
+            await self.channel_layer.group_discard(self.grupo, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        user = self.scope.get("user")
+        if not (user and user.is_authenticated and user.is_staff):
+            await self.send_json({"error": "Sólo un árbitro puede anotar."})
+            return
+        try:
+            estado = await database_sync_to_async(marcador.registrar)(
+                self.partido_id, content.get('accion'), content.get('equipo'),
+            )
+        except marcador.MarcadorError as exc:
+            await self.send_json({"error": str(exc)})
+            return
+        await self.send_json(estado)
+        await publicar(self.channel_layer, estado)
+
+    # Mensajes del group_send de publicar()
+    async def marcador_estado(self, event):
+        await self.send_json(event["estado"])
@@ -0,0 +1,131 @@
+# partidos/estadisticas.py
+"""
+Mantiene EstadisticasJugador de forma incremental.
+
+partidos/participaciones.py llama a aplicar() con las filas de Participacion
+de unos partidos antes y después de cada cambio. Sólo se tocan los jugadores
+cuyas filas cambiaron:
+
+- partidos/ganados/perdidos: se suman las diferencias con UPDATE ... SET x = x + n.
+- torneos: sólo cambia si el jugador ganó o perdió su único partido con
+  resultado en ese torneo (una consulta EXISTS por caso).
+- racha y ultimo_partido: se recalculan con búsquedas por el índice
+  (usuario, fecha, hora, partido) de Participacion: la última derrota y los
+  partidos ganados después de ella.
+
+reconstruir() rehace la tabla completa en una sola pasada.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Participacion, EstadisticasJugador
+
+ORDEN = ('-fecha', '-hora', '-partido_id')
+
+
+def aplicar(ids, viejas, nuevas):
+    """
+    viejas/nuevas: filas (partido_id, usuario_id, torneo_id, resultado, fecha, hora)
+    de los partidos `ids` antes y después del cambio (las nuevas ya están guardadas).
+    """
+    quitadas = set(viejas) - set(nuevas)
+    agregadas = set(nuevas) - set(viejas)
+    if not quitadas and not agregadas:
+        return  # Se guardó el partido sin cambios
+
+    deltas = defaultdict(lambda: {'partidos': 0, 'ganados': 0, 'perdidos': 0})
+    racha = set()
+    for filas, signo in ((quitadas, -1), (agregadas, 1)):
+        for _, user_id, _, resultado, _, _ in filas:
+            if resultado:
+                delta = deltas[user_id]
+                delta['partidos'] += signo
+                delta['ganados' if resultado == 'G' else 'perdidos'] += signo
+                racha.add(user_id)
+
+    torneos = defaultdict(int)
+    antes = {(f[1], f[2]) for f in viejas if f[3]}
+    despues = {(f[1], f[2]) for f in nuevas if f[3]}
+    for user_id, torneo_id in antes ^ despues:
+        otros = (
+            Participacion.objects.filter(usuario_id=user_id, torneo_id=torneo_id)
+            .exclude(resultado='').exclude(partido_id__in=ids).exists()
+        )
+        if not otros:
+            torneos[user_id] += 1 if (user_id, torneo_id) in despues else -1
+
+    usuarios = set(deltas) | set(torneos) | racha
+    if not usuarios:
+        return  # Sólo cambiaron partidos sin resultado
+    EstadisticasJugador.objects.bulk_create(
+        [EstadisticasJugador(user_id=user_id) for user_id in usuarios],
+        ignore_conflicts=True,
+    )
+    ahora = timezone.now()
+    for user_id in usuarios:
+        cambios = {campo: F(campo) + n for campo, n in deltas.get(user_id, {}).items() if n}
+        if torneos.get(user_id):
+            cambios['torneos'] = F('torneos') + torneos[user_id]
+        if user_id in racha:
+            cambios['racha'], cambios['ultimo_partido'] = _racha(user_id)
+        EstadisticasJugador.objects.filter(user_id=user_id).update(updated_at=ahora, **cambios)
+
+
+def _racha(user_id):
+    """(victorias seguidas hasta hoy, fecha del último partido con resultado)."""
+    decididos = Participacion.objects.filter(usuario_id=user_id).exclude(resultado='').order_by(*ORDEN)
+    ultimo = decididos.values_list('fecha', flat=True).first()
+    if ultimo is None:
+        return 0, None
+    derrota = decididos.filter(resultado='P').values_list('fecha', 'hora', 'partido_id').first()
+    ganados = decididos.filter(resultado='G')
+    if derrota:
+        fecha, hora, partido_id = derrota
+        ganados = ganados.filter(
+            Q(fecha__gt=fecha)
+            | Q(fecha=fecha, hora__gt=hora)
+            | Q(fecha=fecha, hora=hora, partido_id__gt=partido_id)
+        )
+    return ganados.count(), ultimo
+
+
+def reconstruir(batch_size=5000):
+    """Rehace EstadisticasJugador desde Participacion. Regresa cuántos jugadores escribió."""
+    filas = (
+        Participacion.objects.exclude(resultado='')
+        .order_by('usuario_id', *ORDEN)
+        .values_list('usuario_id', 'torneo_id', 'resultado', 'fecha')
+    )
+    escritos = 0
+    with transaction.atomic():
+        EstadisticasJugador.objects.all().delete()
+        batch = []
+        actual = None
+        for user_id, torneo_id, resultado, fecha in filas.iterator(chunk_size=batch_size):
+            # Filas de cada jugador juntas, de la más reciente a la más vieja
+            if actual is None or actual.user_id != user_id:
+                if actual is not None:
+                    batch.append(actual)
+                actual = EstadisticasJugador(user_id=user_id, ultimo_partido=fecha)
+                torneos, en_racha = set(), True
+            actual.partidos += 1
+            if resultado == 'G':
+                actual.ganados += 1
+                actual.racha += en_racha
+            else:
+                actual.perdidos += 1
+                en_racha = False
+            torneos.add(torneo_id)
+            actual.torneos = len(torneos)
+            if len(batch) >= batch_size:
+                EstadisticasJugador.objects.bulk_create(batch)
+                escritos += len(batch)
+                batch = []
+        if actual is not None:
+            batch.append(actual)
+        EstadisticasJugador.objects.bulk_create(batch)
+        escritos += len(batch)
+    return escritos
@@ -0,0 +1,228 @@
+# partidos/importacion.py
+"""
+Importación masiva de partidos (POST /api/partidos/import/).
+guardar()/publicar() también los usa el generador de fixtures (torneos/fixture.py).
+
+El cuerpo es NDJSON (un objeto JSON por línea) o CSV con encabezado:
+
+    torneo,fecha,hora,resultado,equipo_1_ids,equipo_2_ids
+    3,2025-01-10,18:30,E1,<uuid>|<uuid>,<uuid>|<uuid>
+
+`duracion` (minutos) es opcional; por defecto DURACION_DEFAULT.
+
+Las filas se leen del stream de a una y se procesan por lotes de LOTE:
+torneos y jugadores se validan con una consulta por lote (no una por id)
+y los partidos y sus equipos se escriben con bulk_create, todo en una sola
+transacción. Las filas inválidas se reportan y no detienen la carga.
+También se rechazan las filas que enciman a un jugador con otro partido,
+ya guardado o de la misma carga (ver partidos/agenda.py).
+"""
+import codecs
+import csv
+import datetime
+import json
+import uuid
+from itertools import islice
+
+from django.db import transaction
+from rest_framework.parsers import BaseParser
+
+from torneos.models import Torneo
+from usuarios.models import Usuario
+from .models import Partido, RESULTADO_CHOICES, DURACION_DEFAULT, DURACION_MINIMA, DURACION_MAXIMA
+from . import agenda, participaciones
+from .signals import partidos_importados
+
+LOTE = 1000  # Filas por consulta de validación / bulk insert
+MAX_FILAS = 50000  # Tope por request
+RESULTADOS = {valor for valor, _ in RESULTADO_CHOICES}
+JUGADORES_POR_EQUIPO = 2
+
+
+class NDJSONParser(BaseParser):
+    """Regresa un generador de dicts: no carga todo el cuerpo en memoria."""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return _ndjson(_lineas(stream))
+
+
+class CSVParser(BaseParser):
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return csv.DictReader(_lineas(stream))
+
+
+def _lineas(stream):
+    if stream is None:  # Cuerpo vacío
+        return iter(())
+    return codecs.iterdecode(stream, 'utf-8')
+
+
+def _ndjson(lineas):
+    for linea in lineas:
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            yield json.loads(linea)
+        except ValueError:
+            yield None  # _validar lo reporta como fila inválida
+
+
+def _ids(valor):
+    # NDJSON trae listas; CSV trae "uuid|uuid"
+    if isinstance(valor, str):
+        valor = [v for v in valor.split('|') if v.strip()]
+    if not isinstance(valor, list):
+        raise ValueError
+    return [uuid.UUID(str(v).strip()) for v in valor]
+
+
+def _validar(fila):
+    """Valida la forma de una fila sin tocar la BD. Regresa (datos, errores)."""
+    if not isinstance(fila, dict):
+        return None, {"fila": "Debe ser un objeto con torneo, fecha, hora y equipos."}
+    errores = {}
+    datos = {}
+    try:
+        datos['torneo_id'] = int(fila.get('torneo'))
+    except (TypeError, ValueError):
+        errores['torneo'] = "Debe ser el id del torneo."
+    try:
+        datos['fecha'] = datetime.date.fromisoformat(str(fila.get('fecha')))
+    except ValueError:
+        errores['fecha'] = "Formato inválido, usa YYYY-MM-DD."
+    try:
+        datos['hora'] = datetime.time.fromisoformat(str(fila.get('hora')))
+    except ValueError:
+        errores['hora'] = "Formato inválido, usa HH:MM."
+    try:
+        datos['duracion'] = int(fila.get('duracion') or DURACION_DEFAULT)
+        if not DURACION_MINIMA <= datos['duracion'] <= DURACION_MAXIMA:
+            raise ValueError
+    except (TypeError, ValueError):
+        errores['duracion'] = f"Debe ser un entero de minutos entre {DURACION_MINIMA} y {DURACION_MAXIMA}."
+    datos['resultado'] = fila.get('resultado') or ''
+    if datos['resultado'] not in RESULTADOS:
+        errores['resultado'] = "Usa E1, E2 o vacío."
+    for equipo in ('equipo_1', 'equipo_2'):
+        try:
+            ids = _ids(fila.get(f'{equipo}_ids'))
+        except (TypeError, ValueError):
+            errores[f'{equipo}_ids'] = "Debe ser una lista de ids (UUID) de jugadores."
+            continue
+        if len(set(ids)) != JUGADORES_POR_EQUIPO:
+            errores[f'{equipo}_ids'] = f"El equipo debe tener exactamente {JUGADORES_POR_EQUIPO} jugadores."
+        datos[equipo] = ids
+    if not errores and set(datos['equipo_1']) & set(datos['equipo_2']):
+        errores['equipo_2_ids'] = "Un jugador no puede estar en ambos equipos."
+    return datos, errores
+
+
+def importar(filas):
+    """
+    Importa un iterable de filas (dicts). Regresa (ids creados, errores), donde
+    errores es una lista de {"fila": n, "errores": {...}} con n desde 1.
+    """
+    creados = []
+    errores = []
+    cargados = agenda.Agenda()  # Partidos aceptados de esta carga
+    numeradas = enumerate(islice(filas, MAX_FILAS + 1), start=1)
+    with transaction.atomic():
+        while True:
+            lote = list(islice(numeradas, LOTE))
+            if lote and lote[-1][0] > MAX_FILAS:
+                lote.pop()
+                errores.append({"fila": MAX_FILAS + 1, "errores": {"fila": f"Máximo {MAX_FILAS} filas por importación."}})
+            if not lote:
+                break
+            creados += _importar_lote(lote, errores, cargados)
+
+        publicar(creados)
+    errores.sort(key=lambda e: e['fila'])
+    return creados, errores
+
+
+def _importar_lote(lote, errores, cargados):
+    validas = []
+    for numero, fila in lote:
+        datos, errores_fila = _validar(fila)
+        if errores_fila:
+            errores.append({"fila": numero, "errores": errores_fila})
+        else:
+            validas.append((numero, datos))
+
+    # Una consulta por tabla para todo el lote
+    torneos = set(Torneo.objects.filter(
+        pk__in={d['torneo_id'] for _, d in validas}
+    ).values_list('pk', flat=True))
+    jugadores = set(Usuario.objects.filter(
+        pk__in={j for _, d in validas for j in d['equipo_1'] + d['equipo_2']}
+    ).values_list('pk', flat=True))
+
+    # Agenda de los partidos ya guardados de los jugadores del lote, una consulta
+    existentes = agenda.Agenda()
+    if validas:
+        existentes = agenda.Agenda.cargar(
+            jugadores, min(d['fecha'] for _, d in validas), max(d['fecha'] for _, d in validas),
+        )
+
+    nuevos = []
+    for numero, datos in validas:
+        errores_fila = {}
+        if datos['torneo_id'] not in torneos:
+            errores_fila['torneo'] = "El torneo no existe."
+        for equipo in ('equipo_1', 'equipo_2'):
+            faltan = [str(j) for j in datos[equipo] if j not in jugadores]
+            if faltan:
+                errores_fila[f'{equipo}_ids'] = f"Jugadores inexistentes: {', '.join(faltan)}"
+        if not errores_fila:
+            ids = datos['equipo_1'] + datos['equipo_2']
+            inicio = datetime.datetime.combine(datos['fecha'], datos['hora'])
+            duracion = datos['duracion']
+            choques = existentes.conflictos(ids, inicio, duracion) + cargados.conflictos(ids, inicio, duracion)
+            if choques:
+                errores_fila['horario'] = choques
+            else:
+                cargados.agregar(ids, inicio, duracion)
+        if errores_fila:
+            errores.append({"fila": numero, "errores": errores_fila})
+        else:
+            nuevos.append(datos)
+
+    return guardar(nuevos)
+
+
+def guardar(nuevos):
+    """
+    Escribe partidos ({torneo_id, fecha, hora, resultado, equipo_1, equipo_2}
+    y opcionalmente duracion y cancha) con bulk_create, equipos incluidos. Regresa los ids.
+    bulk_create no dispara post_save ni m2m_changed: hay que llamar a publicar().
+    """
+    partidos = Partido.objects.bulk_create([
+        Partido(
+            torneo_id=d['torneo_id'], fecha=d['fecha'], hora=d['hora'],
+            duracion=d.get('duracion', DURACION_DEFAULT),
+            resultado=d.get('resultado', ''), cancha=d.get('cancha'),
+        )
+        for d in nuevos
+    ], batch_size=LOTE)
+    for equipo in ('equipo_1', 'equipo_2'):
+        through = getattr(Partido, equipo).through
+        through.objects.bulk_create([
+            through(partido_id=partido.pk, usuario_id=user_id)
+            for partido, datos in zip(partidos, nuevos)
+            for user_id in datos[equipo]
+        ], batch_size=LOTE)
+    return [p.pk for p in partidos]
+
+
+def publicar(ids):
+    """Lo que harían los signals por fila: participaciones y ranking (partidos_importados)."""
+    if not ids:
+        return
+    for i in range(0, len(ids), LOTE):
+        participaciones.sincronizar_lote(ids[i:i + LOTE])
+    partidos_importados.send(sender=Partido, ids=ids)
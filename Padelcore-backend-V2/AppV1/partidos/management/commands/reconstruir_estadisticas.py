@@ -0,0 +1,20 @@
+# partidos/management/commands/reconstruir_estadisticas.py
+
+from django.core.management.base import BaseCommand
+
+from partidos import estadisticas
+
+class Command(BaseCommand):
+    help = ("Reconstruye desde cero la tabla EstadisticasJugador (partidos, victorias, racha, torneos) "
+            "a partir de Participacion. Los signals la mantienen al día; esto es para backfill o reparación.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Filas por lote de lectura/escritura (default 5000)')
+
+    def handle(self, *args, **options):
+        jugadores = estadisticas.reconstruir(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Estadísticas reconstruidas para {jugadores} jugadores."
+        ))
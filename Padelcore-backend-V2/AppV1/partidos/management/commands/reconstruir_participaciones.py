@@ -0,0 +1,19 @@
+# partidos/management/commands/reconstruir_participaciones.py
+
+from django.core.management.base import BaseCommand
+
+from partidos.participaciones import reconstruir
+
+class Command(BaseCommand):
+    help = "Reconstruye la tabla Participacion (historial y head-to-head) a partir de los equipos de cada partido."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help='Partidos por lote (default 2000)')
+
+    def handle(self, *args, **options):
+        escritas = reconstruir(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Participaciones reconstruidas: {escritas} filas."
+        ))
@@ -0,0 +1,146 @@
+# partidos/marcador.py
+"""
+Marcador en vivo de un partido de pádel.
+
+El estado es un dict compacto (lo mismo que recibe un espectador):
+    {"partido": 7, "v": 41, "sets": [[6, 4], [3, 2]], "puntos": [2, 3],
+     "saque": 1, "ganador": None}
+- sets: juegos de cada equipo por set; el último es el set en juego.
+- puntos: puntos del juego en curso (0, 1, 2, 3 => 0, 15, 30, 40; con
+  ventaja se siguen contando). En tie-break son los puntos del tie-break.
+- v: versión; sube con cada cambio (también al deshacer), así el cliente
+  descarta un estado viejo que le llegue tarde.
+
+Reglas: juego con ventaja, set a 6 juegos por 2 con tie-break a 7 en el 6-6,
+partido al mejor de 3 sets. Al terminar se escribe Partido.resultado (y con
+eso corren Elo, puntos y estadísticas como con cualquier resultado).
+
+registrar() aplica una acción del árbitro en la BD; snapshot() es lo que
+recibe quien se conecta tarde: el estado actual, sin repetir los puntos.
+"""
+import copy
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Partido, MarcadorEnVivo
+
+logger = logging.getLogger(__name__)
+
+ACCIONES = ('punto', 'deshacer')
+SETS_PARA_GANAR = 2
+JUEGOS_POR_SET = 6
+PUNTOS_TIEBREAK = 7
+MAX_HISTORIAL = 200  # Puntos que se pueden deshacer
+TIMEOUT = 60 * 60 * 6  # Vida del snapshot en la caché compartida (segundos)
+
+
+class MarcadorError(Exception):
+    """Acción inválida del árbitro."""
+
+
+def grupo(partido_id):
+    """Grupo de Channels de los espectadores del partido."""
+    return f"marcador_{partido_id}"
+
+
+def _cache_key(partido_id):
+    return f"marcador:{partido_id}"
+
+
+def nuevo(partido_id):
+    return {"partido": partido_id, "v": 0, "sets": [[0, 0]], "puntos": [0, 0], "saque": 1, "ganador": None}
+
+
+def anotar(estado, equipo):
+    """Regresa el estado después de que `equipo` (1 o 2) gana un punto."""
+    if estado['ganador']:
+        raise MarcadorError("El partido ya terminó.")
+    estado = copy.deepcopy(estado)
+    i, j = equipo - 1, 2 - equipo
+    juegos, puntos = estado['sets'][-1], estado['puntos']
+    tiebreak = juegos == [JUEGOS_POR_SET, JUEGOS_POR_SET]
+    puntos[i] += 1
+    if puntos[i] >= (PUNTOS_TIEBREAK if tiebreak else 4) and puntos[i] - puntos[j] >= 2:
+        juegos[i] += 1
+        estado['puntos'] = [0, 0]
+        estado['saque'] = 3 - estado['saque']
+        if tiebreak or (juegos[i] >= JUEGOS_POR_SET and juegos[i] - juegos[j] >= 2):
+            if sum(1 for s in estado['sets'] if s[i] > s[j]) == SETS_PARA_GANAR:
+                estado['ganador'] = equipo
+            else:
+                estado['sets'].append([0, 0])
+    estado['v'] += 1
+    return estado
+
+
+def registrar(partido_id, accion, equipo=None):
+    """
+    Aplica la acción del árbitro ('punto' con equipo 1|2, o 'deshacer') y
+    regresa el estado nuevo. El lock sobre el Partido ordena a dos árbitros.
+    """
+    if accion not in ACCIONES:
+        raise MarcadorError(f"Acción inválida, usa: {', '.join(ACCIONES)}.")
+    if accion == 'punto' and equipo not in (1, 2):
+        raise MarcadorError("El equipo debe ser 1 o 2.")
+
+    with transaction.atomic():
+        partido = Partido.objects.select_for_update().filter(pk=partido_id).first()
+        if partido is None:
+            raise MarcadorError("El partido no existe.")
+        marcador = (
+            MarcadorEnVivo.objects.filter(partido=partido).first()
+            or MarcadorEnVivo(partido=partido, estado=nuevo(partido.pk))
+        )
+        anterior = marcador.estado
+        if accion == 'punto':
+            estado = anotar(anterior, equipo)
+            marcador.historial = (marcador.historial + [anterior])[-MAX_HISTORIAL:]
+        else:
+            if not marcador.historial:
+                raise MarcadorError("No hay nada que deshacer.")
+            estado = marcador.historial.pop()
+            estado['v'] = anterior['v'] + 1
+        marcador.estado = estado
+        marcador.save()
+
+        # Sólo tocamos el resultado al cerrar el partido (o al deshacer el cierre)
+        if estado['ganador'] or anterior['ganador']:
+            partido.resultado = f"E{estado['ganador']}" if estado['ganador'] else ''
+            partido.save()
+
+        transaction.on_commit(lambda: _guardar_snapshot(estado))
+    return estado
+
+
+def _guardar_snapshot(estado):
+    try:
+        cache.set(_cache_key(estado['partido']), estado, TIMEOUT)
+    except Exception:
+        # El snapshot se puede rearmar desde la BD
+        logger.exception("No se pudo guardar el marcador en la caché compartida")
+
+
+def snapshot(partido_id):
+    """Estado actual para quien se conecta tarde; None si el partido no existe."""
+    try:
+        estado = cache.get(_cache_key(partido_id))
+    except Exception:
+        logger.exception("No se pudo leer el marcador de la caché compartida")
+        estado = None
+    if estado is not None:
+        return estado
+    estado = (
+        MarcadorEnVivo.objects.filter(partido_id=partido_id).values_list('estado', flat=True).first()
+    )
+    if estado is None:
+        if not Partido.objects.filter(pk=partido_id).exists():
+            return None
+        estado = nuevo(partido_id)
+    try:
+        # add: no pisamos un estado más nuevo que haya escrito el árbitro
+        cache.add(_cache_key(partido_id), estado, TIMEOUT)
+    except Exception:
+        logger.exception("No se pudo guardar el marcador en la caché compartida")
+    return estado
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='partido',
+            name='resultado',
+            field=models.CharField(blank=True, choices=[('', 'Sin definir'), ('E1', 'Ganó Equipo 1'), ('E2', 'Ganó Equipo 2')], default='', max_length=2, verbose_name='Resultado del Partido'),
+        ),
+    ]
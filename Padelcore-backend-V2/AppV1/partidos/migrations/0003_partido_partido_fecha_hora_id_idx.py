@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0002_alter_partido_resultado'),
+        ('torneos', '0002_torneo_factor_k'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='partido',
+            index=models.Index(fields=['-fecha', '-hora', '-id'], name='partido_fecha_hora_id_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0003_partido_partido_fecha_hora_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Participacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('equipo', models.PositiveSmallIntegerField(choices=[(1, 'Equipo 1'), (2, 'Equipo 2')])),
+                ('resultado', models.CharField(blank=True, choices=[('', 'Sin definir'), ('G', 'Ganó'), ('P', 'Perdió')], default='', max_length=1)),
+                ('fecha', models.DateField()),
+                ('hora', models.TimeField()),
+                ('partido', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participaciones', to='partidos.partido')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participaciones', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['usuario', '-fecha', '-hora', '-partido'], name='participacion_usuario_idx')],
+                'constraints': [models.UniqueConstraint(fields=('partido', 'usuario'), name='unique_participacion_partido_usuario')],
+            },
+        ),
+    ]
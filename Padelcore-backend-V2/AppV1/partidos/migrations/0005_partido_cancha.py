@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0004_participacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partido',
+            name='cancha',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Cancha'),
+        ),
+    ]
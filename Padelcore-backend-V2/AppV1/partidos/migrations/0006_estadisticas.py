@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copiar_torneo(apps, schema_editor):
+    # Las participaciones existentes toman el torneo de su partido
+    Partido = apps.get_model('partidos', 'Partido')
+    Participacion = apps.get_model('partidos', 'Participacion')
+    Participacion.objects.update(
+        torneo_id=Subquery(Partido.objects.filter(pk=OuterRef('partido_id')).values('torneo_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0005_partido_cancha'),
+        ('torneos', '0002_torneo_factor_k'),
+        ('usuarios', '0003_usuario_usuario_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadisticasJugador',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='estadisticas', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('partidos', models.PositiveIntegerField(default=0)),
+                ('ganados', models.PositiveIntegerField(default=0)),
+                ('perdidos', models.PositiveIntegerField(default=0)),
+                ('racha', models.PositiveIntegerField(default=0, verbose_name='Racha de victorias actual')),
+                ('torneos', models.PositiveIntegerField(default=0, verbose_name='Torneos con partidos jugados')),
+                ('ultimo_partido', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='participacion',
+            name='torneo',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='participaciones', to='torneos.torneo'),
+        ),
+        migrations.RunPython(copiar_torneo, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='participacion',
+            name='torneo',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participaciones', to='torneos.torneo'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0006_estadisticas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarcadorEnVivo',
+            fields=[
+                ('partido', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='marcador', serialize=False, to='partidos.partido')),
+                ('estado', models.JSONField(default=dict)),
+                ('historial', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
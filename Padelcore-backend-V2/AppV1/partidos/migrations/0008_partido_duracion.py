@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:35
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0007_marcador_en_vivo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participacion',
+            name='duracion',
+            field=models.PositiveSmallIntegerField(default=90),
+        ),
+        migrations.AddField(
+            model_name='partido',
+            name='duracion',
+            field=models.PositiveSmallIntegerField(default=90, validators=[django.core.validators.MinValueValidator(10), django.core.validators.MaxValueValidator(240)], verbose_name='Duración (minutos)'),
+        ),
+    ]
@@ -0,0 +1,153 @@
+from django.db import models
+from torneos.models import Torneo
+from usuarios.models import Usuario
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
+
+# Create your models here.
+RESULTADO_CHOICES = [
+    ("", "Sin definir"),
+    ("E1", "Ganó Equipo 1"),
+    ("E2", "Ganó Equipo 2"),
+]
+# Duración de un partido en minutos (ver partidos/agenda.py)
+DURACION_DEFAULT = 90
+DURACION_MINIMA = 10
+DURACION_MAXIMA = 240
+class Partido(models.Model):
+    torneo = models.ForeignKey(
+        Torneo,
+        on_delete=models.CASCADE, #Elimina los partidos si se llega a eliminar el torneo
+        related_name="partidos",
+        verbose_name="Torneo"
+    )
+    equipo_1 = models.ManyToManyField(
+        Usuario,
+        related_name="equipo_1",
+        verbose_name= "Equipo 1",
+        
+    )  
+    equipo_2 = models.ManyToManyField(
+        Usuario,
+        related_name="equipo_2",
+        verbose_name="Equipo 2",
+        
+    )  
+    fecha = models.DateField()
+    hora = models.TimeField()
+    duracion = models.PositiveSmallIntegerField(
+        default=DURACION_DEFAULT,
+        validators=[MinValueValidator(DURACION_MINIMA), MaxValueValidator(DURACION_MAXIMA)],
+        verbose_name="Duración (minutos)"
+    )  # La fija el fixture; con ella se revisan los choques de horario
+    resultado = models.CharField(
+        max_length=2,
+        choices=RESULTADO_CHOICES,
+        blank=True,     # Permite que el campo esté vacío (opcional)
+        default="",     # Valor por defecto = sin definir
+        verbose_name="Resultado del Partido"
+    )  # Opcional, se completa después del partido
+    cancha = models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="Cancha")  # La asigna el generador de fixtures
+    createdP = models.DateTimeField(auto_now_add=True,verbose_name="Creado") #Para saber cuanto tiempo lleva Creado
+    modifiedP = models.DateTimeField(auto_now=True, verbose_name="Modificado") #Para saber última modificación
+
+    class Meta:
+        indexes = [
+            # Paginación por llave (fecha, hora, id), los más recientes primero
+            models.Index(fields=['-fecha', '-hora', '-id'], name='partido_fecha_hora_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.equipo_1} vs {self.equipo_2} - {self.fecha} {self.hora}"
+    
+    def clean(self):
+        super().clean()
+        if self.equipo_1.count() != 2:
+            raise ValidationError("El equipo 1 debe tener exactamente 2 jugadores.")
+        if self.equipo_2.count() != 2:
+            raise ValidationError("El equipo 2 debe tener exactamente 2 jugadores.")
+
+class Participacion(models.Model):
+    """
+    Una fila por jugador por partido: de qué lado jugó y cómo le fue.
+    Copia compacta de equipo_1/equipo_2 + resultado que mantiene
+    partidos/participaciones.py, para que el historial de un jugador y el
+    head-to-head sean un range scan de índice en vez de unir dos M2M.
+    """
+    EQUIPO_CHOICES = [
+        (1, "Equipo 1"),
+        (2, "Equipo 2"),
+    ]
+    RESULTADO_CHOICES = [
+        ("", "Sin definir"),
+        ("G", "Ganó"),
+        ("P", "Perdió"),
+    ]
+
+    partido = models.ForeignKey(Partido, on_delete=models.CASCADE, related_name="participaciones")
+    usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE, related_name="participaciones")
+    equipo = models.PositiveSmallIntegerField(choices=EQUIPO_CHOICES)
+    resultado = models.CharField(max_length=1, choices=RESULTADO_CHOICES, blank=True, default="")
+    # Copias de Partido para ordenar el historial y contar torneos sin hacer JOIN
+    torneo = models.ForeignKey(Torneo, on_delete=models.CASCADE, related_name="participaciones")
+    fecha = models.DateField()
+    hora = models.TimeField()
+    duracion = models.PositiveSmallIntegerField(default=DURACION_DEFAULT)
+
+    class Meta:
+        constraints = [
+            # También es el índice del JOIN en head-to-head (partido, rival)
+            models.UniqueConstraint(fields=['partido', 'usuario'], name='unique_participacion_partido_usuario'),
+        ]
+        indexes = [
+            # Historial del jugador, los más recientes primero
+            models.Index(fields=['usuario', '-fecha', '-hora', '-partido'], name='participacion_usuario_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.usuario_id} en {self.partido_id} (equipo {self.equipo})"
+
+
+class EstadisticasJugador(models.Model):
+    """
+    Estadísticas de perfil de un jugador (las que antes calculaba el front en
+    PlayerStats). Sólo cuentan partidos con resultado. partidos/estadisticas.py
+    las ajusta con cada cambio de Participacion, así el perfil es una lectura
+    por llave primaria.
+    """
+    user = models.OneToOneField(
+        Usuario,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="estadisticas"
+    )
+    partidos = models.PositiveIntegerField(default=0)
+    ganados = models.PositiveIntegerField(default=0)
+    perdidos = models.PositiveIntegerField(default=0)
+    racha = models.PositiveIntegerField(default=0, verbose_name="Racha de victorias actual")
+    torneos = models.PositiveIntegerField(default=0, verbose_name="Torneos con partidos jugados")
+    ultimo_partido = models.DateField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.ganados}G {self.perdidos}P"
+
+
+class MarcadorEnVivo(models.Model):
+    """
+    Marcador punto a punto de un partido en juego (partidos/marcador.py).
+    `estado` es el snapshot compacto que se manda a los espectadores;
+    `historial` guarda los estados anteriores para que el árbitro pueda deshacer.
+    """
+    partido = models.OneToOneField(
+        Partido,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="marcador"
+    )
+    estado = models.JSONField(default=dict)
+    historial = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.partido_id}: {self.estado.get('sets')}"
@@ -0,0 +1,105 @@
+# partidos/participaciones.py
+"""
+Mantiene la tabla Participacion al día con Partido.equipo_1/equipo_2 y el
+resultado. sincronizar() se llama desde partidos/signals.py cada vez que
+cambia un partido o alguno de sus equipos; reconstruir() la rehace completa
+(datos previos a la tabla o cargas con bulk_create, que no disparan signals).
+
+Cada cambio se pasa también a partidos/estadisticas.py como (filas viejas,
+filas nuevas) para ajustar EstadisticasJugador.
+"""
+from django.db import transaction
+
+from .models import Partido, Participacion
+from . import estadisticas
+
+CAMPOS = ('partido_id', 'usuario_id', 'torneo_id', 'resultado', 'fecha', 'hora')
+
+GANADOR = {'E1': 1, 'E2': 2}
+
+
+def filas(partido_id, torneo_id, fecha, hora, duracion, resultado, equipo_1, equipo_2):
+    """Participacion sin guardar para un partido; si alguien está en ambos equipos cuenta el 1."""
+    ganador = GANADOR.get(resultado)
+    lados = {user_id: 2 for user_id in equipo_2}
+    lados.update({user_id: 1 for user_id in equipo_1})
+    return [
+        Participacion(
+            partido_id=partido_id,
+            usuario_id=user_id,
+            torneo_id=torneo_id,
+            equipo=equipo,
+            resultado='' if ganador is None else ('G' if equipo == ganador else 'P'),
+            fecha=fecha,
+            hora=hora,
+            duracion=duracion,
+        )
+        for user_id, equipo in lados.items()
+    ]
+
+
+def sincronizar(partido):
+    """Reemplaza las participaciones del partido por las de su estado actual en la BD."""
+    with transaction.atomic():
+        # Leemos de la BD porque la instancia puede traer fecha/hora como str
+        fila = (
+            Partido.objects.select_for_update()
+            .filter(pk=partido.pk)
+            .values_list('torneo_id', 'fecha', 'hora', 'duracion', 'resultado')
+            .first()
+        )
+        if fila is None:
+            return
+        equipo_1 = Partido.equipo_1.through.objects.filter(partido_id=partido.pk).values_list('usuario_id', flat=True)
+        equipo_2 = Partido.equipo_2.through.objects.filter(partido_id=partido.pk).values_list('usuario_id', flat=True)
+        _reemplazar([partido.pk], filas(partido.pk, *fila, list(equipo_1), list(equipo_2)))
+
+
+def eliminar(partido):
+    """Quita las participaciones del partido (antes de eliminarlo)."""
+    with transaction.atomic():
+        _reemplazar([partido.pk], [])
+
+
+def _reemplazar(ids, nuevas):
+    """Cambia las participaciones de los partidos `ids` por `nuevas` y ajusta las estadísticas."""
+    actuales = Participacion.objects.filter(partido_id__in=ids)
+    viejas = list(actuales.values_list(*CAMPOS))
+    actuales.delete()
+    Participacion.objects.bulk_create(nuevas, batch_size=2000)
+    estadisticas.aplicar(ids, viejas, [tuple(getattr(p, campo) for campo in CAMPOS) for p in nuevas])
+
+
+def sincronizar_lote(ids):
+    """Igual que sincronizar() pero para varios partidos con consultas por lote."""
+    lote = list(
+        Partido.objects.filter(pk__in=ids).order_by('pk')
+        .values_list('pk', 'torneo_id', 'fecha', 'hora', 'duracion', 'resultado')
+    )
+    ids = [p[0] for p in lote]
+    equipos = {pk: ([], []) for pk in ids}
+    for lado, through in enumerate((Partido.equipo_1.through, Partido.equipo_2.through)):
+        for partido_id, user_id in through.objects.filter(partido_id__in=ids).values_list('partido_id', 'usuario_id'):
+            equipos[partido_id][lado].append(user_id)
+
+    nuevas = []
+    for pk, *datos in lote:
+        nuevas += filas(pk, *datos, *equipos[pk])
+    _reemplazar(ids, nuevas)
+    return len(nuevas)
+
+
+def reconstruir(batch_size=2000):
+    """Rehace toda la tabla por lotes de partidos. Regresa cuántas filas escribió."""
+    escritas = 0
+    ultimo = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Partido.objects.filter(pk__gt=ultimo).order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                return escritas
+            escritas += sincronizar_lote(ids)
+            ultimo = ids[-1]
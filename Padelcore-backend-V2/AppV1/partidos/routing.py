@@ -0,0 +1,6 @@
+from django.urls import re_path
+from .consumers import MarcadorConsumer
+
+websocket_urlpatterns = [
+    re_path(r'^ws/partidos/(?P<partido_id>\d+)/marcador/$', MarcadorConsumer.as_asgi()),
+]
@@ -0,0 +1,91 @@
+from rest_framework import serializers
+from .models import Partido, Participacion, EstadisticasJugador, DURACION_DEFAULT
+from . import agenda
+from usuarios.models import Usuario
+
+class UsuarioSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Usuario
+        fields = ['id', 'nombre_completo']
+
+class PartidoSerializer(serializers.ModelSerializer):
+    equipo_1 = UsuarioSerializer(many=True, read_only=True)
+    equipo_2 = UsuarioSerializer(many=True, read_only=True)
+    equipo_1_ids = serializers.PrimaryKeyRelatedField(
+        many=True, queryset=Usuario.objects.all(), write_only=True
+    )
+    equipo_2_ids = serializers.PrimaryKeyRelatedField(
+        many=True, queryset=Usuario.objects.all(), write_only=True
+    )
+
+    class Meta:
+        model = Partido
+        fields = [
+            'id', 'torneo', 'equipo_1', 'equipo_2', 'equipo_1_ids', 'equipo_2_ids',
+            'fecha', 'hora', 'duracion', 'cancha', 'resultado', 'createdP', 'modifiedP',
+        ]
+
+    def validate(self, attrs):
+        # En un PATCH lo que no viene se toma del partido actual
+        instance = self.instance
+        fecha = attrs.get('fecha', instance.fecha if instance else None)
+        hora = attrs.get('hora', instance.hora if instance else None)
+        duracion = attrs.get('duracion', instance.duracion if instance else DURACION_DEFAULT)
+        jugadores = set()
+        for equipo in ('equipo_1', 'equipo_2'):
+            if f'{equipo}_ids' in attrs:
+                jugadores.update(u.pk for u in attrs[f'{equipo}_ids'])
+            elif instance:
+                jugadores.update(getattr(instance, equipo).values_list('pk', flat=True))
+        if fecha and hora and jugadores:
+            choques = agenda.conflictos(jugadores, fecha, hora, duracion, excluir=instance.pk if instance else None)
+            if choques:
+                raise serializers.ValidationError({"horario": choques})
+        return attrs
+
+    def create(self, validated_data):
+        equipo_1_ids = validated_data.pop('equipo_1_ids')
+        equipo_2_ids = validated_data.pop('equipo_2_ids')
+        partido = Partido.objects.create(**validated_data)
+        partido.equipo_1.set(equipo_1_ids)
+        partido.equipo_2.set(equipo_2_ids)
+        return partido
+
+    def update(self, instance, validated_data):
+        # Los equipos que vengan reemplazan a los actuales (ya se revisaron en validate)
+        equipos = {
+            equipo: validated_data.pop(f'{equipo}_ids')
+            for equipo in ('equipo_1', 'equipo_2') if f'{equipo}_ids' in validated_data
+        }
+        partido = super().update(instance, validated_data)
+        for equipo, ids in equipos.items():
+            getattr(partido, equipo).set(ids)
+        return partido
+
+
+class ParticipacionSerializer(serializers.ModelSerializer):
+    partido = PartidoSerializer(read_only=True)
+
+    class Meta:
+        model = Participacion
+        fields = ['partido', 'equipo', 'resultado']
+
+
+class HeadToHeadSerializer(ParticipacionSerializer):
+    # Lado del rival en ese partido: distinto de `equipo` si jugaron en contra
+    equipo_rival = serializers.IntegerField(read_only=True)
+
+    class Meta(ParticipacionSerializer.Meta):
+        fields = ParticipacionSerializer.Meta.fields + ['equipo_rival']
+
+
+class EstadisticasJugadorSerializer(serializers.ModelSerializer):
+    nombre_completo = serializers.CharField(source='user.nombre_completo', read_only=True)
+    rating = serializers.DecimalField(source='user.rating', max_digits=6, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = EstadisticasJugador
+        fields = [
+            'user', 'nombre_completo', 'rating', 'partidos', 'ganados', 'perdidos',
+            'racha', 'torneos', 'ultimo_partido', 'updated_at',
+        ]
@@ -0,0 +1,39 @@
+# partidos/signals.py
+from django.db.models.signals import post_save, pre_delete, m2m_changed
+from django.dispatch import Signal, receiver
+
+from AppV1.condicional import tocar_en_m2m
+from .models import Partido
+from . import participaciones
+
+# Cargas masivas (partidos/importacion.py) que escriben con bulk_create y por lo
+# tanto no disparan post_save/m2m_changed. Se envía con `ids`: los partidos
+# creados, ya con sus equipos y participaciones.
+partidos_importados = Signal()
+
+
+@receiver(post_save, sender=Partido)
+def partido_guardado(sender, instance, **kwargs):
+    # fecha, hora o resultado pueden haber cambiado
+    participaciones.sincronizar(instance)
+
+
+@receiver(m2m_changed, sender=Partido.equipo_1.through)
+@receiver(m2m_changed, sender=Partido.equipo_2.through)
+def equipos_cambiados(sender, instance, action, reverse, pk_set, **kwargs):
+    # Los equipos van en el payload: que el GET condicional vea el cambio
+    tocar_en_m2m(Partido, 'modifiedP', sender, instance, action, reverse, pk_set)
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        participaciones.sincronizar(instance)
+    elif pk_set:
+        # usuario.equipo_1.add(partido): instance es el Usuario
+        for partido in Partido.objects.filter(pk__in=pk_set):
+            participaciones.sincronizar(partido)
+
+
+@receiver(pre_delete, sender=Partido)
+def partido_eliminado(sender, instance, **kwargs):
+    # Sus participaciones se irían en CASCADE; las quitamos antes para descontarlas
+    participaciones.eliminar(instance)
@@ -0,0 +1,518 @@
+import asyncio
+import datetime
+import json
+
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from aprobaciones import trabajos
+from aprobaciones.models import Aprobacion, Trabajo
+from ranking.models import CambioRating
+from torneos.models import Torneo
+from usuarios.models import Usuario
+from .models import Partido, Participacion, EstadisticasJugador
+from AppV1.routing import websocket_urlpatterns
+from . import participaciones, estadisticas, marcador, consumers, importacion
+
+application = URLRouter(websocket_urlpatterns)
+
+
+class PartidoListQueriesTest(TestCase):
+    """
+    El listado de partidos debe costar las mismas consultas sin importar
+    cuántos partidos traiga la página (los equipos van prefetcheados).
+    """
+    PARTIDOS = 300
+
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create no dispara las señales de ranking, así el seed es rápido
+        usuarios = Usuario.objects.bulk_create([
+            Usuario(email=f"jugador{i}@test.com", nombre_completo=f"Jugador {i}")
+            for i in range(40)
+        ])
+        torneo = Torneo.objects.create(
+            nombre="Torneo", sede="Sede", fecha_inicio=datetime.date(2025, 1, 1),
+            fecha_fin=datetime.date(2025, 1, 31), imagen_url="https://example.com/t.png",
+        )
+        partidos = Partido.objects.bulk_create([
+            Partido(
+                torneo=torneo,
+                fecha=datetime.date(2025, 1, 1) + datetime.timedelta(days=i % 30),
+                hora=datetime.time(8 + i % 12),
+            )
+            for i in range(cls.PARTIDOS)
+        ])
+        equipo_1, equipo_2 = [], []
+        for i, partido in enumerate(partidos):
+            jugadores = [usuarios[(i + j) % len(usuarios)] for j in range(4)]
+            equipo_1 += [Partido.equipo_1.through(partido=partido, usuario=u) for u in jugadores[:2]]
+            equipo_2 += [Partido.equipo_2.through(partido=partido, usuario=u) for u in jugadores[2:]]
+        Partido.equipo_1.through.objects.bulk_create(equipo_1)
+        Partido.equipo_2.through.objects.bulk_create(equipo_2)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_consultas_constantes_por_tamano_de_pagina(self):
+        # Validadores del GET condicional (partidos + usuarios), página y un prefetch por equipo
+        for page_size in (5, 50, self.PARTIDOS):
+            with self.subTest(page_size=page_size), self.assertNumQueries(5):
+                response = self.client.get('/api/partidos/', {'page_size': page_size})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), page_size)
+            self.assertEqual(len(response.data['results'][0]['equipo_1']), 2)
+
+    def test_consultas_constantes_con_cursor(self):
+        siguiente = self.client.get('/api/partidos/', {'page_size': 100}).data['next']
+        with self.assertNumQueries(5):
+            response = self.client.get(siguiente)
+        self.assertEqual(len(response.data['results']), 100)
+
+    def test_conteo_y_filtro_por_fecha(self):
+        # El dashboard cuenta sin recorrer las páginas
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/partidos/conteo/').data, {"count": self.PARTIDOS})
+        self.assertEqual(self.client.get('/api/partidos/conteo/', {'fecha': '2025-01-03'}).data['count'], 10)
+        response = self.client.get('/api/partidos/', {'fecha': '2025-01-03'})
+        self.assertEqual({p['fecha'] for p in response.data['results']}, {'2025-01-03'})
+        self.assertEqual(self.client.get('/api/partidos/', {'fecha': 'hoy'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/usuarios/conteo/').data['count'], 40)
+
+    def test_detalle(self):
+        partido = Partido.objects.first()
+        with self.assertNumQueries(5):
+            response = self.client.get(f'/api/partidos/{partido.pk}/')
+        self.assertEqual(len(response.data['equipo_2']), 2)
+
+
+class PartidosDePrueba(TestCase):
+    """Cinco jugadores y un torneo; jugar() crea partidos por la vía normal (con signals)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jugadores = Usuario.objects.bulk_create([
+            Usuario(email=f"p{i}@test.com", nombre_completo=f"P {i}", rating_inicial=1000)
+            for i in range(5)
+        ])
+        cls.torneo = Torneo.objects.create(
+            nombre="Torneo", sede="Sede", fecha_inicio=datetime.date(2025, 1, 1),
+            fecha_fin=datetime.date(2025, 1, 31), imagen_url="https://example.com/t.png",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def jugar(self, equipo_1, equipo_2, resultado, dia):
+        partido = Partido.objects.create(
+            torneo=self.torneo, fecha=datetime.date(2025, 1, dia), hora=datetime.time(10),
+        )
+        partido.equipo_1.set([self.jugadores[i] for i in equipo_1])
+        partido.equipo_2.set([self.jugadores[i] for i in equipo_2])
+        partido.resultado = resultado
+        partido.save()
+        return partido
+
+
+class ParticipacionTest(PartidosDePrueba):
+    """La tabla Participacion sigue a los equipos y el resultado del partido."""
+
+    def test_signals_mantienen_la_tabla(self):
+        partido = self.jugar([0, 1], [2, 3], 'E1', 1)
+        self.assertEqual(
+            sorted(Participacion.objects.filter(partido=partido).values_list('equipo', 'resultado')),
+            [(1, 'G'), (1, 'G'), (2, 'P'), (2, 'P')],
+        )
+        partido.equipo_2.remove(self.jugadores[3])
+        self.jugadores[4].equipo_2.add(partido)
+        self.assertEqual(
+            set(Participacion.objects.filter(partido=partido, equipo=2).values_list('usuario_id', flat=True)),
+            {self.jugadores[2].id, self.jugadores[4].id},
+        )
+        total = Participacion.objects.count()
+        self.assertEqual(participaciones.reconstruir(), total)
+
+    def test_historial_y_head_to_head(self):
+        self.jugar([0, 1], [2, 3], 'E1', 1)
+        self.jugar([0, 2], [1, 3], 'E2', 2)
+        self.jugar([0, 2], [3, 4], '', 3)
+        a, b = self.jugadores[0].id, self.jugadores[2].id
+
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/partidos/historial/', {'user': a})
+        self.assertEqual([p['resultado'] for p in response.data['results']], ['', 'P', 'G'])
+
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/partidos/head-to-head/', {'user': a, 'rival': b})
+        self.assertEqual(response.data['resumen'], {
+            'partidos': 3, 'en_contra': 1, 'ganados': 1, 'perdidos': 0, 'como_pareja': 2,
+        })
+
+
+class GetCondicionalTest(PartidosDePrueba):
+    """Listado y detalle de partidos responden 304 mientras no cambie nada de su payload."""
+
+    def test_304_hasta_que_cambia_algo(self):
+        partido = self.jugar([0, 1], [2, 3], 'E1', 1)
+        self.jugar([0, 2], [1, 3], 'E2', 2)
+
+        response = self.client.get('/api/partidos/')
+        etag = response['ETag']
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        with self.assertNumQueries(2):  # (pk, modificado) de la página y sus equipos, nada de serializar
+            response = self.client.get('/api/partidos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        # Un jugador que no sale en la página no la invalida...
+        self.jugadores[4].nombre_completo = "Otro nombre"
+        self.jugadores[4].save()
+        self.assertEqual(self.client.get('/api/partidos/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # ...pero el nombre de uno que sí sale en el payload, sí
+        self.jugadores[0].nombre_completo = "Otro nombre"
+        self.jugadores[0].save()
+        response = self.client.get('/api/partidos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        # Cambiar un equipo (ManyToMany) también
+        partido.equipo_2.remove(self.jugadores[3])
+        response = self.client.get('/api/partidos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.jugadores[3].equipo_2.add(partido)  # Desde el otro lado de la relación
+        response = self.client.get('/api/partidos/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        partido.delete()
+        self.assertEqual(self.client.get('/api/partidos/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detalle_con_if_modified_since(self):
+        partido = self.jugar([0, 1], [2, 3], 'E1', 1)
+        response = self.client.get(f'/api/partidos/{partido.pk}/')
+        self.assertEqual(
+            self.client.get(
+                f'/api/partidos/{partido.pk}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+            ).status_code,
+            304,
+        )
+        self.assertEqual(self.client.get('/api/partidos/0/', HTTP_IF_NONE_MATCH='*').status_code, 404)
+
+
+class ImportacionTest(TestCase):
+    """POST /api/partidos/import/ crea las filas válidas y reporta las demás."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jugadores = Usuario.objects.bulk_create([
+            Usuario(email=f"i{i}@test.com", nombre_completo=f"I {i}", rating_inicial=1000)
+            for i in range(8)
+        ])
+        cls.torneo = Torneo.objects.create(
+            nombre="Torneo", sede="Sede", fecha_inicio=datetime.date(2025, 1, 1),
+            fecha_fin=datetime.date(2025, 1, 31), imagen_url="https://example.com/t.png", puntos=10,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def fila(self, i, **cambios):
+        ids = [str(self.jugadores[(i + j) % 8].id) for j in range(4)]
+        fila = {
+            'torneo': self.torneo.id, 'fecha': str(datetime.date(2025, 1, 1) + datetime.timedelta(days=i)),
+            'hora': '18:30', 'resultado': 'E1',
+            'equipo_1_ids': ids[:2], 'equipo_2_ids': ids[2:],
+        }
+        fila.update(cambios)
+        return fila
+
+    def test_ndjson_con_errores_por_fila(self):
+        filas = [self.fila(i) for i in range(200)]
+        filas[3] = self.fila(3, hora='tarde')
+        filas[4] = self.fila(4, torneo=999)
+        filas.append(self.fila(150, hora='19:00'))  # Encima a sus jugadores con la fila 151
+        cuerpo = '\n'.join(json.dumps(f) for f in filas) + '\n{roto\n'
+
+        response = self.client.post('/api/partidos/import/', cuerpo, content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['creados'], 198)
+        self.assertEqual([e['fila'] for e in response.data['errores']], [4, 5, 201, 202])
+        self.assertEqual(list(response.data['errores'][2]['errores']), ['horario'])
+        self.assertEqual(Participacion.objects.count(), 198 * 4)
+        # Rating Elo y puntos de ranking igual que si se hubieran creado uno por uno
+        self.assertEqual(CambioRating.objects.filter(partido_id__in=response.data['partido_ids']).count(), 198 * 4)
+        jugador = Usuario.objects.get(pk=self.jugadores[0].pk)
+        ganados = Participacion.objects.filter(usuario=jugador, resultado='G').count()
+        self.assertEqual(jugador.puntos.puntos_totales, 10 * ganados)
+
+    def test_csv(self):
+        j = [str(u.id) for u in self.jugadores]
+        cuerpo = (
+            "torneo,fecha,hora,resultado,equipo_1_ids,equipo_2_ids\n"
+            f"{self.torneo.id},2025-01-10,18:30,E2,{j[0]}|{j[1]},{j[2]}|{j[3]}\n"
+            f"{self.torneo.id},2025-01-11,18:30,,{j[0]}|{j[0]},{j[2]}|{j[3]}\n"
+        )
+        response = self.client.post('/api/partidos/import/', cuerpo, content_type='text/csv')
+        self.assertEqual(response.data['creados'], 1)
+        self.assertEqual(list(response.data['errores'][0]['errores']), ['equipo_1_ids'])
+        partido = Partido.objects.get(pk=response.data['partido_ids'][0])
+        self.assertEqual(partido.equipo_2.count(), 2)
+
+
+class EstadisticasTest(PartidosDePrueba):
+    """EstadisticasJugador se ajusta con cada cambio y coincide con la reconstrucción completa."""
+
+    def estadisticas(self, i):
+        return self.client.get(f'/api/estadisticas/{self.jugadores[i].id}/').data
+
+    def test_incremental_igual_a_reconstruir(self):
+        self.jugar([0, 1], [2, 3], 'E2', 1)
+        self.jugar([0, 2], [1, 3], 'E1', 2)
+        corregido = self.jugar([0, 4], [1, 2], 'E1', 3)
+        self.assertEqual(
+            {k: self.estadisticas(0)[k] for k in ('partidos', 'ganados', 'perdidos', 'racha', 'torneos')},
+            {'partidos': 3, 'ganados': 2, 'perdidos': 1, 'racha': 2, 'torneos': 1},
+        )
+
+        corregido.resultado = 'E2'
+        corregido.save()
+        self.assertEqual(self.estadisticas(0)['racha'], 0)
+        corregido.delete()
+        self.assertEqual(self.estadisticas(0)['racha'], 1)
+
+        # reconstruir() no crea filas para quien se quedó sin partidos
+        con_partidos = EstadisticasJugador.objects.filter(partidos__gt=0).order_by('user_id')
+        antes = list(con_partidos.values())
+        estadisticas.reconstruir()
+        despues = list(con_partidos.values())
+        quitar = lambda filas: [{k: v for k, v in f.items() if k != 'updated_at'} for f in filas]
+        self.assertEqual(quitar(antes), quitar(despues))
+
+    def test_lectura_por_llave(self):
+        self.jugar([0, 1], [2, 3], 'E1', 1)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.estadisticas(0)['ganados'], 1)
+        self.assertEqual(self.estadisticas(4)['partidos'], 0)  # Sin partidos: todo en cero
+
+
+class MarcadorTest(PartidosDePrueba):
+    """Marcador en vivo: reglas, coalescencia de la difusión y el consumer."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()  # Los ids de partido se repiten entre pruebas y el snapshot vive en la caché
+
+    def test_reglas_y_resultado(self):
+        partido = self.jugar([0, 1], [2, 3], '', 1)
+        for _ in range(3):
+            marcador.registrar(partido.pk, 'punto', 1)
+        for _ in range(4):  # 40-40 y ventaja del equipo 2
+            estado = marcador.registrar(partido.pk, 'punto', 2)
+        self.assertEqual((estado['puntos'], estado['sets']), ([3, 4], [[0, 0]]))
+        estado = marcador.registrar(partido.pk, 'deshacer')
+        self.assertEqual((estado['puntos'], estado['v']), ([3, 3], 8))
+
+        # 6-6 y tie-break 7-5 para el equipo 1, luego 6-0
+        estado = {**marcador.nuevo(partido.pk), 'sets': [[6, 6]]}
+        for equipo in [1] * 5 + [2] * 5 + [1, 1]:
+            estado = marcador.anotar(estado, equipo)
+        self.assertEqual(estado['sets'], [[7, 6], [0, 0]])
+        estado['sets'][-1] = [5, 0]
+        marcador.MarcadorEnVivo.objects.filter(partido=partido).update(estado=estado)
+        for _ in range(4):
+            estado = marcador.registrar(partido.pk, 'punto', 1)
+        self.assertEqual((estado['sets'], estado['ganador']), ([[7, 6], [6, 0]], 1))
+        partido.refresh_from_db()
+        self.assertEqual(partido.resultado, 'E1')
+        with self.assertRaises(marcador.MarcadorError):
+            marcador.registrar(partido.pk, 'punto', 2)
+        marcador.registrar(partido.pk, 'deshacer')
+        partido.refresh_from_db()
+        self.assertEqual(partido.resultado, '')
+
+    async def test_coalescencia(self):
+        enviados = []
+
+        class Capa:
+            async def group_send(self, grupo, mensaje):
+                enviados.append(mensaje['estado']['v'])
+
+        estado = marcador.nuevo(1)
+        for _ in range(20):
+            estado = marcador.anotar(estado, 1)
+            await consumers.publicar(Capa(), estado)
+            await asyncio.sleep(0)  # Como entre dos mensajes del árbitro
+        await asyncio.sleep(consumers.INTERVALO * 2.5)
+        # El primero sale de inmediato y el resto se junta en el último
+        self.assertEqual(enviados, [1, 20])
+
+    async def test_consumer(self):
+        partido = await database_sync_to_async(self.jugar)([0, 1], [2, 3], '', 1)
+        await database_sync_to_async(marcador.registrar)(partido.pk, 'punto', 2)
+        ruta = f'/ws/partidos/{partido.pk}/marcador/'
+
+        espectador = WebsocketCommunicator(application, ruta)
+        conectado, _ = await espectador.connect()
+        self.assertTrue(conectado)
+        self.assertEqual((await espectador.receive_json_from())['puntos'], [0, 1])  # snapshot
+        await espectador.send_json_to({"accion": "punto", "equipo": 1})
+        self.assertIn('error', await espectador.receive_json_from())
+
+        staff = await database_sync_to_async(Usuario.objects.get)(pk=self.jugadores[4].pk)
+        staff.is_staff = True
+        arbitro = WebsocketCommunicator(application, ruta)
+        arbitro.scope['user'] = staff
+        await arbitro.connect()
+        await arbitro.receive_json_from()
+        await arbitro.send_json_to({"accion": "punto", "equipo": 1})
+        self.assertEqual((await arbitro.receive_json_from())['puntos'], [1, 1])
+        self.assertEqual((await espectador.receive_json_from())['puntos'], [1, 1])
+
+        desconocido = WebsocketCommunicator(application, '/ws/partidos/999999/marcador/')
+        self.assertFalse((await desconocido.connect())[0])
+        await espectador.disconnect()
+        await arbitro.disconnect()
+
+    async def test_aplicacion_asgi(self):
+        """La app que sirve daphne (AppV1.asgi) enruta el marcador, no sólo el URLRouter de las pruebas."""
+        from AppV1.asgi import application as asgi
+        partido = await database_sync_to_async(self.jugar)([0, 1], [2, 3], '', 1)
+        espectador = WebsocketCommunicator(asgi, f'/ws/partidos/{partido.pk}/marcador/')
+        self.assertTrue((await espectador.connect())[0])
+        self.assertEqual((await espectador.receive_json_from())['v'], 0)
+        await espectador.disconnect()
+
+    async def test_arbitro_con_jwt(self):
+        """El frontend sólo tiene el JWT: el árbitro se autentica con ?token=<access>."""
+        from AppV1.asgi import application as asgi
+        partido = await database_sync_to_async(self.jugar)([0, 1], [2, 3], '', 1)
+        await database_sync_to_async(Usuario.objects.filter(pk=self.jugadores[4].pk).update)(is_staff=True)
+        staff = await database_sync_to_async(Usuario.objects.get)(pk=self.jugadores[4].pk)
+        ruta = f'/ws/partidos/{partido.pk}/marcador/'
+
+        for token, esperado in (('basura', 'error'), (str(AccessToken.for_user(staff)), 'puntos')):
+            arbitro = WebsocketCommunicator(asgi, f'{ruta}?token={token}')
+            self.assertTrue((await arbitro.connect())[0])
+            await arbitro.receive_json_from()
+            await arbitro.send_json_to({"accion": "punto", "equipo": 1})
+            self.assertIn(esperado, await arbitro.receive_json_from())
+            await arbitro.disconnect()
+
+
+class AgendaTest(PartidosDePrueba):
+    """Un jugador no puede quedar en dos partidos encimados."""
+
+    def crear(self, equipo_1, equipo_2, hora, dia=1):
+        return self.client.post('/api/partidos/', {
+            'torneo': self.torneo.id, 'fecha': f'2025-01-{dia:02d}', 'hora': hora,
+            'equipo_1_ids': [str(self.jugadores[i].id) for i in equipo_1],
+            'equipo_2_ids': [str(self.jugadores[i].id) for i in equipo_2],
+        }, format='json')
+
+    def test_alta_edicion_y_aprobacion(self):
+        partido = self.jugar([0, 1], [2, 3], '', 1)  # 10:00
+        self.assertEqual(self.crear([4, 0], [1, 2], '11:00').status_code, 400)
+        self.assertEqual(self.crear([4, 0], [1, 2], '11:30').status_code, 201)
+        # Editar el propio partido no choca consigo mismo
+        response = self.client.patch(f'/api/partidos/{partido.pk}/', {'hora': '09:30'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.patch(f'/api/partidos/{partido.pk}/', {'hora': '10:30'}, format='json')
+        self.assertIn('horario', response.data)
+
+        aprobacion = Aprobacion.objects.create(tipo='match', data={
+            'torneo': self.torneo.id, 'fecha': '2025-01-01', 'hora': '12:00',
+            'equipo_1_ids': [str(self.jugadores[3].id), str(self.jugadores[4].id)],
+            'equipo_2_ids': [str(self.jugadores[1].id), str(self.jugadores[2].id)],
+        })
+        self.client.patch(f'/api/aprobaciones/{aprobacion.pk}/approve/')
+        trabajos.procesar()
+        error = Trabajo.objects.get().resultado['errores'][0]
+        self.assertEqual((error['id'], list(error['errores'])), (aprobacion.pk, ['horario']))
+        aprobacion.refresh_from_db()
+        self.assertEqual(aprobacion.status, 'pending')
+
+    def test_edicion_de_equipos(self):
+        partido = self.jugar([0, 1], [2, 3], 'E1', 1)
+        response = self.client.patch(f'/api/partidos/{partido.pk}/', {
+            'equipo_2_ids': [str(self.jugadores[2].id), str(self.jugadores[4].id)],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({u['id'] for u in response.data['equipo_2']}, {str(self.jugadores[2].id), str(self.jugadores[4].id)})
+        self.assertEqual(
+            set(Participacion.objects.filter(partido=partido, equipo=2).values_list('usuario_id', 'resultado')),
+            {(self.jugadores[2].id, 'P'), (self.jugadores[4].id, 'P')},
+        )
+        # El choque se revisa con los equipos nuevos
+        self.jugar([3, 0], [1, 2], '', 2)
+        response = self.client.patch(f'/api/partidos/{partido.pk}/', {
+            'fecha': '2025-01-02', 'equipo_1_ids': [str(self.jugadores[0].id), str(self.jugadores[4].id)],
+        }, format='json')
+        self.assertIn('horario', response.data)
+
+    def test_aprobacion_con_ids_sin_normalizar(self):
+        """La aprobación revisa choques con los ids ya validados, no con el texto de la solicitud."""
+        self.jugar([0, 1], [2, 3], '', 1)  # 10:00
+        aprobacion = Aprobacion.objects.create(tipo='match', data={
+            'torneo': self.torneo.id, 'fecha': '2025-01-01', 'hora': '10:30',
+            'equipo_1_ids': [str(self.jugadores[0].id).upper(), f" {self.jugadores[4].id} "],
+            'equipo_2_ids': [str(self.jugadores[1].id).replace('-', ''), str(self.jugadores[2].id)],
+        })
+        self.client.patch(f'/api/aprobaciones/{aprobacion.pk}/approve/')
+        trabajos.procesar()
+        error = Trabajo.objects.get().resultado['errores'][0]
+        self.assertEqual(len(error['errores']['horario']), 3)
+
+    def test_duracion_del_partido(self):
+        corto = self.jugar([0, 1], [2, 3], '', 1)  # 10:00
+        corto.duracion = 45
+        corto.save()
+        self.assertEqual(self.crear([4, 0], [1, 2], '10:45').status_code, 201)
+        largo = self.client.post('/api/partidos/', {
+            'torneo': self.torneo.id, 'fecha': '2025-01-02', 'hora': '08:00', 'duracion': 200,
+            'equipo_1_ids': [str(self.jugadores[i].id) for i in (0, 1)],
+            'equipo_2_ids': [str(self.jugadores[i].id) for i in (2, 3)],
+        }, format='json')
+        self.assertEqual(largo.status_code, 201)
+        self.assertEqual(self.crear([0, 4], [1, 2], '11:00', dia=2).status_code, 400)
+        self.assertEqual(self.crear([0, 4], [1, 2], '11:20', dia=2).status_code, 201)
+
+        # La importación usa la misma regla, contra la BD y dentro de la carga
+        creados, errores = importacion.importar([
+            {'torneo': self.torneo.id, 'fecha': '2025-01-03', 'hora': '10:00', 'duracion': 30,
+             'equipo_1_ids': [str(self.jugadores[0].id), str(self.jugadores[1].id)],
+             'equipo_2_ids': [str(self.jugadores[2].id), str(self.jugadores[3].id)]},
+            {'torneo': self.torneo.id, 'fecha': '2025-01-03', 'hora': '10:30',
+             'equipo_1_ids': [str(self.jugadores[0].id), str(self.jugadores[1].id)],
+             'equipo_2_ids': [str(self.jugadores[2].id), str(self.jugadores[3].id)]},
+            {'torneo': self.torneo.id, 'fecha': '2025-01-02', 'hora': '10:00', 'duracion': 5,
+             'equipo_1_ids': [str(self.jugadores[1].id), str(self.jugadores[2].id)],
+             'equipo_2_ids': [str(self.jugadores[3].id), str(self.jugadores[4].id)]},
+        ])
+        self.assertEqual(len(creados), 2)
+        self.assertEqual([(e['fila'], list(e['errores'])) for e in errores], [(3, ['duracion'])])
+
+    def test_reporte_del_torneo(self):
+        a = self.jugar([0, 1], [2, 3], '', 1)
+        b = self.jugar([0, 4], [1, 2], '', 1)  # Misma hora: choca para 0, 1 y 2
+        otro = Torneo.objects.create(
+            nombre="Otro", sede="Sede", fecha_inicio=datetime.date(2025, 1, 1),
+            fecha_fin=datetime.date(2025, 1, 2), imagen_url="https://example.com/t.png",
+        )
+        c = Partido.objects.create(torneo=otro, fecha=datetime.date(2025, 1, 2), hora=datetime.time(10))
+        c.equipo_1.set(self.jugadores[:2])
+        c.equipo_2.set(self.jugadores[2:4])
+        self.jugar([0, 1], [2, 3], '', 2)  # Choca con c (de otro torneo)
+
+        with self.assertNumQueries(4):  # Torneo (con tags), rango de fechas y la pasada
+            response = self.client.get(f'/api/torneos/{self.torneo.id}/conflictos/')
+        self.assertEqual(response.data['total'], 3 + 4)
+        pares = {(c['partido'], c['otro_partido']) for c in response.data['conflictos']}
+        self.assertIn((a.pk, b.pk), pares)
+        self.assertEqual(self.client.get(f'/api/torneos/{otro.id}/conflictos/').data['total'], 4)
@@ -0,0 +1,8 @@
+from rest_framework.routers import DefaultRouter
+from .views import PartidoViewSet, EstadisticasJugadorViewSet
+
+router = DefaultRouter()
+router.register(r'partidos', PartidoViewSet, basename='partido')
+router.register(r'estadisticas', EstadisticasJugadorViewSet, basename='estadisticas')
+
+urlpatterns = router.urls
@@ -0,0 +1,156 @@
+import datetime
+import uuid
+
+from django.db.models import Count, F, Prefetch, Q
+from django.http import Http404
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from AppV1.condicional import ConditionalGetMixin
+from AppV1.pagination import ConteoMixin, KeysetPagination
+from usuarios.models import Usuario
+from .models import Partido, Participacion, EstadisticasJugador
+from .serializers import (
+    PartidoSerializer, ParticipacionSerializer, HeadToHeadSerializer, EstadisticasJugadorSerializer,
+)
+from .importacion import NDJSONParser, CSVParser, importar
+
+
+class PartidoPagination(KeysetPagination):
+    ordering = ('-fecha', '-hora', '-id')  # Índice partido_fecha_hora_id_idx
+
+
+class HistorialPagination(KeysetPagination):
+    ordering = ('-fecha', '-hora', '-partido_id')  # Índice participacion_usuario_idx (con usuario fijo)
+
+
+def _equipos(prefijo=''):
+    # Sólo las columnas que usa UsuarioSerializer
+    return [
+        Prefetch(f'{prefijo}{equipo}', queryset=Usuario.objects.only('id', 'nombre_completo'))
+        for equipo in ('equipo_1', 'equipo_2')
+    ]
+
+
+class PartidoViewSet(ConteoMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+    # Los equipos se traen en una consulta por relación para toda la página
+    # (no dos por partido); sólo las columnas que usa UsuarioSerializer.
+    queryset = Partido.objects.prefetch_related(*_equipos())
+    serializer_class = PartidoSerializer
+    pagination_class = PartidoPagination
+    campo_modificado = 'modifiedP'
+    dependencias = ('equipo_1__modifiedU', 'equipo_2__modifiedU')  # nombre_completo de los equipos
+
+    def get_queryset(self):
+        """
+        Filtro del listado (y de conteo/): ?fecha=YYYY-MM-DD, partidos de ese día
+        (prefijo del índice partido_fecha_hora_id_idx).
+        """
+        qs = super().get_queryset()
+        if self.action in ('list', 'conteo'):
+            fecha = self.request.query_params.get('fecha')
+            if fecha:
+                try:
+                    qs = qs.filter(fecha=datetime.date.fromisoformat(fecha))
+                except ValueError:
+                    raise ValidationError({"fecha": "Formato inválido, usa YYYY-MM-DD."})
+        return qs
+
+    def _parse_user(self, param):
+        try:
+            return uuid.UUID(self.request.query_params.get(param, ''))
+        except ValueError:
+            raise ValidationError({param: "Se requiere el id (UUID) del jugador."})
+
+    def _participaciones(self, user_id):
+        return (
+            Participacion.objects.filter(usuario_id=user_id)
+            .select_related('partido')
+            .prefetch_related(*_equipos('partido__'))
+        )
+
+    def _pagina(self, queryset, serializer_class, **extra):
+        paginator = HistorialPagination()
+        pagina = paginator.paginate_queryset(queryset, self.request, view=self)
+        response = paginator.get_paginated_response(serializer_class(pagina, many=True).data)
+        response.data.update(extra)
+        return response
+
+    @action(detail=False, methods=['get'])
+    def historial(self, request):
+        """
+        GET /api/partidos/historial/?user=<id>
+        Partidos del jugador, los más recientes primero, con su lado y resultado.
+        Es un range scan sobre participacion_usuario_idx.
+        """
+        user_id = self._parse_user('user')
+        return self._pagina(self._participaciones(user_id), ParticipacionSerializer, user=str(user_id))
+
+    @action(detail=False, methods=['get'], url_path='head-to-head')
+    def head_to_head(self, request):
+        """
+        GET /api/partidos/head-to-head/?user=<id>&rival=<id>
+        Partidos donde coincidieron ambos jugadores (en contra o como pareja),
+        vistos desde `user`, más un resumen de victorias y derrotas entre ellos.
+        Son los partidos de `user` (participacion_usuario_idx) unidos con la fila
+        del rival por el índice único (partido, usuario).
+        """
+        user_id = self._parse_user('user')
+        rival_id = self._parse_user('rival')
+        if user_id == rival_id:
+            raise ValidationError({"rival": "Debe ser un jugador distinto."})
+
+        coincidencias = (
+            self._participaciones(user_id)
+            .filter(partido__participaciones__usuario_id=rival_id)
+            .annotate(equipo_rival=F('partido__participaciones__equipo'))
+        )
+        en_contra = ~Q(equipo=F('equipo_rival'))
+        resumen = coincidencias.aggregate(
+            partidos=Count('id'),
+            en_contra=Count('id', filter=en_contra),
+            ganados=Count('id', filter=en_contra & Q(resultado='G')),
+            perdidos=Count('id', filter=en_contra & Q(resultado='P')),
+            como_pareja=Count('id', filter=Q(equipo=F('equipo_rival'))),
+        )
+        return self._pagina(
+            coincidencias, HeadToHeadSerializer,
+            user=str(user_id), rival=str(rival_id), resumen=resumen,
+        )
+
+    @action(detail=False, methods=['post'], url_path='import',
+            parser_classes=[NDJSONParser, CSVParser, JSONParser])
+    def carga_masiva(self, request):
+        """
+        POST /api/partidos/import/  (application/x-ndjson, text/csv o un arreglo JSON)
+        Carga masiva de partidos (ver partidos/importacion.py). Las filas inválidas
+        se regresan en `errores` con su número; las demás se crean igual.
+        """
+        filas = request.data
+        if isinstance(filas, dict):  # Un solo objeto JSON, o cuerpo vacío
+            filas = [filas] if filas else []
+        creados, errores = importar(filas)
+        return Response(
+            {"creados": len(creados), "partido_ids": creados, "errores": errores},
+            status=status.HTTP_201_CREATED if creados else status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class EstadisticasJugadorViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    GET /api/estadisticas/<user_id>/
+    Estadísticas de perfil del jugador, leídas por llave primaria de la tabla
+    que mantiene partidos/estadisticas.py.
+    """
+    queryset = EstadisticasJugador.objects.select_related('user')
+    serializer_class = EstadisticasJugadorSerializer
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # Jugador sin partidos con resultado todavía: todo en cero
+            return EstadisticasJugador(user=get_object_or_404(Usuario, pk=self.kwargs['pk']))
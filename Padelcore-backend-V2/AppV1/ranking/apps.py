@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class RankingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'ranking'
+
+    def ready(self):
+        # Conecta los signals que mantienen el rating Elo al día
+        from . import signals  # noqa: F401
@@ -0,0 +1,217 @@
+# ranking/cache.py
+"""
+Caché de páginas del leaderboard diario.
+
+Un ranking diario no cambia después de generate_daily_ranking, así que
+guardamos cada página ya serializada por (fecha, categoría, página) en dos niveles:
+
+1) LRU en memoria del proceso (cachetools), sin red.
+2) Caché compartida de Django (Redis, el mismo servidor de CHANNEL_LAYERS).
+
+Cada fecha tiene un número de versión en la caché compartida. Regenerar la
+fecha incrementa la versión, lo que invalida todas sus páginas (de todas
+las categorías) en ambos niveles. Los otros procesos notan el cambio en a
+lo más VERSION_TTL segundos.
+
+Las páginas se guardan bajo la fecha del snapshot que se sirve
+(RankingRecord.resolve_date), no la pedida: un día de un mes compactado
+comparte las páginas del cierre y se invalida junto con él. La fecha
+resuelta también se guarda, con la versión de la fecha pedida.
+"""
+import logging
+import threading
+
+from cachetools import LRUCache, TTLCache
+from django.core.cache import cache
+
+from .models import RankingRecord
+from .serializers import RankingRecordSerializer
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 100  # Registros por página del leaderboard
+TIMEOUT = 60 * 60 * 24 * 7  # Vida de una página en Redis (segundos)
+LOCAL_MAXSIZE = 512  # Páginas que guarda cada proceso
+VERSION_TTL = 5  # Segundos que un proceso confía en la versión que ya leyó
+
+_lock = threading.Lock()
+_paginas = LRUCache(maxsize=LOCAL_MAXSIZE)
+_resueltas = LRUCache(maxsize=LOCAL_MAXSIZE)
+_versiones = TTLCache(maxsize=1024, ttl=VERSION_TTL)
+
+
+def _version_key(fecha):
+    return f"ranking:{fecha}:version"
+
+
+def _pagina_key(fecha, categoria, version, page):
+    return f"ranking:{fecha}:v{version}:{categoria}:p{page}"
+
+
+def _resuelta_key(fecha, categoria, version):
+    return f"ranking:{fecha}:v{version}:{categoria}:snapshot"
+
+
+def _version(fecha):
+    with _lock:
+        version = _versiones.get(fecha)
+    if version is None:
+        try:
+            version = cache.get(_version_key(fecha), 0)
+        except Exception:
+            logger.exception("No se pudo leer la versión del ranking en la caché compartida")
+            version = 0
+        with _lock:
+            _versiones[fecha] = version
+    return version
+
+
+def _rango(page):
+    """Las posiciones son 1..N consecutivas: la página N es un rango sobre position."""
+    return (page - 1) * PAGE_SIZE, page * PAGE_SIZE
+
+
+def _resolver(fecha, categoria):
+    """
+    Fecha del snapshot que se sirve para `fecha` (meses compactados => su cierre).
+    Se guarda con la versión de `fecha`, que cambia al generarla o compactarla.
+    """
+    version = _version(fecha)
+    local_key = (fecha, version, categoria)
+    with _lock:
+        snapshot = _resueltas.get(local_key)
+    if snapshot is not None:
+        return snapshot
+
+    key = _resuelta_key(fecha, categoria, version)
+    try:
+        snapshot = cache.get(key)
+    except Exception:
+        logger.exception("No se pudo leer la fecha del ranking en la caché compartida")
+        snapshot = None
+
+    if snapshot is None:
+        snapshot = RankingRecord.resolve_date(fecha, categoria)
+        try:
+            cache.set(key, snapshot, TIMEOUT)
+        except Exception:
+            logger.exception("No se pudo guardar la fecha del ranking en la caché compartida")
+
+    with _lock:
+        _resueltas[local_key] = snapshot
+    return snapshot
+
+
+def construir_pagina(fecha, categoria, page):
+    """Consulta y serializa una página directo de la BD (`fecha` ya resuelta)."""
+    del_dia = RankingRecord.objects.filter(date=fecha, category=categoria)
+    total = del_dia.count()
+    desde, hasta = _rango(page)
+    registros = del_dia.filter(position__gt=desde, position__lte=hasta).order_by('position')
+    return _armar_pagina(fecha, categoria, page, total, RankingRecordSerializer(registros, many=True).data)
+
+
+def _armar_pagina(fecha, categoria, page, total, results):
+    return {
+        "date": str(fecha),
+        "category": categoria,
+        "page": page,
+        "num_pages": max(1, -(-total // PAGE_SIZE)),
+        "count": total,
+        "results": list(results),
+    }
+
+
+def obtener_pagina(fecha, page, categoria=''):
+    """
+    Regresa la página serializada de la fecha y categoría ('' es el global),
+    o None si la página no existe.
+    Busca en la LRU local, luego en Redis y por último en la BD.
+    """
+    fecha = _resolver(fecha, categoria)
+    version = _version(fecha)
+    local_key = (fecha, version, categoria, page)
+    with _lock:
+        data = _paginas.get(local_key)
+    if data is not None:
+        return data
+
+    key = _pagina_key(fecha, categoria, version, page)
+    try:
+        data = cache.get(key)
+    except Exception:
+        logger.exception("No se pudo leer la página del ranking en la caché compartida")
+        data = None
+
+    if data is None:
+        data = construir_pagina(fecha, categoria, page)
+        if page > data["num_pages"]:
+            return None
+        try:
+            cache.set(key, data, TIMEOUT)
+        except Exception:
+            logger.exception("No se pudo guardar la página del ranking en la caché compartida")
+
+    with _lock:
+        _paginas[local_key] = data
+    return data
+
+
+def invalidar(fecha):
+    """Invalida todas las páginas de la fecha, de todas las categorías (se llama al regenerarla)."""
+    key = _version_key(fecha)
+    try:
+        cache.add(key, 0, None)
+        version = cache.incr(key)
+    except Exception:
+        logger.exception("No se pudo invalidar el ranking en la caché compartida")
+        version = None
+    with _lock:
+        if version is None:
+            _versiones.pop(fecha, None)
+        else:
+            _versiones[fecha] = version
+        for local_key in [k for k in _paginas if k[0] == fecha]:
+            _paginas.pop(local_key, None)
+        for local_key in [k for k in _resueltas if k[0] == fecha]:
+            _resueltas.pop(local_key, None)
+    return version
+
+
+def calentar(fecha, categoria='', lote=50):
+    """
+    Serializa todas las páginas de la fecha y categoría en una sola pasada sobre
+    la BD y las sube a Redis en lotes de `lote` páginas. Regresa las páginas escritas.
+    """
+    version = _version(fecha)
+    registros = RankingRecord.objects.filter(date=fecha, category=categoria).order_by('position')
+    total = registros.count()
+
+    # La fecha recién generada se sirve a sí misma
+    cache.set(_resuelta_key(fecha, categoria, version), fecha, TIMEOUT)
+
+    escritas = 0
+    pendientes = {}
+    page, actual = 1, []
+
+    def cerrar_pagina():
+        nonlocal escritas, pendientes
+        pendientes[_pagina_key(fecha, categoria, version, page)] = _armar_pagina(
+            fecha, categoria, page, total, RankingRecordSerializer(actual, many=True).data
+        )
+        if len(pendientes) >= lote:
+            cache.set_many(pendientes, TIMEOUT)
+            escritas += len(pendientes)
+            pendientes = {}
+
+    for registro in registros.iterator(chunk_size=PAGE_SIZE * lote):
+        if registro.position > page * PAGE_SIZE and actual:
+            cerrar_pagina()
+            page, actual = -(-registro.position // PAGE_SIZE), []
+        actual.append(registro)
+    if actual or total == 0:
+        cerrar_pagina()
+    if pendientes:
+        cache.set_many(pendientes, TIMEOUT)
+        escritas += len(pendientes)
+    return escritas
@@ -0,0 +1,305 @@
+# ranking/elo.py
+"""
+Motor de rating Elo del lado del servidor (antes sólo existía en el front,
+en lib/ranking.ts).
+
+- aplicar_resultado(): ajuste incremental de los 4 jugadores de un Partido.
+- recalcular_historial(): reproduce el historial en orden cronológico con
+  numpy, completo (después de un cambio de reglas) o desde un partido.
+
+El orden que manda es el del partido, (fecha, hora, id), no el orden en
+que se registraron. El ajuste incremental sólo es correcto si el partido es
+el último de sus jugadores; si alguno ya tiene aplicado un partido
+posterior (se cargó o corrigió un partido atrasado), se reproduce el
+historial desde ese partido en adelante, igual que en las importaciones.
+
+En ambos casos cada equipo se evalúa con el promedio de rating de sus
+jugadores y el factor K sale del Torneo del partido.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from usuarios.models import Usuario
+from partidos.models import Partido
+from .models import CambioRating
+
+RATING_BASE = 1000  # Rating de arranque si el jugador no tiene rating_inicial
+RESULTADOS_VALIDOS = ('E1', 'E2')
+CENTAVOS = Decimal('0.01')
+
+
+def expected_score(rating, rating_rival):
+    """Probabilidad esperada de ganar (fórmula Elo clásica)."""
+    return 1 / (1 + 10 ** ((rating_rival - rating) / 400))
+
+
+def rating_actual(usuario):
+    """Rating vigente: el Elo si ya tiene, si no su rating_inicial (o la base)."""
+    if usuario.rating is not None:
+        return usuario.rating
+    if usuario.rating_inicial is not None:
+        return usuario.rating_inicial
+    return Decimal(RATING_BASE)
+
+
+def aplicar_resultado(partido):
+    """
+    Deja el rating de los jugadores consistente con el resultado actual del partido.
+    Si ya se aplicó el mismo resultado con los mismos jugadores no hace nada;
+    si cambió (corrección de resultado o de equipos) revierte el ajuste anterior
+    y aplica el nuevo.
+    """
+    equipo_1 = list(partido.equipo_1.values_list('id', flat=True))
+    equipo_2 = list(partido.equipo_2.values_list('id', flat=True))
+    resultado = partido.resultado
+    if resultado not in RESULTADOS_VALIDOS or not equipo_1 or not equipo_2 or set(equipo_1) & set(equipo_2):
+        resultado = ''  # Partido sin resultado aplicable => sólo revertimos
+    _reaplicar(partido, resultado, equipo_1, equipo_2)
+
+
+def revertir_resultado(partido):
+    """Revierte el ajuste que el partido haya aplicado (p. ej. antes de eliminarlo)."""
+    _reaplicar(partido, '', [], [])
+
+
+def clave(partido):
+    """(fecha, hora, id) del partido según la BD: su lugar en el orden del historial."""
+    return Partido.objects.filter(pk=partido.pk).values_list('fecha', 'hora', 'id').first()
+
+
+def _desde(clave, prefijo='', incluido=True):
+    """Q de los partidos (o filas con FK `prefijo`) en o después de `clave` en orden (fecha, hora, id)."""
+    fecha, hora, pk = clave
+    return (
+        Q(**{f'{prefijo}fecha__gt': fecha})
+        | Q(**{f'{prefijo}fecha': fecha, f'{prefijo}hora__gt': hora})
+        | Q(**{f'{prefijo}fecha': fecha, f'{prefijo}hora': hora, f'{prefijo}id__{"gte" if incluido else "gt"}': pk})
+    )
+
+
+def _reaplicar(partido, resultado, equipo_1, equipo_2):
+    with transaction.atomic():
+        previos = list(CambioRating.objects.select_for_update().filter(partido_id=partido.pk))
+        if not previos and not resultado:
+            return
+        if (
+            resultado
+            and previos
+            and all(c.resultado == resultado for c in previos)
+            and {c.user_id for c in previos} == set(equipo_1) | set(equipo_2)
+        ):
+            return  # Ya está aplicado tal cual
+
+        ids = set(equipo_1) | set(equipo_2) | {c.user_id for c in previos}
+        desde = clave(partido)
+        if desde and CambioRating.objects.filter(
+            _desde(desde, 'partido__', incluido=False), user_id__in=ids,
+        ).exists():
+            # Algún jugador ya tiene partidos posteriores: se reproducen desde aquí
+            recalcular_historial(desde=desde, excluir=None if resultado else partido.pk)
+            return
+        # Bloqueamos en orden de id para no provocar deadlocks entre partidos
+        usuarios = {
+            u.id: u for u in Usuario.objects.select_for_update().filter(id__in=ids).order_by('id')
+        }
+
+        # 1) Revertir el ajuste anterior
+        for cambio in previos:
+            u = usuarios[cambio.user_id]
+            u.rating = rating_actual(u) - (cambio.rating_despues - cambio.rating_antes)
+        CambioRating.objects.filter(partido_id=partido.pk).delete()
+
+        # 2) Aplicar el resultado nuevo con el promedio de cada equipo
+        nuevos = []
+        if resultado:
+            k = partido.torneo.factor_k
+            promedio_1 = sum(float(rating_actual(usuarios[i])) for i in equipo_1) / len(equipo_1)
+            promedio_2 = sum(float(rating_actual(usuarios[i])) for i in equipo_2) / len(equipo_2)
+            score_1 = 1 if resultado == 'E1' else 0
+            delta_1 = k * (score_1 - expected_score(promedio_1, promedio_2))
+            for equipo, delta in ((equipo_1, delta_1), (equipo_2, -delta_1)):
+                for user_id in equipo:
+                    u = usuarios[user_id]
+                    antes = rating_actual(u)
+                    u.rating = (antes + Decimal(delta)).quantize(CENTAVOS)
+                    nuevos.append(CambioRating(
+                        partido_id=partido.pk,
+                        user_id=user_id,
+                        resultado=resultado,
+                        rating_antes=antes,
+                        rating_despues=u.rating,
+                    ))
+
+        # bulk_update no toca auto_now: modifiedU es el validador del GET condicional
+        ahora = timezone.now()
+        for u in usuarios.values():
+            u.modifiedU = ahora
+        Usuario.objects.bulk_update(usuarios.values(), ['rating', 'modifiedU'])
+        CambioRating.objects.bulk_create(nuevos)
+
+
+def recalcular_historial(batch_size=5000, desde=None, excluir=None):
+    """
+    Reconstruye el rating de los jugadores reproduciendo los partidos con
+    resultado en orden cronológico (fecha, hora, id).
+
+    Sin `desde` reproduce todo a partir de rating_inicial. Con `desde`
+    ((fecha, hora, id) de un partido) sólo reproduce de ese partido en
+    adelante: cada jugador arranca con el rating que tenía antes de su primer
+    cambio en ese tramo (o el actual si no tiene ninguno) y sólo se rehacen
+    los CambioRating del tramo. `excluir` es un partido que no debe contar
+    (el que se está eliminando).
+
+    Los partidos se agrupan en "capas" donde ningún jugador se repite:
+    la capa de un partido es una más que la última capa de cualquiera de
+    sus jugadores. Así cada jugador ve sus partidos en orden y cada capa
+    se calcula de una vez con arreglos de numpy.
+
+    Regresa (partidos procesados, jugadores con rating).
+    """
+    tramo = Q() if desde is None else _desde(desde)
+    cambios_tramo = CambioRating.objects.filter(Q() if desde is None else _desde(desde, 'partido__'))
+
+    partidos = list(
+        Partido.objects.filter(tramo, resultado__in=RESULTADOS_VALIDOS).exclude(pk=excluir)
+        .order_by('fecha', 'hora', 'id')
+        .values_list('id', 'resultado', 'torneo__factor_k')
+    )
+    equipos = defaultdict(lambda: ([], []))
+    for lado, through in enumerate((Partido.equipo_1.through, Partido.equipo_2.through)):
+        filas = through.objects.filter(
+            Q() if desde is None else _desde(desde, 'partido__'),
+            partido__resultado__in=RESULTADOS_VALIDOS,
+        ).exclude(partido_id=excluir).values_list('partido_id', 'usuario_id')
+        for partido_id, user_id in filas.iterator(chunk_size=batch_size):
+            equipos[partido_id][lado].append(user_id)
+
+    # Rating con el que arranca cada jugador
+    if desde is None:
+        usuarios = list(Usuario.objects.values_list('id', 'rating_inicial'))
+        iniciales = [float(r) if r is not None else RATING_BASE for _, r in usuarios]
+        revertidos = set()
+    else:
+        primeros = {}
+        for user_id, antes in cambios_tramo.order_by(
+            'partido__fecha', 'partido__hora', 'partido_id',
+        ).values_list('user_id', 'rating_antes').iterator(chunk_size=batch_size):
+            primeros.setdefault(user_id, antes)
+        revertidos = set(primeros)
+        ids = revertidos | {user_id for e1, e2 in equipos.values() for user_id in e1 + e2}
+        usuarios = list(Usuario.objects.filter(id__in=ids).values_list('id', 'rating_inicial', 'rating'))
+        iniciales = [
+            float(primeros[user_id]) if user_id in primeros
+            else float(rating if rating is not None else inicial if inicial is not None else RATING_BASE)
+            for user_id, inicial, rating in usuarios
+        ]
+    indice = {usuario[0]: i for i, usuario in enumerate(usuarios)}
+    # La última posición es un "hueco" para rellenar equipos de distinto tamaño
+    ratings = np.array(iniciales + [0.0])
+    hueco = len(usuarios)
+    equipos = {
+        partido_id: ([indice[u] for u in e1], [indice[u] for u in e2])
+        for partido_id, (e1, e2) in equipos.items()
+    }
+
+    # Descartamos partidos incompletos o con un jugador en ambos equipos
+    partidos = [
+        p for p in partidos
+        if p[0] in equipos and equipos[p[0]][0] and equipos[p[0]][1]
+        and not set(equipos[p[0]][0]) & set(equipos[p[0]][1])
+    ]
+    if not partidos:
+        with transaction.atomic():
+            cambios_tramo.delete()
+            if desde is None:
+                Usuario.objects.update(rating=None, modifiedU=timezone.now())
+            else:
+                _guardar_ratings(usuarios, ratings, [indice[u] for u in revertidos], batch_size)
+        return 0, 0
+
+    n = len(partidos)
+    ancho = max(max(len(equipos[p[0]][0]), len(equipos[p[0]][1])) for p in partidos)
+    idx_1 = np.full((n, ancho), hueco)
+    idx_2 = np.full((n, ancho), hueco)
+    capa = np.zeros(n, dtype=np.int64)
+    ultima_capa = {}
+    for m, (partido_id, _, _) in enumerate(partidos):
+        e1, e2 = equipos[partido_id]
+        idx_1[m, :len(e1)] = e1
+        idx_2[m, :len(e2)] = e2
+        c = 1 + max(ultima_capa.get(i, -1) for i in e1 + e2)
+        for i in e1 + e2:
+            ultima_capa[i] = c
+        capa[m] = c
+    mask_1 = idx_1 != hueco
+    mask_2 = idx_2 != hueco
+    k = np.array([p[2] for p in partidos], dtype=float)
+    gana_1 = np.array([p[1] == 'E1' for p in partidos], dtype=float)
+
+    antes_1 = np.zeros((n, ancho))
+    antes_2 = np.zeros((n, ancho))
+    despues_1 = np.zeros((n, ancho))
+    despues_2 = np.zeros((n, ancho))
+
+    # Partidos ordenados por capa; dentro de la capa se respeta el orden cronológico
+    orden = np.argsort(capa, kind='stable')
+    limites = np.flatnonzero(np.diff(capa[orden])) + 1
+    for sel in np.split(orden, limites):
+        r1 = ratings[idx_1[sel]]
+        r2 = ratings[idx_2[sel]]
+        m1 = mask_1[sel]
+        m2 = mask_2[sel]
+        promedio_1 = (r1 * m1).sum(axis=1) / m1.sum(axis=1)
+        promedio_2 = (r2 * m2).sum(axis=1) / m2.sum(axis=1)
+        delta_1 = k[sel] * (gana_1[sel] - expected_score(promedio_1, promedio_2))
+        nuevo_1 = np.round(r1 + delta_1[:, None], 2)
+        nuevo_2 = np.round(r2 - delta_1[:, None], 2)
+        antes_1[sel], antes_2[sel] = r1, r2
+        despues_1[sel], despues_2[sel] = nuevo_1, nuevo_2
+        ratings[idx_1[sel][m1]] = nuevo_1[m1]
+        ratings[idx_2[sel][m2]] = nuevo_2[m2]
+
+    with transaction.atomic():
+        cambios_tramo.delete()
+        if desde is None:
+            Usuario.objects.update(rating=None, modifiedU=timezone.now())
+
+        cambios = []
+        for m, (partido_id, resultado, _) in enumerate(partidos):
+            for idx, mask, antes, despues in (
+                (idx_1, mask_1, antes_1, despues_1),
+                (idx_2, mask_2, antes_2, despues_2),
+            ):
+                for j in np.flatnonzero(mask[m]):
+                    cambios.append(CambioRating(
+                        partido_id=partido_id,
+                        user_id=usuarios[idx[m, j]][0],
+                        resultado=resultado,
+                        rating_antes=Decimal(f'{antes[m, j]:.2f}'),
+                        rating_despues=Decimal(f'{despues[m, j]:.2f}'),
+                    ))
+            if len(cambios) >= batch_size:
+                CambioRating.objects.bulk_create(cambios)
+                cambios = []
+        if cambios:
+            CambioRating.objects.bulk_create(cambios)
+
+        jugadores = np.unique(np.concatenate([idx_1[mask_1], idx_2[mask_2]]))
+        # Quien perdió todos sus partidos del tramo vuelve al rating de antes
+        afectados = set(jugadores.tolist()) | {indice[u] for u in revertidos}
+        _guardar_ratings(usuarios, ratings, sorted(afectados), batch_size)
+
+    return n, len(jugadores)
+
+
+def _guardar_ratings(usuarios, ratings, posiciones, batch_size):
+    ahora = timezone.now()
+    Usuario.objects.bulk_update([
+        Usuario(id=usuarios[i][0], rating=Decimal(f'{ratings[i]:.2f}'), modifiedU=ahora)
+        for i in posiciones
+    ], ['rating', 'modifiedU'], batch_size=batch_size)
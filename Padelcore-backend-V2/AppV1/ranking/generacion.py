@@ -0,0 +1,106 @@
+# ranking/generacion.py
+"""
+Cálculo de los leaderboards diarios que escribe generate_daily_ranking.
+
+Además del ranking global ('') hay uno por Tag de torneo ('tag:<nombre>',
+jugadores que han jugado algún torneo con ese tag) y uno por club
+('club:<nombre>'). Cada leaderboard es una sola consulta: ROW_NUMBER() en la
+BD más un LEFT JOIN al snapshot anterior de la misma categoría.
+
+calcular_categoria() es de nivel módulo para poder mandarla a un
+ProcessPoolExecutor; init_worker() prepara Django en cada proceso.
+"""
+from django.db.models import Exists, F, FilteredRelation, Max, OuterRef, Q, Window
+from django.db.models.functions import Coalesce, RowNumber
+
+from usuarios.models import Usuario
+from torneos.models import Tag
+from partidos.models import Partido
+from .models import RankingRecord
+
+GLOBAL = ''
+
+
+def init_worker():
+    import django
+    django.setup()
+
+
+def categorias():
+    """Todas las categorías además del global: una por Tag y una por club."""
+    tags = [
+        f"tag:{nombre}"
+        for nombre in Tag.objects.exclude(nombre__isnull=True).exclude(nombre='')
+        .order_by('nombre').values_list('nombre', flat=True)
+    ]
+    clubes = [
+        f"club:{club}"
+        for club in Usuario.objects.exclude(club__isnull=True).exclude(club='')
+        .order_by('club').values_list('club', flat=True).distinct()
+    ]
+    return tags + clubes
+
+
+def jugadores(categoria):
+    """Queryset de Usuario que entran al leaderboard de la categoría."""
+    usuarios = Usuario.objects.all()
+    if categoria.startswith('club:'):
+        usuarios = usuarios.filter(club=categoria[len('club:'):])
+    elif categoria.startswith('tag:'):
+        tag = categoria[len('tag:'):]
+        en_equipo = [
+            Exists(through.objects.filter(usuario_id=OuterRef('pk'), partido__torneo__tags__nombre=tag))
+            for through in (Partido.equipo_1.through, Partido.equipo_2.through)
+        ]
+        usuarios = usuarios.filter(en_equipo[0] | en_equipo[1])
+    return usuarios
+
+
+def filas(ranking_date, categoria=GLOBAL):
+    """
+    Consulta (perezosa) de (user_id, rating, position, previous_position, rating_delta)
+    para la categoría. Se usa el rating Elo (ranking.elo) y, si aún no tiene,
+    el rating_inicial; el id desempata para que la posición sea estable.
+    """
+    fecha_anterior = RankingRecord.objects.filter(
+        date__lt=ranking_date, category=categoria
+    ).aggregate(fecha=Max('date'))['fecha']
+    return (
+        jugadores(categoria)
+        .annotate(
+            rating_actual=Coalesce('rating', 'rating_inicial'),
+            anterior=FilteredRelation(
+                'ranking_records',
+                condition=Q(ranking_records__date=fecha_anterior, ranking_records__category=categoria),
+            ),
+        )
+        .filter(rating_actual__gt=0)
+        .annotate(
+            position=Window(
+                expression=RowNumber(),
+                order_by=[F('rating_actual').desc(), F('id').asc()],
+            ),
+            previous_position=F('anterior__position'),
+            rating_delta=F('rating_actual') - F('anterior__rating_snapshot'),
+        )
+        .values_list('id', 'rating_actual', 'position', 'previous_position', 'rating_delta')
+    )
+
+
+def calcular_categoria(ranking_date, categoria):
+    """Materializa las filas de una categoría (se ejecuta en un worker)."""
+    return categoria, list(filas(ranking_date, categoria))
+
+
+def registros(ranking_date, categoria, filas_categoria):
+    """Convierte filas en RankingRecord sin guardar (para bulk_create)."""
+    for user_id, rating, position, previous_position, rating_delta in filas_categoria:
+        yield RankingRecord(
+            user_id=user_id,
+            date=ranking_date,
+            category=categoria,
+            rating_snapshot=rating,  # guardamos su rating actual
+            position=position,
+            previous_position=previous_position,
+            rating_delta=rating_delta,
+        )
@@ -0,0 +1,31 @@
+# ranking/management/commands/actualizar_puntos.py
+
+from django.core.management.base import BaseCommand
+
+from partidos.models import Partido
+from ranking import puntos
+
+class Command(BaseCommand):
+    help = ('Expira del ranking por puntos los movimientos que salieron de la ventana móvil '
+            '(52 semanas). Con --historial primero acredita todos los partidos con resultado.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--historial', action='store_true',
+                            help='Acredita los partidos existentes (sólo agrega lo que falte)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Movimientos por lote (default 5000)')
+
+    def handle(self, *args, **options):
+        if options['historial']:
+            partidos = Partido.objects.filter(resultado__in=('E1', 'E2')).order_by('fecha', 'id')
+            acreditados = 0
+            for partido in partidos.iterator(chunk_size=options['batch_size']):
+                puntos.acreditar_partido(partido)
+                acreditados += 1
+            self.stdout.write(f'Se revisaron {acreditados} partidos con resultado.')
+
+        total = puntos.expirar(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Se expiraron {total} movimientos de puntos anteriores a {puntos.corte()}'
+        ))
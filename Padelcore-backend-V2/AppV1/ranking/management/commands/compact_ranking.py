@@ -0,0 +1,115 @@
+# ranking/management/commands/compact_ranking.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min
+from django.utils import timezone
+from datetime import timedelta
+from decimal import Decimal
+
+from ranking.models import RankingRecord, RankingRollup
+from ranking import cache as ranking_cache
+
+CENTAVOS = Decimal('0.01')
+
+class Command(BaseCommand):
+    help = ('Resume en RankingRollup mensuales los snapshots diarios fuera de la ventana '
+            'de retención y borra los diarios (salvo el cierre de cada mes y categoría) por lotes.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=180,
+                            help='Días de snapshots diarios que se conservan completos (default 180)')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Registros por lote de escritura/borrado (default 5000)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        # 1) Sólo se compactan meses completos anteriores a la ventana
+        limite = timezone.localdate() - timedelta(days=options['days'])
+        limite = limite.replace(day=1)
+        meses = RankingRecord.objects.filter(date__lt=limite).dates('date', 'month')
+
+        total_rollups = 0
+        total_borrados = 0
+        for mes in meses:
+            siguiente = (mes + timedelta(days=32)).replace(day=1)
+            del_mes = RankingRecord.objects.filter(date__gte=mes, date__lt=siguiente)
+            # Cada leaderboard conserva su propio último snapshot del mes
+            cierres = dict(del_mes.order_by().values_list('category').annotate(cierre=Max('date')))
+
+            rollups_mes = borrados_mes = 0
+            for categoria, cierre in cierres.items():
+                de_categoria = del_mes.filter(category=categoria)
+
+                # 2) Rollups faltantes de la categoría en una sola transacción, antes de
+                #    borrar nada. Si ya están todos, una corrida anterior se interrumpió
+                #    durante el borrado y sólo falta el paso 3.
+                rollups_mes += self.crear_rollups(de_categoria, mes, categoria, cierre, batch_size)
+
+                # 3) Borrado por lotes cortos (cada lote es su propia transacción)
+                sobrantes = de_categoria.exclude(date=cierre)
+                while True:
+                    ids = list(sobrantes.values_list('pk', flat=True)[:batch_size])
+                    if not ids:
+                        break
+                    RankingRecord.objects.filter(pk__in=ids).delete()
+                    borrados_mes += len(ids)
+
+            # Todos los días del mes (también los que no tenían snapshot) pasan a
+            # resolverse al cierre de su categoría
+            if rollups_mes or borrados_mes:
+                for dia in range((siguiente - mes).days):
+                    ranking_cache.invalidar(mes + timedelta(days=dia))
+            total_rollups += rollups_mes
+            total_borrados += borrados_mes
+
+        # 4) Mensaje en consola
+        self.stdout.write(self.style.SUCCESS(
+            f'Se crearon {total_rollups} rollups mensuales y se eliminaron '
+            f'{total_borrados} snapshots diarios anteriores a {limite}'
+        ))
+
+    def crear_rollups(self, de_categoria, mes, categoria, cierre, batch_size):
+        """
+        Crea el rollup de cada usuario del mes y categoría que todavía no tenga uno
+        (categorías o jugadores que aparecieron después de compactar el mes) y
+        apunta todos los de la categoría al snapshot de cierre que se conserva.
+        """
+        rollups = RankingRollup.objects.filter(month=mes, category=categoria)
+        filas = (
+            de_categoria.exclude(user_id__in=rollups.values('user_id'))
+            .values('user_id')
+            .annotate(
+                rating_promedio=Avg('rating_snapshot'),
+                posicion_promedio=Avg('position'),
+                mejor=Min('position'),
+                peor=Max('position'),
+                muestras=Count('id'),
+            )
+            .order_by('user_id')
+        )
+        creados = 0
+        with transaction.atomic():
+            rollups.exclude(closing_date=cierre).update(closing_date=cierre)
+            batch = []
+            for fila in filas.iterator(chunk_size=batch_size):
+                batch.append(RankingRollup(
+                    user_id=fila['user_id'],
+                    category=categoria,
+                    month=mes,
+                    closing_date=cierre,
+                    rating_avg=Decimal(fila['rating_promedio']).quantize(CENTAVOS),
+                    position_avg=Decimal(fila['posicion_promedio']).quantize(CENTAVOS),
+                    best_position=fila['mejor'],
+                    worst_position=fila['peor'],
+                    samples=fila['muestras'],
+                ))
+                if len(batch) >= batch_size:
+                    RankingRollup.objects.bulk_create(batch, ignore_conflicts=True)
+                    creados += len(batch)
+                    batch = []
+            if batch:
+                RankingRollup.objects.bulk_create(batch, ignore_conflicts=True)
+                creados += len(batch)
+        return creados
@@ -0,0 +1,103 @@
+# ranking/management/commands/generate_daily_ranking.py
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+import datetime
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.utils import timezone
+
+from ranking.models import RankingRecord
+from ranking import cache as ranking_cache
+from ranking import generacion
+
+class Command(BaseCommand):
+    help = "Genera un ranking diario para la fecha actual (o fecha dada)."
+
+    def add_arguments(self, parser):
+        # Argumento opcional para fecha, formato YYYY-MM-DD
+        parser.add_argument('--date', type=str, help='Fecha del ranking, formato YYYY-MM-DD')
+        # Tamaño de cada INSERT masivo
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Registros por cada bulk insert (default 5000)')
+        # Leaderboards por Tag de torneo y por club, además del global
+        parser.add_argument('--categorias', action='store_true',
+                            help='Genera también los rankings por tag y por club')
+        parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1),
+                            help='Procesos para calcular las categorías en paralelo')
+
+    def handle(self, *args, **options):
+        # 1) Obtener fecha. Si no se pasa --date, usamos hoy.
+        date_str = options['date']
+        if date_str:
+            ranking_date = datetime.datetime.strptime(date_str, '%Y-%m-%d').date()
+        else:
+            ranking_date = timezone.localdate()  # La fecha de hoy en zona local
+        batch_size = options['batch_size']
+
+        # 2) Las categorías son independientes: se calculan en paralelo en un pool
+        #    de procesos ANTES de abrir la transacción de escritura (cada worker
+        #    abre su propia conexión, así que cerramos las heredadas).
+        resultados = []
+        if options['categorias']:
+            categorias = generacion.categorias()
+            if options['workers'] > 1 and len(categorias) > 1:
+                connections.close_all()
+                with ProcessPoolExecutor(
+                    max_workers=options['workers'], initializer=generacion.init_worker
+                ) as pool:
+                    resultados = list(pool.map(
+                        generacion.calcular_categoria, repeat(ranking_date), categorias
+                    ))
+            else:
+                resultados = [generacion.calcular_categoria(ranking_date, c) for c in categorias]
+
+        # 3) Reemplazamos los snapshots de la fecha completos en una sola transacción,
+        #    así correrlo dos veces el mismo día no duplica registros. El global se
+        #    escribe directo del cursor de la BD; las categorías ya vienen calculadas.
+        escritas = {}
+        with transaction.atomic():
+            existentes = RankingRecord.objects.filter(date=ranking_date)
+            if not options['categorias']:
+                existentes = existentes.filter(category=generacion.GLOBAL)
+            existentes.delete()
+
+            global_filas = generacion.filas(ranking_date).iterator(chunk_size=batch_size)
+            escritas[generacion.GLOBAL] = self.escribir(
+                generacion.registros(ranking_date, generacion.GLOBAL, global_filas), batch_size
+            )
+            for categoria, filas in resultados:
+                escritas[categoria] = self.escribir(
+                    generacion.registros(ranking_date, categoria, filas), batch_size
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Ranking diario para {ranking_date} generado. "
+            f"{escritas[generacion.GLOBAL]} usuarios con rating > 0."
+        ))
+        if resultados:
+            self.stdout.write(
+                f"{len(resultados)} rankings por categoría, "
+                f"{sum(escritas.values()) - escritas[generacion.GLOBAL]} registros."
+            )
+
+        # 4) Invalidamos las páginas viejas de la fecha y precalentamos las nuevas
+        try:
+            ranking_cache.invalidar(ranking_date)
+            paginas = sum(ranking_cache.calentar(ranking_date, categoria) for categoria in escritas)
+        except Exception as exc:
+            self.stdout.write(self.style.WARNING(f"No se pudo precalentar la caché del ranking: {exc}"))
+        else:
+            self.stdout.write(f"Caché del leaderboard precalentada: {paginas} páginas.")
+
+    def escribir(self, registros, batch_size):
+        """bulk_create en lotes de batch_size; regresa cuántos escribió."""
+        total = 0
+        while True:
+            batch = list(islice(registros, batch_size))
+            if not batch:
+                return total
+            RankingRecord.objects.bulk_create(batch)
+            total += len(batch)
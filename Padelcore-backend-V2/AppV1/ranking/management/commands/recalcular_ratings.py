@@ -0,0 +1,19 @@
+# ranking/management/commands/recalcular_ratings.py
+
+from django.core.management.base import BaseCommand
+
+from ranking.elo import recalcular_historial
+
+class Command(BaseCommand):
+    help = "Reconstruye el rating Elo de todos los jugadores reproduciendo el historial de partidos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Registros por cada escritura masiva (default 5000)')
+
+    def handle(self, *args, **options):
+        partidos, jugadores = recalcular_historial(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Ratings recalculados: {partidos} partidos, {jugadores} jugadores con rating."
+        ))
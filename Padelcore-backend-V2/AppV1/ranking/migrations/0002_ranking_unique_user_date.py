@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def eliminar_duplicados(apps, schema_editor):
+    # Corridas repetidas del comando dejaron snapshots duplicados;
+    # conservamos el registro más antiguo de cada (user, date).
+    RankingRecord = apps.get_model('ranking', 'RankingRecord')
+    vistos = set()
+    duplicados = []
+    for pk, user_id, date in (
+        RankingRecord.objects.order_by('date', 'user_id', 'created_at')
+        .values_list('pk', 'user_id', 'date').iterator()
+    ):
+        if (user_id, date) in vistos:
+            duplicados.append(pk)
+        else:
+            vistos.add((user_id, date))
+    for i in range(0, len(duplicados), 1000):
+        RankingRecord.objects.filter(pk__in=duplicados[i:i + 1000]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ranking', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(eliminar_duplicados, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='rankingrecord',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='unique_ranking_user_date'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0002_alter_partido_resultado'),
+        ('ranking', '0002_ranking_unique_user_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioRating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resultado', models.CharField(max_length=2)),
+                ('rating_antes', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('rating_despues', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('partido', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cambios_rating', to='partidos.partido')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cambios_rating', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('partido', 'user'), name='unique_cambio_rating_partido_user')],
+            },
+        ),
+    ]
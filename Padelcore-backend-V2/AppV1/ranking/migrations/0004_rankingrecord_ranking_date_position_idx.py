@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ranking', '0003_cambiorating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rankingrecord',
+            index=models.Index(fields=['date', 'position'], name='ranking_date_position_idx'),
+        ),
+    ]
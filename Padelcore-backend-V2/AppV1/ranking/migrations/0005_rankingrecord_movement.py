@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ranking', '0004_rankingrecord_ranking_date_position_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rankingrecord',
+            name='previous_position',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rankingrecord',
+            name='rating_delta',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:46
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ranking', '0005_rankingrecord_movement'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RankingRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('month', models.DateField()),
+                ('closing_date', models.DateField()),
+                ('rating_avg', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('position_avg', models.DecimalField(decimal_places=2, max_digits=9)),
+                ('best_position', models.PositiveIntegerField()),
+                ('worst_position', models.PositiveIntegerField()),
+                ('samples', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranking_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['month'],
+                'indexes': [models.Index(fields=['month'], name='ranking_rollup_month_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'month'), name='unique_ranking_rollup_user_month')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('partidos', '0003_partido_partido_fecha_hora_id_idx'),
+        ('ranking', '0006_rankingrollup'),
+        ('torneos', '0002_torneo_factor_k'),
+        ('usuarios', '0003_usuario_usuario_created_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PuntosJugador',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='puntos', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('puntos_totales', models.IntegerField(default=0)),
+                ('puntos_ventana', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-puntos_ventana', 'user'], name='puntos_jugador_ventana_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MovimientoPuntos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('puntos', models.IntegerField()),
+                ('motivo', models.CharField(choices=[('partido', 'Partido ganado'), ('correccion', 'Corrección')], max_length=10)),
+                ('fecha', models.DateField()),
+                ('expirado', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('partido', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimientos_puntos', to='partidos.partido')),
+                ('torneo', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='movimientos_puntos', to='torneos.torneo')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movimientos_puntos', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('expirado', False)), fields=['fecha'], name='mov_puntos_vigentes_idx')],
+            },
+        ),
+    ]
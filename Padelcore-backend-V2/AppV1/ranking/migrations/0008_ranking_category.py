@@ -0,0 +1,49 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ranking', '0007_puntos_ledger'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='rankingrecord',
+            name='unique_ranking_user_date',
+        ),
+        migrations.RemoveConstraint(
+            model_name='rankingrollup',
+            name='unique_ranking_rollup_user_month',
+        ),
+        migrations.RemoveIndex(
+            model_name='rankingrecord',
+            name='ranking_date_position_idx',
+        ),
+        migrations.AddField(
+            model_name='rankingrecord',
+            name='category',
+            field=models.CharField(blank=True, default='', max_length=300),
+        ),
+        migrations.AddField(
+            model_name='rankingrollup',
+            name='category',
+            field=models.CharField(blank=True, default='', max_length=300),
+        ),
+        migrations.AddIndex(
+            model_name='rankingrecord',
+            index=models.Index(fields=['date', 'category', 'position'], name='ranking_date_cat_position_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='rankingrecord',
+            constraint=models.UniqueConstraint(fields=('user', 'date', 'category'), name='unique_ranking_user_date_category'),
+        ),
+        migrations.AddConstraint(
+            model_name='rankingrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'category'), name='unique_ranking_rollup_user_month_cat'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copiar_expirado(apps, schema_editor):
+    # Lo ya marcado como expirado deja de contar en la ventana: mismo
+    # puntos_ventana que antes, sin crear compensaciones por lo ya descontado.
+    MovimientoPuntos = apps.get_model('ranking', 'MovimientoPuntos')
+    MovimientoPuntos.objects.filter(expirado=True).update(en_ventana=False)
+
+
+def copiar_en_ventana(apps, schema_editor):
+    MovimientoPuntos = apps.get_model('ranking', 'MovimientoPuntos')
+    MovimientoPuntos.objects.filter(en_ventana=False).update(expirado=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ranking', '0008_ranking_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movimientopuntos',
+            name='en_ventana',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(copiar_expirado, copiar_en_ventana),
+        migrations.RemoveIndex(
+            model_name='movimientopuntos',
+            name='mov_puntos_vigentes_idx',
+        ),
+        migrations.RemoveField(
+            model_name='movimientopuntos',
+            name='expirado',
+        ),
+        migrations.AddField(
+            model_name='movimientopuntos',
+            name='compensa',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='compensacion', to='ranking.movimientopuntos'),
+        ),
+        migrations.AlterField(
+            model_name='movimientopuntos',
+            name='motivo',
+            field=models.CharField(choices=[('partido', 'Partido ganado'), ('correccion', 'Corrección'), ('expiracion', 'Expiración')], max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='movimientopuntos',
+            index=models.Index(condition=models.Q(('compensa__isnull', True), ('en_ventana', True)), fields=['fecha'], name='mov_puntos_ventana_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movimientopuntos',
+            index=models.Index(condition=models.Q(('motivo', 'expiracion')), fields=['fecha'], name='mov_puntos_expiracion_idx'),
+        ),
+    ]
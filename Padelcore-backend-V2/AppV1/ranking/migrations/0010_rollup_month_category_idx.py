@@ -0,0 +1,23 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ranking', '0009_puntos_compensaciones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rankingrollup',
+            name='ranking_rollup_month_idx',
+        ),
+        migrations.AddIndex(
+            model_name='rankingrollup',
+            index=models.Index(fields=['month', 'category'], name='ranking_rollup_month_cat_idx'),
+        ),
+    ]
@@ -0,0 +1,238 @@
+# ranking/models.py
+from django.db import models
+from django.conf import settings
+import uuid
+
+class RankingRecord(models.Model):
+    """
+    Guarda la información de un usuario en un ranking
+    para un periodo dado (mes, año, etc.).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='ranking_records'
+    )
+
+    # Fecha/mes de la clasificación
+    # Ej: "2025-04-01" para 'ranking de abril 2025'
+    date = models.DateField()
+
+    # Leaderboard al que pertenece: '' es el global, 'tag:<nombre>' o 'club:<nombre>'
+    category = models.CharField(max_length=300, blank=True, default='')
+
+    # rating en ese momento
+    rating_snapshot = models.DecimalField(max_digits=6, decimal_places=2)
+
+    # posición en el ranking => 1 es el #1, 2 es #2, etc.
+    position = models.PositiveIntegerField()
+
+    # Movimiento respecto al snapshot anterior (null si no aparecía en él)
+    previous_position = models.PositiveIntegerField(null=True, blank=True)
+    rating_delta = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Ordenar desc por rating, o por position asc, lo que quieras
+        ordering = ['position']
+        constraints = [
+            # Un solo registro por usuario, fecha y leaderboard (el snapshot se reemplaza completo)
+            models.UniqueConstraint(fields=['user', 'date', 'category'], name='unique_ranking_user_date_category'),
+        ]
+        indexes = [
+            # Las páginas del leaderboard son rangos sobre (date, category, position)
+            models.Index(fields=['date', 'category', 'position'], name='ranking_date_cat_position_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.email} - {self.date} - #{self.position}"
+
+    @classmethod
+    def resolve_date(cls, fecha, categoria=''):
+        """
+        Fecha cuyo snapshot representa a `fecha` en el leaderboard `categoria`.
+        Si el mes ya fue compactado (compact_ranking) sólo queda el snapshot de
+        cierre de esa categoría y se usa ese.
+        """
+        if cls.objects.filter(date=fecha, category=categoria).exists():
+            return fecha
+        cierre = (
+            RankingRollup.objects.filter(month=fecha.replace(day=1), category=categoria)
+            .values_list('closing_date', flat=True)
+            .first()
+        )
+        return cierre or fecha
+
+
+class CambioRating(models.Model):
+    """
+    Ajuste de rating Elo que un Partido le aplicó a un jugador.
+    Se guarda para poder revertirlo si el resultado se corrige
+    o el partido se elimina.
+    """
+    partido = models.ForeignKey(
+        'partidos.Partido',
+        on_delete=models.CASCADE,
+        related_name='cambios_rating'
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='cambios_rating'
+    )
+
+    # "E1" o "E2", el resultado con el que se calculó el ajuste
+    resultado = models.CharField(max_length=2)
+
+    rating_antes = models.DecimalField(max_digits=6, decimal_places=2)
+    rating_despues = models.DecimalField(max_digits=6, decimal_places=2)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['partido', 'user'], name='unique_cambio_rating_partido_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - partido {self.partido_id}: {self.rating_antes} -> {self.rating_despues}"
+
+
+class RankingRollup(models.Model):
+    """
+    Resumen mensual de los snapshots diarios de un usuario.
+    Lo genera compact_ranking para los meses fuera de la ventana de
+    retención: de esos meses sólo se conserva el snapshot de cierre
+    (closing_date) en RankingRecord y el resto queda resumido aquí.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='ranking_rollups'
+    )
+
+    # Primer día del mes resumido, ej: "2025-04-01"
+    month = models.DateField()
+
+    # Mismo valor que RankingRecord.category ('' es el global)
+    category = models.CharField(max_length=300, blank=True, default='')
+
+    # Fecha del snapshot de cierre del mes que se conserva en RankingRecord
+    closing_date = models.DateField()
+
+    rating_avg = models.DecimalField(max_digits=6, decimal_places=2)
+    position_avg = models.DecimalField(max_digits=9, decimal_places=2)
+    best_position = models.PositiveIntegerField()
+    worst_position = models.PositiveIntegerField()
+    # Cuántos snapshots diarios se resumieron
+    samples = models.PositiveIntegerField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['month']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month', 'category'], name='unique_ranking_rollup_user_month_cat'),
+        ]
+        indexes = [
+            # resolve_date busca el cierre por (month, category)
+            models.Index(fields=['month', 'category'], name='ranking_rollup_month_cat_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month:%Y-%m} - #{self.best_position}/{self.worst_position}"
+
+
+class MovimientoPuntos(models.Model):
+    """
+    Ledger de puntos de ranking (Torneo.puntos). Sólo se agregan filas:
+    una corrección de resultado agrega un movimiento negativo en vez de
+    borrar el anterior, y la expiración agrega un movimiento que compensa
+    al vencido en vez de marcarlo. Ver ranking/puntos.py.
+    """
+    MOTIVO_CHOICES = (
+        ('partido', 'Partido ganado'),
+        ('correccion', 'Corrección'),
+        ('expiracion', 'Expiración'),
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='movimientos_puntos'
+    )
+    torneo = models.ForeignKey(
+        'torneos.Torneo',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='movimientos_puntos'
+    )
+    # Si el partido se elimina, su reverso queda en el ledger
+    partido = models.ForeignKey(
+        'partidos.Partido',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='movimientos_puntos'
+    )
+
+    puntos = models.IntegerField()
+    motivo = models.CharField(max_length=10, choices=MOTIVO_CHOICES)
+
+    # Fecha en que se ganaron los puntos (la del partido); define cuándo expiran
+    fecha = models.DateField()
+    # Si cuenta en puntos_ventana; se fija al crearlo y no cambia
+    en_ventana = models.BooleanField(default=True)
+    # Movimiento que éste anula (expiración o cambio de fecha del partido)
+    compensa = models.OneToOneField(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='compensacion'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Lo que recorre expirar_puntos: movimientos de la ventana por fecha
+            models.Index(fields=['fecha'], condition=models.Q(en_ventana=True, compensa__isnull=True),
+                         name='mov_puntos_ventana_idx'),
+            # Hasta dónde llegó la última expiración
+            models.Index(fields=['fecha'], condition=models.Q(motivo='expiracion'),
+                         name='mov_puntos_expiracion_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.puntos:+d} ({self.motivo}) - {self.fecha}"
+
+
+class PuntosJugador(models.Model):
+    """
+    Total corrido de puntos por jugador, mantenido a partir de MovimientoPuntos.
+    puntos_ventana sólo cuenta los movimientos dentro de la ventana móvil
+    (ranking.puntos.VENTANA); es lo que ordena el ranking por puntos.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='puntos'
+    )
+    puntos_totales = models.IntegerField(default=0)
+    puntos_ventana = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-puntos_ventana', 'user'], name='puntos_jugador_ventana_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.puntos_ventana} pts"
@@ -0,0 +1,249 @@
+# ranking/puntos.py
+"""
+Ranking por puntos (Torneo.puntos).
+
+Los puntos se acreditan cuando termina cada partido: cada partido con
+resultado acredita los puntos de su torneo a los ganadores en el ledger
+MovimientoPuntos, y el mismo movimiento suma al total corrido de
+PuntosJugador. No se espera al cierre del torneo porque Torneo no tiene un
+evento de cierre (sólo fecha_fin) y así el ranking se mueve con cada
+resultado. Así el ranking por puntos se lee directo de PuntosJugador sin
+sumar partidos ni torneos en cada request.
+
+El ledger sólo crece; ninguna fila se modifica:
+
+- Una corrección de resultado agrega la diferencia (motivo 'correccion').
+- Un cambio de fecha del partido compensa lo acreditado con la fecha vieja
+  (una 'correccion' con `compensa`) y acredita de nuevo con la nueva.
+- puntos_ventana sólo cuenta las últimas VENTANA semanas. expirar() agrega,
+  de forma incremental, un movimiento 'expiracion' que compensa a cada uno
+  de los que van saliendo de la ventana.
+
+Invariante: puntos_totales = suma de los movimientos del jugador salvo las
+expiraciones, y puntos_ventana = suma de sus movimientos con en_ventana=True.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from partidos.models import Partido
+from .models import MovimientoPuntos, PuntosJugador
+
+VENTANA = timedelta(weeks=52)
+
+
+def corte(hoy=None):
+    """Movimientos con fecha anterior a esta ya no cuentan en la ventana."""
+    return (hoy or timezone.localdate()) - VENTANA
+
+
+def acreditar_partido(partido):
+    """
+    Deja el ledger consistente con el resultado actual del partido: los ganadores
+    deben tener Torneo.puntos acreditados por él y nadie más. Sólo agrega la
+    diferencia, así que llamarlo de nuevo sin cambios no escribe nada.
+    """
+    with transaction.atomic():
+        # Bloqueamos el partido para que dos guardados simultáneos no acrediten doble.
+        # Leemos de la BD porque la instancia puede traer fecha como str.
+        fila = (
+            Partido.objects.select_for_update(of=('self',))
+            .filter(pk=partido.pk)
+            .values_list('fecha', 'resultado', 'torneo_id', 'torneo__puntos')
+            .first()
+        )
+        if fila is None:
+            return
+        fecha, resultado, torneo_id, puntos = fila
+
+        objetivo = {}
+        if resultado in ('E1', 'E2') and puntos:
+            ganadores = partido.equipo_1 if resultado == 'E1' else partido.equipo_2
+            objetivo = {user_id: puntos for user_id in ganadores.values_list('id', flat=True)}
+        _ajustar(partido.pk, torneo_id, fecha, objetivo)
+
+
+def acreditar_nuevos(ids, lote=5000):
+    """
+    Acredita de una vez partidos recién cargados en masa (partidos/importacion.py).
+    Mismo resultado que acreditar_partido() uno por uno, pero con consultas por
+    lote; los partidos que ya tengan movimientos se ajustan por la vía normal.
+    """
+    with transaction.atomic():
+        for i in range(0, len(ids), lote):
+            _acreditar_lote(ids[i:i + lote])
+
+
+def _acreditar_lote(ids):
+    con_movimientos = set(
+        MovimientoPuntos.objects.filter(partido_id__in=ids).values_list('partido_id', flat=True)
+    )
+    for partido in Partido.objects.filter(pk__in=con_movimientos):
+        acreditar_partido(partido)
+
+    partidos = {
+        pk: (fecha, resultado, torneo_id, puntos)
+        for pk, fecha, resultado, torneo_id, puntos in Partido.objects.select_for_update(of=('self',))
+        .filter(pk__in=set(ids) - con_movimientos, resultado__in=('E1', 'E2'), torneo__puntos__gt=0)
+        .values_list('pk', 'fecha', 'resultado', 'torneo_id', 'torneo__puntos')
+    }
+    limite = corte()
+    nuevos = []
+    deltas_total = defaultdict(int)
+    deltas_ventana = defaultdict(int)
+    for lado, through in (('E1', Partido.equipo_1.through), ('E2', Partido.equipo_2.through)):
+        for partido_id, user_id in through.objects.filter(partido_id__in=partidos).values_list('partido_id', 'usuario_id'):
+            fecha, resultado, torneo_id, puntos = partidos[partido_id]
+            if resultado != lado:
+                continue
+            en_ventana = fecha >= limite
+            nuevos.append(MovimientoPuntos(
+                user_id=user_id,
+                torneo_id=torneo_id,
+                partido_id=partido_id,
+                puntos=puntos,
+                motivo='partido',
+                fecha=fecha,
+                en_ventana=en_ventana,
+            ))
+            deltas_total[user_id] += puntos
+            if en_ventana:
+                deltas_ventana[user_id] += puntos
+
+    if nuevos:
+        MovimientoPuntos.objects.bulk_create(nuevos, batch_size=5000)
+        _sumar(deltas_total, deltas_ventana)
+
+
+def revertir_partido(partido):
+    """Agrega los reversos de todo lo acreditado por el partido (antes de eliminarlo)."""
+    with transaction.atomic():
+        fila = (
+            Partido.objects.select_for_update(of=('self',))
+            .filter(pk=partido.pk)
+            .values_list('fecha', 'torneo_id')
+            .first()
+        )
+        if fila is not None:
+            _ajustar(partido.pk, fila[1], fila[0], {})
+
+
+def _ajustar(partido_id, torneo_id, fecha, objetivo):
+    """Agrega los movimientos que llevan lo acreditado por el partido a `objetivo` {user_id: puntos}."""
+    movimientos = MovimientoPuntos.objects.filter(partido_id=partido_id)
+    en_ventana = fecha >= corte()
+    deltas_total = defaultdict(int)
+    deltas_ventana = defaultdict(int)
+
+    # Lo vigente con otra fecha (el partido cambió de fecha) se compensa; abajo
+    # se vuelve a acreditar con la fecha nueva, que es la que define cuándo expira
+    compensaciones = [_compensar(m, 'correccion') for m in _sin_compensar(movimientos).exclude(fecha=fecha)]
+    MovimientoPuntos.objects.bulk_create(compensaciones)
+    for m in compensaciones:
+        deltas_total[m.user_id] += m.puntos
+        deltas_ventana[m.user_id] += m.puntos
+
+    totales = defaultdict(int)
+    vigentes = defaultdict(int)
+    for user_id, puntos, motivo, cuenta in movimientos.values_list('user_id', 'puntos', 'motivo', 'en_ventana'):
+        if motivo != 'expiracion':
+            totales[user_id] += puntos
+        if cuenta:
+            vigentes[user_id] += puntos
+
+    nuevos = []
+    for user_id in set(objetivo) | set(totales):
+        delta_total = objetivo.get(user_id, 0) - totales[user_id]
+        # Fuera de la ventana lo vigente que quede lo descuenta expirar()
+        delta_ventana = objetivo.get(user_id, 0) - vigentes[user_id] if en_ventana else 0
+        motivo = 'correccion' if user_id in totales else 'partido'
+        # La parte vigente cuenta en la ventana; el resto sólo en el total
+        for puntos, cuenta in ((delta_ventana, True), (delta_total - delta_ventana, False)):
+            if puntos:
+                nuevos.append(MovimientoPuntos(
+                    user_id=user_id,
+                    torneo_id=torneo_id,
+                    partido_id=partido_id,
+                    puntos=puntos,
+                    motivo=motivo,
+                    fecha=fecha,
+                    en_ventana=cuenta,
+                ))
+        deltas_total[user_id] += delta_total
+        deltas_ventana[user_id] += delta_ventana
+
+    MovimientoPuntos.objects.bulk_create(nuevos)
+    deltas_total = {u: d for u, d in deltas_total.items() if d}
+    deltas_ventana = {u: d for u, d in deltas_ventana.items() if d}
+    if deltas_total or deltas_ventana:
+        _sumar(deltas_total, deltas_ventana)
+
+
+def _sin_compensar(movimientos):
+    """Movimientos que cuentan en la ventana y ni anulan a otro ni fueron anulados."""
+    return movimientos.filter(en_ventana=True, compensa__isnull=True, compensacion__isnull=True)
+
+
+def _compensar(movimiento, motivo):
+    """Movimiento sin guardar que anula en la ventana a `movimiento`."""
+    return MovimientoPuntos(
+        user_id=movimiento.user_id,
+        torneo_id=movimiento.torneo_id,
+        partido_id=movimiento.partido_id,
+        puntos=-movimiento.puntos,
+        motivo=motivo,
+        fecha=movimiento.fecha,
+        en_ventana=True,
+        compensa=movimiento,
+    )
+
+
+def _sumar(deltas_total, deltas_ventana):
+    """Suma deltas {user_id: puntos} a los totales con UPDATE ... SET x = x + n."""
+    usuarios = set(deltas_total) | set(deltas_ventana)
+    PuntosJugador.objects.bulk_create(
+        [PuntosJugador(user_id=user_id) for user_id in usuarios],
+        ignore_conflicts=True,
+    )
+    ahora = timezone.now()
+    for user_id in usuarios:
+        PuntosJugador.objects.filter(user_id=user_id).update(
+            puntos_totales=F('puntos_totales') + deltas_total.get(user_id, 0),
+            puntos_ventana=F('puntos_ventana') + deltas_ventana.get(user_id, 0),
+            updated_at=ahora,
+        )
+
+
+def expirar(hoy=None, batch_size=5000):
+    """
+    Descuenta de puntos_ventana los movimientos que ya salieron de la ventana,
+    agregando por cada uno su compensación 'expiracion'. Trabaja por lotes
+    cortos en orden de fecha y es incremental: un movimiento vigente siempre
+    tiene fecha posterior al corte de la corrida anterior, así que cada corrida
+    arranca en la fecha de la última expiración. Regresa cuántos expiró.
+    """
+    limite = corte(hoy)
+    desde = MovimientoPuntos.objects.filter(motivo='expiracion').aggregate(fecha=Max('fecha'))['fecha']
+    pendientes = _sin_compensar(MovimientoPuntos.objects.filter(fecha__lt=limite))
+    if desde is not None:
+        pendientes = pendientes.filter(fecha__gte=desde)
+    total = 0
+    while True:
+        with transaction.atomic():
+            lote = list(
+                pendientes.select_for_update(skip_locked=True, of=('self',))
+                .order_by('fecha', 'id')[:batch_size]
+            )
+            if not lote:
+                break
+            compensaciones = [_compensar(m, 'expiracion') for m in lote]
+            MovimientoPuntos.objects.bulk_create(compensaciones)
+            por_usuario = defaultdict(int)
+            for m in compensaciones:
+                por_usuario[m.user_id] += m.puntos
+            _sumar({}, {u: d for u, d in por_usuario.items() if d})
+        total += len(lote)
+    return total
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from .models import RankingRecord, PuntosJugador
+
+class RankingRecordSerializer(serializers.ModelSerializer):
+    # Lugares que subió (+) o bajó (-) desde el snapshot anterior
+    movement = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RankingRecord
+        fields = '__all__'
+
+    def get_movement(self, obj):
+        if obj.previous_position is None:
+            return None
+        return obj.previous_position - obj.position
+
+
+class PuntosJugadorSerializer(serializers.ModelSerializer):
+    nombre_completo = serializers.CharField(source='user.nombre_completo', read_only=True)
+
+    class Meta:
+        model = PuntosJugador
+        fields = ['user', 'nombre_completo', 'puntos_ventana', 'puntos_totales', 'updated_at']
@@ -0,0 +1,58 @@
+# ranking/signals.py
+from django.db.models.signals import post_save, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from partidos.models import Partido
+from partidos.signals import partidos_importados
+from . import elo, puntos
+
+
+def resultado_cambiado(partido):
+    # Rating Elo y ledger de puntos se ajustan sólo si algo cambió
+    elo.aplicar_resultado(partido)
+    puntos.acreditar_partido(partido)
+
+
+@receiver(post_save, sender=Partido)
+def partido_guardado(sender, instance, **kwargs):
+    # Al crear el partido los equipos aún están vacíos; en ese caso
+    # el ajuste se aplica cuando llega el m2m_changed del segundo equipo.
+    resultado_cambiado(instance)
+
+
+@receiver(m2m_changed, sender=Partido.equipo_1.through)
+@receiver(m2m_changed, sender=Partido.equipo_2.through)
+def equipos_cambiados(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        resultado_cambiado(instance)
+    elif pk_set:
+        # usuario.equipo_1.add(partido): instance es el Usuario
+        for partido in Partido.objects.filter(pk__in=pk_set):
+            resultado_cambiado(partido)
+
+
+LOTE_IDS = 5000  # ids por consulta pk__in (Postgres acepta a lo más 65535 parámetros)
+
+
+@receiver(partidos_importados)
+def partidos_cargados(sender, ids, **kwargs):
+    # Sólo los que ya traen resultado mueven rating o puntos. El historial se
+    # reproduce desde el más antiguo de la carga (ver ranking/elo.py): cuesta
+    # lo que la carga y los partidos posteriores ya aplicados, no la tabla completa.
+    partidos = []
+    for i in range(0, len(ids), LOTE_IDS):
+        partidos += Partido.objects.filter(pk__in=ids[i:i + LOTE_IDS], resultado__in=elo.RESULTADOS_VALIDOS)
+    if partidos:
+        primero = min(partidos, key=lambda p: (p.fecha, p.hora, p.pk))
+        elo.recalcular_historial(desde=(primero.fecha, primero.hora, primero.pk))
+    puntos.acreditar_nuevos([p.pk for p in partidos])
+
+
+@receiver(pre_delete, sender=Partido)
+def partido_eliminado(sender, instance, **kwargs):
+    # Devolvemos a los jugadores el rating que el partido les movió
+    # y dejamos el reverso de sus puntos en el ledger
+    elo.revertir_resultado(instance)
+    puntos.revertir_partido(instance)
@@ -0,0 +1,435 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from partidos import importacion
+from partidos.models import Partido
+from torneos.models import Tag, Torneo
+from usuarios.models import Usuario
+from . import cache as ranking_cache, elo, puntos
+from .models import CambioRating, MovimientoPuntos, PuntosJugador, RankingRecord, RankingRollup
+
+
+class RankingDePrueba(TestCase):
+    """Ocho jugadores y un torneo; jugar() registra un partido por la vía normal (con signals)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Sin partidos el orden es por rating_inicial: el 7 va primero y el 0 último
+        cls.jugadores = Usuario.objects.bulk_create([
+            Usuario(email=f"r{i}@test.com", nombre_completo=f"R {i}", rating_inicial=1000 + 25 * i)
+            for i in range(8)
+        ])
+        cls.torneo = Torneo.objects.create(
+            nombre="Torneo", sede="Sede", fecha_inicio=datetime.date(2025, 1, 1),
+            fecha_fin=datetime.date(2025, 1, 31), imagen_url="https://example.com/t.png",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        # La LRU de páginas es del proceso: no debe pasar de una prueba a otra
+        cache.clear()
+        ranking_cache._paginas.clear()
+        ranking_cache._versiones.clear()
+        ranking_cache._resueltas.clear()
+
+    def generar(self, fecha, *args):
+        call_command('generate_daily_ranking', f'--date={fecha}', '--workers=1', *args, stdout=StringIO())
+
+    def snapshot(self, fecha, categoria=''):
+        return list(
+            RankingRecord.objects.filter(date=fecha, category=categoria).order_by('position')
+            .values_list('user_id', 'position', 'rating_snapshot', 'previous_position', 'rating_delta')
+        )
+
+    def crear_snapshots(self, desde, dias):
+        """Un snapshot por día en que el jugador 0 sube un lugar cada día (hasta el 1)."""
+        registros = []
+        for d in range(dias):
+            fecha = desde + datetime.timedelta(days=d)
+            orden = list(reversed(self.jugadores))
+            primero = orden.pop(-1)
+            orden.insert(max(0, 7 - d), primero)
+            registros += [
+                RankingRecord(user=u, date=fecha, position=p, rating_snapshot=Decimal(1000 + 10 * (8 - p)))
+                for p, u in enumerate(orden, start=1)
+            ]
+        RankingRecord.objects.bulk_create(registros)
+
+    def jugar(self, equipo_1, equipo_2, resultado, dia, hora=10, fecha=None):
+        partido = Partido.objects.create(
+            torneo=self.torneo, fecha=fecha or datetime.date(2025, 1, dia), hora=datetime.time(hora),
+        )
+        partido.equipo_1.set([self.jugadores[i] for i in equipo_1])
+        partido.equipo_2.set([self.jugadores[i] for i in equipo_2])
+        partido.resultado = resultado
+        partido.save()
+        return partido
+
+    def fila(self, equipo_1, equipo_2, resultado, dia):
+        return {
+            'torneo': self.torneo.id, 'fecha': f'2025-01-{dia:02d}', 'hora': '10:00', 'resultado': resultado,
+            'equipo_1_ids': [str(self.jugadores[i].id) for i in equipo_1],
+            'equipo_2_ids': [str(self.jugadores[i].id) for i in equipo_2],
+        }
+
+    def estado(self):
+        """Ratings y cambios guardados, para comparar contra una reconstrucción completa."""
+        return (
+            dict(Usuario.objects.values_list('id', 'rating')),
+            sorted(CambioRating.objects.values_list('partido_id', 'user_id', 'rating_antes', 'rating_despues')),
+        )
+
+    def assertIgualAlHistorial(self):
+        antes = self.estado()
+        elo.recalcular_historial()
+        self.assertEqual(antes, self.estado())
+
+
+class EloTest(RankingDePrueba):
+    """El orden que manda es (fecha, hora, id) del partido, no el orden en que se registró."""
+
+    def test_incremental_igual_al_historial(self):
+        for dia, (e1, e2, resultado) in enumerate([
+            ([0, 1], [2, 3], 'E1'), ([0, 2], [1, 3], 'E2'), ([4, 5], [6, 7], 'E1'),
+            ([0, 4], [1, 5], 'E2'), ([2, 6], [3, 7], 'E1'), ([0, 1], [6, 7], 'E2'),
+        ], start=1):
+            self.jugar(e1, e2, resultado, dia)
+        self.assertIgualAlHistorial()
+
+    def test_partido_atrasado_reproduce_desde_su_fecha(self):
+        self.jugar([0, 1], [2, 3], 'E1', 5)
+        self.jugar([0, 2], [1, 3], 'E2', 6)
+        atrasado = self.jugar([0, 3], [1, 2], 'E1', 2)  # Se registra después pero se jugó antes
+        self.assertIgualAlHistorial()
+
+        atrasado.resultado = 'E2'  # Corrección de un partido con posteriores
+        atrasado.save()
+        self.assertIgualAlHistorial()
+        atrasado.delete()
+        self.assertIgualAlHistorial()
+
+    def test_importacion_fuera_de_orden(self):
+        self.jugar([0, 1], [2, 3], 'E1', 10)
+        filas = [self.fila([0, 2], [1, 3], 'E2', 12), self.fila([0, 1], [4, 5], 'E1', 3)]
+        creados, errores = importacion.importar(filas)
+        self.assertEqual((len(creados), errores), (2, []))
+        self.assertIgualAlHistorial()
+
+
+class GenerarRankingTest(RankingDePrueba):
+    """generate_daily_ranking: reemplaza el snapshot de la fecha y calcula el movimiento contra el anterior."""
+
+    def test_repetir_no_cambia_nada(self):
+        self.generar('2025-02-01')
+        primero = self.snapshot(datetime.date(2025, 2, 1))
+        self.assertEqual([fila[0] for fila in primero], [u.id for u in reversed(self.jugadores)])
+        self.generar('2025-02-01')
+        self.assertEqual(self.snapshot(datetime.date(2025, 2, 1)), primero)
+        self.assertEqual(RankingRecord.objects.count(), 8)
+
+    def test_movimiento_contra_el_snapshot_anterior(self):
+        self.generar('2025-02-01')
+        Usuario.objects.filter(pk=self.jugadores[0].pk).update(rating=Decimal('1500.00'))
+        self.generar('2025-02-02')
+        registros = {fila[0]: fila for fila in self.snapshot(datetime.date(2025, 2, 2))}
+        self.assertEqual(registros[self.jugadores[0].id][1:], (1, Decimal('1500.00'), 8, Decimal('500.00')))
+        self.assertEqual(registros[self.jugadores[7].id][1:], (2, Decimal('1175.00'), 1, Decimal('0.00')))
+
+        response = self.client.get('/api/ranking/records/', {'date': '2025-02-02'})
+        self.assertEqual([r['movement'] for r in response.data['results'][:2]], [7, -1])
+
+    def test_categorias(self):
+        Usuario.objects.filter(pk__in=[u.pk for u in self.jugadores[:3]]).update(club="Norte")
+        self.torneo.tags.add(Tag.objects.create(nombre="Open"))
+        self.jugar([0, 1], [2, 3], '', 1)  # Sin resultado: cuenta para el tag, no mueve rating
+        Tag.objects.create(nombre="Veteranos")
+
+        self.generar('2025-02-01', '--categorias')
+        self.assertEqual(
+            set(RankingRecord.objects.values_list('category', flat=True)),
+            {'', 'tag:Open', 'club:Norte'},
+        )
+        self.assertEqual(
+            [fila[:2] for fila in self.snapshot(datetime.date(2025, 2, 1), 'tag:Open')],
+            [(self.jugadores[i].id, posicion) for posicion, i in enumerate([3, 2, 1, 0], start=1)],
+        )
+        self.assertEqual([fila[1] for fila in self.snapshot(datetime.date(2025, 2, 1), 'club:Norte')], [1, 2, 3])
+        self.assertEqual(self.snapshot(datetime.date(2025, 2, 1), 'tag:Veteranos'), [])
+
+
+class CacheRankingTest(RankingDePrueba):
+    """Páginas del leaderboard en dos niveles (LRU del proceso y caché compartida) con versión por fecha."""
+
+    def test_dos_niveles_e_invalidacion(self):
+        fecha = datetime.date(2025, 2, 1)
+        self.generar('2025-02-01')  # También precalienta la caché compartida
+        with self.assertNumQueries(0):
+            pagina = ranking_cache.obtener_pagina(fecha, 1)
+        self.assertEqual(pagina['count'], 8)
+        self.assertIsNone(ranking_cache.obtener_pagina(fecha, 2))
+
+        # Sin la caché compartida la LRU local sigue sirviendo la página
+        cache.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(ranking_cache.obtener_pagina(fecha, 1), pagina)
+
+        # Editar un registro invalida todas las páginas de su fecha, en ambos niveles
+        registro = RankingRecord.objects.get(date=fecha, position=1)
+        response = self.client.patch(f'/api/ranking/records/{registro.pk}/', {'rating_snapshot': '999.00'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ranking_cache.obtener_pagina(fecha, 1)['results'][0]['rating_snapshot'], '999.00')
+
+    def test_otro_proceso_ve_la_version_nueva(self):
+        fecha = datetime.date(2025, 2, 1)
+        self.generar('2025-02-01')
+        ranking_cache.obtener_pagina(fecha, 1)
+        RankingRecord.objects.filter(date=fecha, position=1).update(rating_snapshot=Decimal('1.00'))
+        cache.incr(ranking_cache._version_key(fecha))  # Lo que hace invalidar() en otro proceso
+        ranking_cache._versiones.clear()  # Pasó VERSION_TTL
+        self.assertEqual(ranking_cache.obtener_pagina(fecha, 1)['results'][0]['rating_snapshot'], '1.00')
+
+    def test_dia_compactado_se_invalida_con_su_cierre(self):
+        mes = (timezone.localdate() - datetime.timedelta(days=400)).replace(day=1)
+        self.crear_snapshots(mes, 10)
+        call_command('compact_ranking', stdout=StringIO())
+        dia, cierre = mes + datetime.timedelta(days=2), mes + datetime.timedelta(days=9)
+        self.assertEqual(ranking_cache.obtener_pagina(dia, 1)['date'], str(cierre))
+        with self.assertNumQueries(0):
+            ranking_cache.obtener_pagina(dia, 1)
+
+        # Editar el snapshot de cierre invalida también las páginas pedidas por los días del mes
+        registro = RankingRecord.objects.get(date=cierre, position=1)
+        response = self.client.patch(f'/api/ranking/records/{registro.pk}/', {'rating_snapshot': '999.00'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ranking_cache.obtener_pagina(dia, 1)['results'][0]['rating_snapshot'], '999.00')
+
+
+class HistorialRankingTest(RankingDePrueba):
+    """GET /api/ranking/records/history/: trayectoria del jugador por día, semana o mes."""
+
+    def test_history_por_semana_y_mes(self):
+        self.crear_snapshots(datetime.date(2025, 3, 3), 10)  # Lunes 3 al miércoles 12
+        params = {'user': str(self.jugadores[0].id)}
+        dias = self.client.get('/api/ranking/records/history/', params).data['results']
+        self.assertEqual([d['position'] for d in dias], [8, 7, 6, 5, 4, 3, 2, 1, 1, 1])
+
+        semanas = self.client.get('/api/ranking/records/history/', {**params, 'bucket': 'week'}).data['results']
+        self.assertEqual(
+            [(s['date'][:10], s['best_position'], s['worst_position'], s['samples']) for s in semanas],
+            [('2025-03-03', 2, 8, 7), ('2025-03-10', 1, 1, 3)],
+        )
+        meses = self.client.get('/api/ranking/records/history/', {**params, 'bucket': 'month', 'end': '2025-03-05'}).data
+        self.assertEqual([(m['samples'], m['position']) for m in meses['results']], [(3, 7)])
+        self.assertEqual(self.client.get('/api/ranking/records/history/', {**params, 'bucket': 'year'}).status_code, 400)
+
+
+class CompactarRankingTest(RankingDePrueba):
+    """compact_ranking: los meses viejos quedan en su snapshot de cierre más un RankingRollup por jugador."""
+
+    def test_compact_ranking(self):
+        mes = (timezone.localdate() - datetime.timedelta(days=400)).replace(day=1)
+        self.crear_snapshots(mes, 10)
+        call_command('compact_ranking', stdout=StringIO())
+
+        cierre = mes + datetime.timedelta(days=9)
+        self.assertEqual(set(RankingRecord.objects.values_list('date', flat=True)), {cierre})
+        rollup = RankingRollup.objects.get(user=self.jugadores[0])
+        self.assertEqual(
+            (rollup.month, rollup.closing_date, rollup.best_position, rollup.worst_position, rollup.samples),
+            (mes, cierre, 1, 8, 10),
+        )
+        self.assertEqual(rollup.position_avg, Decimal('3.80'))
+        call_command('compact_ranking', stdout=StringIO())  # Repetirlo no duplica
+        self.assertEqual(RankingRollup.objects.count(), 8)
+
+        # Un día compactado se sirve con el snapshot de cierre del mes
+        response = self.client.get('/api/ranking/records/', {'date': str(mes + datetime.timedelta(days=2))})
+        self.assertEqual((response.data['date'], response.data['count']), (str(cierre), 8))
+        params = {'user': str(self.jugadores[0].id), 'bucket': 'month'}
+        meses = self.client.get('/api/ranking/records/history/', params).data
+        self.assertEqual([(m['date'], m['samples'], m['worst_position']) for m in meses['results']], [(str(mes), 10, 8)])
+
+    def crear_categoria(self, categoria, desde, dias, jugadores=(0, 1, 2)):
+        RankingRecord.objects.bulk_create([
+            RankingRecord(
+                user=self.jugadores[i], date=desde + datetime.timedelta(days=d), category=categoria,
+                position=p, rating_snapshot=Decimal(1000),
+            )
+            for d in range(dias) for p, i in enumerate(jugadores, start=1)
+        ])
+
+    def test_cierre_por_categoria(self):
+        mes = (timezone.localdate() - datetime.timedelta(days=400)).replace(day=1)
+        self.crear_snapshots(mes, 10)
+        self.crear_categoria('club:Norte', mes, 5)  # Su último snapshot del mes es anterior al global
+        call_command('compact_ranking', stdout=StringIO())
+
+        cierre_club = mes + datetime.timedelta(days=4)
+        self.assertEqual(
+            set(RankingRecord.objects.values_list('category', 'date').distinct()),
+            {('', mes + datetime.timedelta(days=9)), ('club:Norte', cierre_club)},
+        )
+        rollups = RankingRollup.objects.filter(category='club:Norte')
+        self.assertEqual(set(rollups.values_list('closing_date', 'samples')), {(cierre_club, 5)})
+
+        # Un día compactado del club se sirve con el cierre del club, no con el del global
+        dia = mes + datetime.timedelta(days=7)
+        self.assertEqual(RankingRecord.resolve_date(dia, 'club:Norte'), cierre_club)
+        response = self.client.get('/api/ranking/records/', {'date': str(dia), 'category': 'club:Norte'})
+        self.assertEqual((response.data['date'], response.data['count']), (str(cierre_club), 3))
+
+    def test_categoria_nueva_en_mes_compactado(self):
+        mes = (timezone.localdate() - datetime.timedelta(days=400)).replace(day=1)
+        self.crear_snapshots(mes, 10)
+        call_command('compact_ranking', stdout=StringIO())
+
+        # Snapshots del club generados después de compactar el mes: se resumen antes de borrarse
+        self.crear_categoria('club:Norte', mes, 3)
+        call_command('compact_ranking', stdout=StringIO())
+        self.assertEqual(RankingRollup.objects.filter(category='').count(), 8)
+        self.assertEqual(
+            sorted(RankingRollup.objects.filter(category='club:Norte').values_list('user_id', 'samples')),
+            sorted((self.jugadores[i].id, 3) for i in range(3)),
+        )
+        self.assertEqual(RankingRecord.objects.filter(category='club:Norte').count(), 3)
+
+
+class AroundRankingTest(RankingDePrueba):
+    """GET /api/ranking/records/around/: la posición del jugador y `radius` lugares arriba y abajo."""
+
+    def test_around(self):
+        self.crear_snapshots(datetime.date(2025, 3, 3), 1)
+        response = self.client.get('/api/ranking/records/around/', {
+            'user': str(self.jugadores[3].id), 'radius': 1, 'date': '2025-03-03',
+        })
+        self.assertEqual(response.data['position'], 5)
+        self.assertEqual([r['position'] for r in response.data['results']], [4, 5, 6])
+        response = self.client.get('/api/ranking/records/around/', {
+            'user': str(self.jugadores[7].id), 'radius': 500, 'date': '2025-03-03',
+        })
+        self.assertEqual((response.data['radius'], len(response.data['results'])), (50, 8))
+        self.assertEqual(self.client.get('/api/ranking/records/around/', {'user': 'x'}).status_code, 400)
+
+
+class PuntosPaginacionTest(RankingDePrueba):
+    """GET /api/ranking/points/: cursores por llave (puntos_ventana desc, user) sin saltos ni repetidos."""
+
+    def test_cursores(self):
+        PuntosJugador.objects.bulk_create([
+            PuntosJugador(user=u, puntos_ventana=[30, 10, 30, 20, 0, 10, 30, 5][i], puntos_totales=40)
+            for i, u in enumerate(self.jugadores)
+        ])
+        esperado = [
+            str(p.user_id) for p in PuntosJugador.objects.filter(puntos_ventana__gt=0).order_by('-puntos_ventana', 'user_id')
+        ]
+        vistos, paginas = [], []
+        url = '/api/ranking/points/?page_size=2'
+        while url:
+            data = self.client.get(url).data
+            paginas.append(data)
+            vistos += [str(r['user']) for r in data['results']]
+            url = data['next']
+        self.assertEqual(vistos, esperado)
+        self.assertEqual(len(paginas), 4)
+
+        # previous regresa exactamente la página anterior
+        anterior = self.client.get(paginas[2]['previous']).data
+        self.assertEqual(anterior['results'], paginas[1]['results'])
+        self.assertEqual(self.client.get('/api/ranking/points/', {'cursor': 'basura'}).status_code, 404)
+
+
+class LedgerPuntosTest(RankingDePrueba):
+    """Ledger MovimientoPuntos: sólo se agregan filas y PuntosJugador es su suma."""
+
+    def setUp(self):
+        super().setUp()
+        Torneo.objects.filter(pk=self.torneo.pk).update(puntos=100)
+        self.hoy = timezone.localdate()
+
+    def assertTotalesDelLedger(self):
+        for total in PuntosJugador.objects.all():
+            movimientos = MovimientoPuntos.objects.filter(user_id=total.user_id)
+            self.assertEqual(
+                total.puntos_totales,
+                sum(movimientos.exclude(motivo='expiracion').values_list('puntos', flat=True)),
+            )
+            self.assertEqual(
+                total.puntos_ventana,
+                sum(movimientos.filter(en_ventana=True).values_list('puntos', flat=True)),
+            )
+
+    def ledger(self):
+        return list(MovimientoPuntos.objects.order_by('id').values_list(
+            'id', 'user_id', 'puntos', 'motivo', 'fecha', 'en_ventana', 'compensa_id',
+        ))
+
+    def puntos_de(self, *indices):
+        totales = dict(PuntosJugador.objects.values_list('user_id', 'puntos_ventana'))
+        return [totales.get(self.jugadores[i].id, 0) for i in indices]
+
+    def test_correccion_y_expiracion(self):
+        partido = self.jugar([0, 1], [2, 3], 'E1', None, fecha=self.hoy)
+        self.assertEqual(self.puntos_de(0, 1, 2, 3), [100, 100, 0, 0])
+
+        partido.resultado = 'E2'
+        partido.save()
+        self.assertEqual(self.puntos_de(0, 1, 2, 3), [0, 0, 100, 100])
+        self.assertEqual(MovimientoPuntos.objects.filter(motivo='correccion', puntos=-100).count(), 2)
+        self.assertTotalesDelLedger()
+
+        # Expirar sólo agrega compensaciones: las filas que ya estaban no cambian
+        antes = self.ledger()
+        vence = self.hoy + puntos.VENTANA + datetime.timedelta(days=1)
+        self.assertEqual(puntos.expirar(hoy=vence), 6)
+        self.assertEqual(self.ledger()[:len(antes)], antes)
+        self.assertEqual(MovimientoPuntos.objects.filter(motivo='expiracion').count(), 6)
+        self.assertEqual(puntos.expirar(hoy=vence), 0)
+        self.assertEqual(self.puntos_de(2, 3), [0, 0])
+        self.assertEqual(PuntosJugador.objects.get(user=self.jugadores[2]).puntos_totales, 100)
+        self.assertTotalesDelLedger()
+
+    def test_cambio_de_fecha(self):
+        partido = self.jugar([0, 1], [2, 3], 'E1', None, fecha=self.hoy - datetime.timedelta(days=300))
+        antes = self.ledger()
+        partido.fecha = self.hoy
+        partido.save()
+        self.assertEqual(self.ledger()[:len(antes)], antes)
+        self.assertEqual(self.puntos_de(0, 1), [100, 100])
+        self.assertEqual(PuntosJugador.objects.get(user=self.jugadores[0]).puntos_totales, 100)
+        self.assertTotalesDelLedger()
+
+        # Lo acreditado con la fecha vieja ya está compensado: al vencer la vieja no se descuenta nada
+        self.assertEqual(puntos.expirar(hoy=self.hoy + datetime.timedelta(days=100)), 0)
+        self.assertEqual(self.puntos_de(0, 1), [100, 100])
+
+        # A una fecha fuera de la ventana: cuenta en el total, no en la ventana
+        partido.fecha = self.hoy - puntos.VENTANA - datetime.timedelta(days=10)
+        partido.save()
+        self.assertEqual(self.puntos_de(0, 1), [0, 0])
+        self.assertEqual(PuntosJugador.objects.get(user=self.jugadores[0]).puntos_totales, 100)
+        self.assertTotalesDelLedger()
+
+    def test_expiracion_incremental(self):
+        for dias, equipos in ((400, ([0, 1], [2, 3])), (380, ([4, 5], [6, 7])), (10, ([0, 2], [1, 3]))):
+            self.jugar(*equipos, 'E1', None, fecha=self.hoy - datetime.timedelta(days=dias))
+        # Los dos primeros se acreditaron ya fuera de la ventana; nada que expirar
+        self.assertEqual(puntos.expirar(), 0)
+        self.assertEqual(self.puntos_de(0, 2, 4), [100, 100, 0])
+
+        self.assertEqual(puntos.expirar(hoy=self.hoy + datetime.timedelta(days=360)), 2)
+        # La siguiente corrida sólo recorre desde la fecha de la última expiración
+        desde = self.hoy - datetime.timedelta(days=10)
+        with CaptureQueriesContext(connection) as consultas:
+            self.assertEqual(puntos.expirar(hoy=self.hoy + datetime.timedelta(days=360)), 0)
+        self.assertIn(f"\"fecha\" >= '{desde}'", consultas[-2]['sql'])
+        self.assertEqual(self.puntos_de(0, 2, 4), [0, 0, 0])
+        self.assertTotalesDelLedger()
@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import RankingRecordViewSet, PuntosJugadorViewSet
+
+router = DefaultRouter()
+router.register(r'records', RankingRecordViewSet, basename='rankingrecord')
+router.register(r'points', PuntosJugadorViewSet, basename='puntosjugador')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
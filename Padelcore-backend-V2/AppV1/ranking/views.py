@@ -0,0 +1,241 @@
+# ranking/views.py
+import datetime
+import uuid
+
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from AppV1.pagination import KeysetPagination
+from .models import RankingRecord, RankingRollup, PuntosJugador
+from .serializers import RankingRecordSerializer, PuntosJugadorSerializer
+from . import cache as ranking_cache
+
+MAX_RADIUS = 50  # Jugadores arriba/abajo que se pueden pedir en "around"
+
+BUCKETS = {
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+class RankingRecordViewSet(viewsets.ModelViewSet):
+    queryset = RankingRecord.objects.all()
+    serializer_class = RankingRecordSerializer
+
+    def _parse_fecha(self, param, default=None):
+        valor = self.request.query_params.get(param)
+        if not valor:
+            return default
+        try:
+            return datetime.date.fromisoformat(valor)
+        except ValueError:
+            raise ValidationError({param: "Formato inválido, usa YYYY-MM-DD."})
+
+    def get_fecha(self):
+        return self._parse_fecha('date', timezone.localdate())
+
+    def get_categoria(self):
+        # '' es el ranking global; 'tag:<nombre>' o 'club:<nombre>' (generate_daily_ranking --categorias)
+        return self.request.query_params.get('category', '')
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'list':
+            qs = qs.filter(date=self.get_fecha(), category=self.get_categoria())
+        return qs.order_by('position')
+
+    def list(self, request, *args, **kwargs):
+        """
+        GET /api/ranking/records/?date=YYYY-MM-DD&page=N&category=tag:<nombre>
+        Sirve la página desde la caché del leaderboard (ranking/cache.py).
+        """
+        fecha = self.get_fecha()
+        try:
+            page = int(request.query_params.get('page', 1))
+        except ValueError:
+            page = 0
+        if page < 1:
+            raise NotFound("Página inválida.")
+
+        data = ranking_cache.obtener_pagina(fecha, page, self.get_categoria())
+        if data is None:
+            raise NotFound("Página inválida.")
+
+        url = request.build_absolute_uri()
+        return Response({
+            **data,
+            "next": replace_query_param(url, 'page', page + 1) if page < data["num_pages"] else None,
+            "previous": replace_query_param(url, 'page', page - 1) if page > 1 else None,
+        }, status=status.HTTP_200_OK)
+
+    def _parse_user(self):
+        try:
+            return uuid.UUID(self.request.query_params.get('user', ''))
+        except ValueError:
+            raise ValidationError({"user": "Se requiere el id (UUID) del jugador."})
+
+    @action(detail=False, methods=['get'])
+    def around(self, request):
+        """
+        GET /api/ranking/records/around/?user=<id>&radius=10&date=YYYY-MM-DD&category=
+        La posición del jugador más los `radius` jugadores arriba y abajo.
+        Son dos búsquedas por índice: (user, date) para su posición y un
+        rango sobre (date, category, position) para la ventana, sin importar el tamaño del ranking.
+        """
+        user_id = self._parse_user()
+        categoria = self.get_categoria()
+        try:
+            radius = int(request.query_params.get('radius', 10))
+        except ValueError:
+            raise ValidationError({"radius": "Debe ser un número entero."})
+        radius = max(0, min(radius, MAX_RADIUS))
+
+        fecha = RankingRecord.resolve_date(self.get_fecha(), categoria)
+        position = (
+            RankingRecord.objects.filter(user_id=user_id, date=fecha, category=categoria)
+            .values_list('position', flat=True)
+            .first()
+        )
+        if position is None:
+            raise NotFound("El jugador no aparece en el ranking de esa fecha.")
+
+        registros = RankingRecord.objects.filter(
+            date=fecha,
+            category=categoria,
+            position__gte=position - radius,
+            position__lte=position + radius,
+        ).order_by('position')
+
+        return Response({
+            "date": str(fecha),
+            "category": categoria,
+            "user": str(user_id),
+            "position": position,
+            "radius": radius,
+            "results": RankingRecordSerializer(registros, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def history(self, request):
+        """
+        GET /api/ranking/records/history/?user=<id>&start=YYYY-MM-DD&end=YYYY-MM-DD&bucket=day|week|month&category=
+        Trayectoria de un jugador: rating y posición por fecha. Con bucket=week|month
+        se agrega dentro de la BD (promedios y mejor/peor posición por periodo).
+        Usa el índice único (user, date, category).
+
+        Los meses compactados (compact_ranking) sólo conservan su snapshot de
+        cierre; con bucket=month sus estadísticas salen de RankingRollup.
+        """
+        user_id = self._parse_user()
+        bucket = request.query_params.get('bucket', 'day')
+        if bucket != 'day' and bucket not in BUCKETS:
+            raise ValidationError({"bucket": "Usa day, week o month."})
+
+        categoria = self.get_categoria()
+        qs = RankingRecord.objects.filter(user_id=user_id, category=categoria)
+        start = self._parse_fecha('start')
+        end = self._parse_fecha('end')
+        if start:
+            qs = qs.filter(date__gte=start)
+        if end:
+            qs = qs.filter(date__lte=end)
+
+        if bucket == 'day':
+            puntos = [
+                {
+                    "date": str(fecha),
+                    "rating": str(rating),
+                    "position": position,
+                }
+                for fecha, rating, position in qs.order_by('date').values_list(
+                    'date', 'rating_snapshot', 'position'
+                )
+            ]
+        else:
+            filas = (
+                qs.annotate(periodo=BUCKETS[bucket]('date'))
+                .values('periodo')
+                .annotate(
+                    rating_promedio=Avg('rating_snapshot'),
+                    posicion_promedio=Avg('position'),
+                    best_position=Min('position'),
+                    worst_position=Max('position'),
+                    samples=Count('id'),
+                )
+                .order_by('periodo')
+            )
+            puntos = [
+                {
+                    "date": str(fila['periodo']),
+                    "rating": f"{fila['rating_promedio']:.2f}",
+                    "position": round(fila['posicion_promedio']),
+                    "best_position": fila['best_position'],
+                    "worst_position": fila['worst_position'],
+                    "samples": fila['samples'],
+                }
+                for fila in filas
+            ]
+            if bucket == 'month':
+                puntos = self._con_rollups(user_id, categoria, start, end, puntos)
+
+        return Response({
+            "user": str(user_id),
+            "bucket": bucket,
+            "results": puntos,
+        }, status=status.HTTP_200_OK)
+
+    def _con_rollups(self, user_id, categoria, start, end, puntos):
+        """Reemplaza los meses compactados por su resumen de RankingRollup."""
+        rollups = RankingRollup.objects.filter(user_id=user_id, category=categoria)
+        if start:
+            rollups = rollups.filter(month__gte=start.replace(day=1))
+        if end:
+            rollups = rollups.filter(month__lte=end)
+        por_mes = {p["date"]: p for p in puntos}
+        for r in rollups:
+            por_mes[str(r.month)] = {
+                "date": str(r.month),
+                "rating": str(r.rating_avg),
+                "position": round(r.position_avg),
+                "best_position": r.best_position,
+                "worst_position": r.worst_position,
+                "samples": r.samples,
+            }
+        return [por_mes[k] for k in sorted(por_mes)]
+
+    # Cualquier cambio manual a un registro invalida las páginas de su fecha
+    def perform_create(self, serializer):
+        instance = serializer.save()
+        ranking_cache.invalidar(instance.date)
+
+    def perform_update(self, serializer):
+        fecha_anterior = serializer.instance.date
+        instance = serializer.save()
+        ranking_cache.invalidar(fecha_anterior)
+        if instance.date != fecha_anterior:
+            ranking_cache.invalidar(instance.date)
+
+    def perform_destroy(self, instance):
+        fecha = instance.date
+        instance.delete()
+        ranking_cache.invalidar(fecha)
+
+
+
+class PuntosPagination(KeysetPagination):
+    ordering = ('-puntos_ventana', 'user_id')  # Índice puntos_jugador_ventana_idx
+
+
+class PuntosJugadorViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    GET /api/ranking/points/
+    Ranking por puntos de las últimas 52 semanas, leído de los totales
+    que mantiene ranking/puntos.py (no suma partidos en cada request).
+    """
+    queryset = PuntosJugador.objects.filter(puntos_ventana__gt=0).select_related('user')
+    serializer_class = PuntosJugadorSerializer
+    pagination_class = PuntosPagination
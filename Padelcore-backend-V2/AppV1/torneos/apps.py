@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TorneosConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'torneos'
+
+    def ready(self):
+        # Conecta el signal que marca el torneo como modificado al cambiar sus tags
+        from . import signals  # noqa: F401
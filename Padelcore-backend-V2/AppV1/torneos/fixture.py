@@ -0,0 +1,162 @@
+# torneos/fixture.py
+"""
+Generador de fixtures: arma los cruces de un torneo y les asigna día, hora
+y cancha.
+
+- round_robin(): todos contra todos por el método del círculo; cada ronda
+  son cruces sin parejas repetidas.
+- eliminatoria(): primera ronda de un cuadro con siembra clásica (1 vs N,
+  2 vs N-1...); si las parejas no son potencia de 2 los mejores pasan con bye.
+- programar(): asignación voraz de los cruces, en orden, al primer turno
+  libre en que los 4 jugadores estén disponibles (terminaron su partido
+  anterior y descansaron). Los turnos llenos se saltan con un union-find
+  ("siguiente turno con cancha libre"), así cada cruce cuesta casi O(1) y
+  500 parejas (124,750 partidos) se programan en segundos.
+
+Todo es Python puro sin BD; torneos/programacion.py lee y escribe.
+"""
+import datetime
+from bisect import bisect_left
+
+FORMATOS = ('round_robin', 'eliminatoria')
+HORARIOS_DEFAULT = [(datetime.time(9), datetime.time(21))]
+
+
+class FixtureError(Exception):
+    """El fixture no cabe en los turnos disponibles."""
+
+
+def round_robin(n):
+    """Lista de rondas; cada ronda es una lista de cruces (i, j) entre índices de pareja."""
+    indices = list(range(n))
+    if n % 2:
+        indices.append(None)  # Descansa quien toque contra None
+    total = len(indices)
+    rondas = []
+    for _ in range(total - 1):
+        ronda = []
+        for k in range(total // 2):
+            a, b = indices[k], indices[total - 1 - k]
+            if a is not None and b is not None:
+                ronda.append((a, b))
+        rondas.append(ronda)
+        # Rotamos todos menos el primero
+        indices = [indices[0], indices[-1], *indices[1:-1]]
+    return rondas
+
+
+def _siembra(tamano):
+    """Orden de siembras en el cuadro: [1, 16, 8, 9, 4, 13, ...] para 16."""
+    orden = [1]
+    while len(orden) < tamano:
+        suma = len(orden) * 2 + 1
+        orden = [s for semilla in orden for s in (semilla, suma - semilla)]
+    return orden
+
+
+def eliminatoria(n):
+    """
+    Primera ronda del cuadro para n parejas ordenadas por siembra (índice 0 = la mejor).
+    Regresa (cruces, byes): los byes pasan directo a la segunda ronda.
+    """
+    tamano = 1
+    while tamano < n:
+        tamano *= 2
+    orden = _siembra(tamano)
+    cruces, byes = [], []
+    for k in range(0, tamano, 2):
+        a, b = orden[k] - 1, orden[k + 1] - 1
+        if b >= n:
+            byes.append(a)
+        else:
+            cruces.append((a, b))
+    return cruces, byes
+
+
+def turnos(fecha_inicio, fecha_fin, horarios, duracion):
+    """
+    Inicios de turno (datetime) en orden: cada día del torneo, dentro de cada
+    horario (inicio, fin), cada `duracion` minutos mientras el partido quepa.
+    """
+    paso = datetime.timedelta(minutes=duracion)
+    inicios = []
+    dia = fecha_inicio
+    while dia <= fecha_fin:
+        for inicio, fin in sorted(horarios):
+            t = datetime.datetime.combine(dia, inicio)
+            limite = datetime.datetime.combine(dia, fin)
+            while t + paso <= limite:
+                inicios.append(t)
+                t += paso
+        dia += datetime.timedelta(days=1)
+    return sorted(set(inicios))
+
+
+def programar(cruces, parejas, inicios, canchas, duracion, descanso, ocupados=None):
+    """
+    Asigna cada cruce (i, j) de `cruces`, en orden, a (turno, cancha).
+
+    parejas: lista de tuplas de jugadores (ids); inicios: salida de turnos();
+    ocupados: {jugador: [(datetime, minutos), ...]} inicio y duración de los
+    partidos que ya tienen fuera de este fixture (también se respeta el
+    descanso con ellos).
+
+    Regresa una lista de (i, j, inicio, cancha) en el orden de `cruces`.
+    Lanza FixtureError si no alcanzan los turnos.
+    """
+    total = len(inicios)
+    separacion = datetime.timedelta(minutes=duracion + descanso)
+
+    # proximo[t]: primer turno en que puede volver a jugar quien jugó en t
+    proximo = []
+    k = 0
+    for t in range(total):
+        while k < total and inicios[k] < inicios[t] + separacion:
+            k += 1
+        proximo.append(k)
+
+    # Turnos bloqueados por partidos previos de cada jugador
+    bloqueados = {}
+    for jugador, partidos in (ocupados or {}).items():
+        turnos_jugador = set()
+        for inicio, minutos in partidos:
+            # Chocan los turnos que empiezan antes de que termine (más descanso)
+            # y terminan (más descanso) después de que empiece
+            hasta = inicio + datetime.timedelta(minutes=minutos + descanso)
+            t = bisect_left(inicios, inicio - separacion + datetime.timedelta(microseconds=1))
+            while t < total and inicios[t] < hasta:
+                turnos_jugador.add(t)
+                t += 1
+        if turnos_jugador:
+            bloqueados[jugador] = turnos_jugador
+
+    usadas = [0] * total
+    # siguiente[t] == t si al turno t le queda cancha; el índice `total` es el centinela
+    siguiente = list(range(total + 1))
+
+    def libre(t):
+        raiz = t
+        while siguiente[raiz] != raiz:
+            raiz = siguiente[raiz]
+        while siguiente[t] != raiz:  # Compresión de camino
+            siguiente[t], t = raiz, siguiente[t]
+        return raiz
+
+    listo = {}  # jugador -> primer turno en que está disponible
+    programados = []
+    for numero, (i, j) in enumerate(cruces):
+        jugadores = (*parejas[i], *parejas[j])
+        t = libre(max(listo.get(jugador, 0) for jugador in jugadores))
+        while t < total and any(t in bloqueados.get(jugador, ()) for jugador in jugadores):
+            t = libre(t + 1)
+        if t >= total:
+            raise FixtureError(
+                f"Sólo caben {numero} de {len(cruces)} partidos en los turnos y canchas disponibles."
+            )
+        usadas[t] += 1
+        if usadas[t] == canchas:
+            siguiente[t] = t + 1
+        for jugador in jugadores:
+            listo[jugador] = proximo[t]
+        programados.append((i, j, inicios[t], usadas[t]))
+    return programados
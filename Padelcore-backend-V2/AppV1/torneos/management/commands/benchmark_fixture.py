@@ -0,0 +1,39 @@
+# torneos/management/commands/benchmark_fixture.py
+
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from torneos import fixture
+
+class Command(BaseCommand):
+    help = ("Mide cuánto tarda el generador de fixtures (torneos/fixture.py) según el número "
+            "de parejas. No toca la BD; sirve para detectar regresiones de rendimiento.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--parejas', type=int, nargs='+', default=[16, 64, 128, 256, 512],
+                            help='Tamaños de campo a medir (default 16 64 128 256 512)')
+        parser.add_argument('--canchas', type=int, default=64, help='Canchas disponibles (default 64)')
+        parser.add_argument('--repeticiones', type=int, default=3,
+                            help='Corridas por tamaño; se reporta la más rápida (default 3)')
+
+    def handle(self, *args, **options):
+        inicio = datetime.date(2025, 1, 1)
+        inicios = fixture.turnos(inicio, inicio + datetime.timedelta(days=364), fixture.HORARIOS_DEFAULT, 90)
+
+        self.stdout.write(f"{'formato':<14}{'parejas':>8}{'partidos':>10}{'segundos':>10}")
+        for formato in fixture.FORMATOS:
+            for n in options['parejas']:
+                parejas = [(2 * k, 2 * k + 1) for k in range(n)]
+                mejor = None
+                for _ in range(options['repeticiones']):
+                    t0 = time.perf_counter()
+                    if formato == 'eliminatoria':
+                        cruces, _byes = fixture.eliminatoria(n)
+                    else:
+                        cruces = [c for ronda in fixture.round_robin(n) for c in ronda]
+                    programados = fixture.programar(cruces, parejas, inicios, options['canchas'], 90, 30)
+                    transcurrido = time.perf_counter() - t0
+                    mejor = transcurrido if mejor is None else min(mejor, transcurrido)
+                self.stdout.write(f"{formato:<14}{n:>8}{len(programados):>10}{mejor:>10.3f}")
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(blank=True, max_length=50, null=True, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='torneo',
+            name='factor_k',
+            field=models.PositiveIntegerField(default=32, verbose_name='Factor K (Elo)'),
+        ),
+        migrations.AddField(
+            model_name='torneo',
+            name='tags',
+            field=models.ManyToManyField(blank=True, to='torneos.tag', verbose_name='Categorías del Torneo'),
+        ),
+    ]
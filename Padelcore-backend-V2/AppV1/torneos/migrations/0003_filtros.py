@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-18 01:07
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+# Índices trigram para ?q= (nombre__icontains / sede__icontains). En Postgres
+# icontains se traduce a UPPER(col::text) LIKE UPPER('%...%'), así que el
+# índice es sobre esa misma expresión. En otras BD la búsqueda recorre la tabla.
+TRIGRAM = ('nombre', 'sede')
+
+
+def crear_trigram(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for campo in TRIGRAM:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS torneo_{campo}_trgm_idx ON torneos_torneo '
+            f'USING gin ((UPPER("{campo}"::text)) gin_trgm_ops)'
+        )
+
+
+def borrar_trigram(apps, schema_editor):
+    # La extensión se queda: puede usarla algo más
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for campo in TRIGRAM:
+        schema_editor.execute(f'DROP INDEX IF EXISTS torneo_{campo}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneos', '0002_torneo_factor_k'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_trigram, borrar_trigram),
+        migrations.AddIndex(
+            model_name='torneo',
+            index=models.Index(fields=['-fecha_inicio', '-id'], name='torneo_inicio_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='torneo',
+            index=models.Index(fields=['fecha_fin'], name='torneo_fecha_fin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='torneo',
+            index=models.Index(django.db.models.functions.text.Upper('sede'), name='torneo_sede_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# torneos/programacion.py
+"""
+Genera y publica el fixture de un torneo con la BD: lee ratings y partidos
+ya agendados de los jugadores, programa los cruces con torneos/fixture.py y
+los crea en bloque por el mismo camino que la importación masiva (equipos,
+participaciones y ranking).
+
+Lo corre la cola de trabajos (aprobaciones/trabajos.py, acción 'fixture'):
+POST /api/torneos/<id>/fixture/ sólo valida los parámetros y encola.
+"""
+import datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+
+from partidos.importacion import guardar, publicar
+from partidos.models import Participacion
+from usuarios.models import Usuario
+from .models import Torneo
+from .serializers import FixtureSerializer
+from . import fixture
+
+
+def generar(torneo_id, datos):
+    """
+    `datos` son los parámetros de FixtureSerializer tal como llegaron al
+    endpoint (ya validados ahí); se validan de nuevo para tener sus tipos.
+    Regresa el resumen que queda como resultado del trabajo. Si el fixture
+    no se puede armar lanza fixture.FixtureError.
+    """
+    torneo = Torneo.objects.filter(pk=torneo_id).first()
+    if torneo is None:
+        raise fixture.FixtureError(f"El torneo {torneo_id} ya no existe.")
+    serializer = FixtureSerializer(data=datos)
+    if not serializer.is_valid():
+        raise fixture.FixtureError(f"Parámetros inválidos: {serializer.errors}")
+    datos = serializer.validated_data
+    parejas = datos['parejas']
+    jugadores = [j for pareja in parejas for j in pareja]
+
+    ratings = dict(
+        Usuario.objects.filter(id__in=jugadores)
+        .annotate(rating_actual=Coalesce('rating', 'rating_inicial', Value(Decimal(1000))))
+        .values_list('id', 'rating_actual')
+    )
+    faltan = [str(j) for j in jugadores if j not in ratings]
+    if faltan:
+        raise fixture.FixtureError(f"Jugadores inexistentes: {', '.join(faltan)}")
+
+    byes = []
+    if datos['formato'] == 'eliminatoria':
+        parejas = sorted(parejas, key=lambda p: -sum(ratings[j] for j in p))
+        cruces, byes = fixture.eliminatoria(len(parejas))
+    else:
+        cruces = [cruce for ronda in fixture.round_robin(len(parejas)) for cruce in ronda]
+
+    ocupados = {}
+    for user_id, fecha, hora, duracion in Participacion.objects.filter(
+        usuario_id__in=jugadores, fecha__gte=torneo.fecha_inicio - datetime.timedelta(days=1),
+        fecha__lte=torneo.fecha_fin,
+    ).values_list('usuario_id', 'fecha', 'hora', 'duracion'):
+        ocupados.setdefault(user_id, []).append((datetime.datetime.combine(fecha, hora), duracion))
+
+    inicios = fixture.turnos(
+        torneo.fecha_inicio, torneo.fecha_fin,
+        datos.get('horarios') or fixture.HORARIOS_DEFAULT, datos['duracion'],
+    )
+    programados = fixture.programar(
+        cruces, parejas, inicios, datos['canchas'],
+        datos['duracion'], datos['descanso'], ocupados,
+    )
+
+    with transaction.atomic():
+        ids = guardar([
+            {
+                'torneo_id': torneo.id,
+                'fecha': inicio.date(),
+                'hora': inicio.time(),
+                'duracion': datos['duracion'],
+                'cancha': cancha,
+                'equipo_1': parejas[i],
+                'equipo_2': parejas[j],
+            }
+            for i, j, inicio, cancha in programados
+        ])
+        publicar(ids)
+
+    return {
+        "torneo": torneo.id,
+        "formato": datos['formato'],
+        "partidos": len(ids),
+        "desde": min(p[2] for p in programados).isoformat() if programados else None,
+        "hasta": max(p[2] for p in programados).isoformat() if programados else None,
+        "byes": [[str(j) for j in parejas[i]] for i in byes],
+    }
@@ -0,0 +1,59 @@
+from rest_framework import serializers
+from .models import Torneo
+from .fixture import FORMATOS
+from partidos.models import DURACION_DEFAULT, DURACION_MINIMA, DURACION_MAXIMA
+from django.core.validators import URLValidator
+from django.core.exceptions import ValidationError
+
+class TorneoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Torneo
+        fields = '__all__'
+    def validate_tags(self, value): #Esto es para cuando meta los tags
+        if len(value) > 3:
+            raise serializers.ValidationError("No puedes seleccionar más de 3 tags.")
+        tags_nombres = [tag.nombre for tag in value]
+        if "Amateur" in tags_nombres and "Profesional" in tags_nombres:
+            raise serializers.ValidationError('No puedes seleccionar "Amateur" y "Profesional" al mismo tiempo.')
+    def validate_imagen_url(self, value): #Esto es para para validar que sea un URL válido
+        validator = URLValidator()
+        try:
+            validator(value)
+        except ValidationError:
+            raise serializers.ValidationError("La URL proporcionada no es válida.")
+
+        return value
+
+
+class HorarioSerializer(serializers.Serializer):
+    inicio = serializers.TimeField()
+    fin = serializers.TimeField()
+
+    def validate(self, data):
+        if data['inicio'] >= data['fin']:
+            raise serializers.ValidationError("El horario debe terminar después de empezar.")
+        return data
+
+
+class FixtureSerializer(serializers.Serializer):
+    """Parámetros de POST /api/torneos/<id>/fixture/ (ver torneos/fixture.py)."""
+    formato = serializers.ChoiceField(choices=FORMATOS, default='round_robin')
+    parejas = serializers.ListField(
+        child=serializers.ListField(child=serializers.UUIDField(), min_length=2, max_length=2),
+        min_length=2,
+    )
+    canchas = serializers.IntegerField(min_value=1, default=4)
+    horarios = HorarioSerializer(many=True, required=False)
+    duracion = serializers.IntegerField(  # Minutos por partido; se guarda en cada Partido
+        min_value=DURACION_MINIMA, max_value=DURACION_MAXIMA, default=DURACION_DEFAULT,
+    )
+    descanso = serializers.IntegerField(min_value=0, default=30)  # Minutos entre partidos de un jugador
+
+    def validate_parejas(self, value):
+        jugadores = [j for pareja in value for j in pareja]
+        if len(set(jugadores)) != len(jugadores):
+            raise serializers.ValidationError("Cada jugador puede estar en una sola pareja.")
+        return [tuple(pareja) for pareja in value]
+
+    def validate_horarios(self, value):
+        return [(h['inicio'], h['fin']) for h in value]
@@ -0,0 +1,12 @@
+# torneos/signals.py
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from AppV1.condicional import tocar_en_m2m
+from .models import Torneo
+
+
+@receiver(m2m_changed, sender=Torneo.tags.through)
+def tags_cambiados(sender, instance, action, reverse, pk_set, **kwargs):
+    # Los tags van en el payload: que el GET condicional vea el cambio
+    tocar_en_m2m(Torneo, 'modifiedT', sender, instance, action, reverse, pk_set)
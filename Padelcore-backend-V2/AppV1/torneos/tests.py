@@ -0,0 +1,229 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from aprobaciones import trabajos
+from aprobaciones.models import Trabajo
+from partidos.models import Partido, Participacion
+from usuarios.models import Usuario
+from .models import Tag, Torneo
+from . import fixture
+
+
+class TorneoListQueriesTest(TestCase):
+    """Cada página del listado cuesta tres consultas (validadores + torneos + tags) con cualquier tamaño."""
+
+    @classmethod
+    def setUpTestData(cls):
+        tags = Tag.objects.bulk_create([Tag(nombre=f"Tag {i}") for i in range(10)])
+        cls.torneos = Torneo.objects.bulk_create([
+            Torneo(
+                nombre=f"Torneo {i}", sede="Sede",
+                fecha_inicio=datetime.date(2025, 1, 1), fecha_fin=datetime.date(2025, 1, 2),
+                imagen_url="https://example.com/t.png",
+            )
+            for i in range(200)
+        ])
+        Torneo.tags.through.objects.bulk_create([
+            Torneo.tags.through(torneo=torneo, tag=tags[(i + j) % len(tags)])
+            for i, torneo in enumerate(cls.torneos)
+            for j in range(3)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_consultas_constantes(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/torneos/', {'page_size': 500})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), len(self.torneos))
+        self.assertEqual(len(response.data['results'][0]['tags']), 3)
+
+    def test_no_crece_con_mas_torneos(self):
+        Torneo.objects.bulk_create([
+            Torneo(
+                nombre=f"Extra {i}", sede="Sede",
+                fecha_inicio=datetime.date(2025, 2, 1), fecha_fin=datetime.date(2025, 2, 2),
+                imagen_url="https://example.com/t.png",
+            )
+            for i in range(300)
+        ])
+        with self.assertNumQueries(3):
+            self.client.get('/api/torneos/')
+
+    def test_filtro_por_tags_conserva_todos_los_tags(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/torneos/', {'tags': 'Tag 0,Tag 1', 'page_size': 500})
+        resultados = response.data['results']
+        # Torneo i tiene los tags i, i+1, i+2 (mod 10): 0 y 1 juntos sólo con i % 10 en (9, 0)
+        self.assertEqual(len(resultados), 40)
+        for torneo in resultados:
+            self.assertEqual(len(torneo['tags']), 3)
+
+
+class TorneoFiltrosTest(TestCase):
+    """Filtros de GET /api/torneos/."""
+
+    @classmethod
+    def setUpTestData(cls):
+        hoy = timezone.localdate()
+        dia = datetime.timedelta(days=1)
+
+        def torneo(nombre, sede, inicio, fin):
+            return Torneo.objects.create(
+                nombre=nombre, sede=sede, fecha_inicio=inicio, fecha_fin=fin,
+                imagen_url="https://example.com/t.png",
+            )
+
+        cls.pasado = torneo("Copa Otoño", "Club Norte", hoy - 30 * dia, hoy - 28 * dia)
+        cls.en_curso = torneo("Abierto de Verano", "Club Sur", hoy - dia, hoy + dia)
+        cls.proximo = torneo("Copa Primavera", "club norte", hoy + 10 * dia, hoy + 12 * dia)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def ids(self, **params):
+        response = self.client.get('/api/torneos/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [t['id'] for t in response.data['results']]
+
+    def test_orden_y_estado(self):
+        self.assertEqual(self.ids(), [self.proximo.id, self.en_curso.id, self.pasado.id])
+        self.assertEqual(self.ids(estado='proximo'), [self.proximo.id])
+        self.assertEqual(self.ids(estado='en_curso'), [self.en_curso.id])
+        self.assertEqual(self.ids(estado='pasado'), [self.pasado.id])
+        self.assertEqual(self.client.get('/api/torneos/', {'estado': 'otro'}).status_code, 400)
+        # El total no depende del tamaño de página
+        self.assertEqual(self.client.get('/api/torneos/conteo/', {'estado': 'en_curso'}).data, {"count": 1})
+        self.assertEqual(self.client.get('/api/torneos/conteo/').data['count'], 3)
+
+    def test_rango_de_fechas_por_traslape(self):
+        hoy = timezone.localdate()
+        self.assertEqual(self.ids(desde=str(hoy), hasta=str(hoy + datetime.timedelta(days=10))),
+                         [self.proximo.id, self.en_curso.id])
+        self.assertEqual(self.client.get('/api/torneos/', {'desde': 'ayer'}).status_code, 400)
+
+    def test_sede_y_busqueda(self):
+        self.assertEqual(self.ids(sede='CLUB NORTE'), [self.proximo.id, self.pasado.id])
+        self.assertEqual(self.ids(q='copa'), [self.proximo.id, self.pasado.id])
+        self.assertEqual(self.ids(q='copa sur'), [])
+        self.assertEqual(self.ids(q='verano sur'), [self.en_curso.id])
+
+    def test_etag_por_filtro(self):
+        etag = self.client.get('/api/torneos/', {'estado': 'pasado'})['ETag']
+        self.assertNotEqual(etag, self.client.get('/api/torneos/')['ETag'])
+        response = self.client.get('/api/torneos/', {'estado': 'pasado'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.pasado.nombre = "Copa Otoño 2"
+        self.pasado.save()
+        response = self.client.get('/api/torneos/', {'estado': 'pasado'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # Los tags van en el payload aunque sean un ManyToMany
+        etag = response['ETag']
+        self.pasado.tags.add(Tag.objects.create(nombre="Veteranos"))
+        response = self.client.get('/api/torneos/', {'estado': 'pasado'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class FixtureTest(TestCase):
+    """Generador de fixtures (torneos/fixture.py) y POST /api/torneos/<id>/fixture/."""
+
+    def pedir(self, torneo, datos):
+        """POST del fixture: encola y responde 202; procesar() es lo que corre el worker."""
+        response = APIClient().post(f'/api/torneos/{torneo.id}/fixture/', datos, format='json')
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertFalse(Partido.objects.filter(torneo=torneo).exists())
+        trabajos.procesar()
+        return Trabajo.objects.get(pk=response.data['trabajo_id'])
+
+    def test_round_robin_sin_encimar_jugadores(self):
+        parejas = [(2 * k, 2 * k + 1) for k in range(9)]
+        cruces = [c for ronda in fixture.round_robin(len(parejas)) for c in ronda]
+        self.assertEqual(len({frozenset(c) for c in cruces}), 9 * 8 // 2)
+
+        inicios = fixture.turnos(datetime.date(2025, 1, 1), datetime.date(2025, 1, 5), fixture.HORARIOS_DEFAULT, 60)
+        ocupados = {0: [(datetime.datetime(2025, 1, 1, 9), 60)]}
+        programados = fixture.programar(cruces, parejas, inicios, 3, 60, 30, ocupados)
+
+        por_turno = {}
+        ultimo = {0: datetime.datetime(2025, 1, 1, 9)}
+        for i, j, inicio, cancha in sorted(programados, key=lambda p: p[2]):
+            por_turno.setdefault(inicio, set()).add(cancha)
+            for jugador in parejas[i] + parejas[j]:
+                if jugador in ultimo:
+                    self.assertGreaterEqual(inicio - ultimo[jugador], datetime.timedelta(minutes=90))
+                ultimo[jugador] = inicio
+        self.assertTrue(all(canchas <= {1, 2, 3} for canchas in por_turno.values()))
+
+    def test_eliminatoria_con_byes(self):
+        cruces, byes = fixture.eliminatoria(6)
+        self.assertEqual(cruces, [(3, 4), (2, 5)])
+        self.assertEqual(byes, [0, 1])
+
+    def test_no_caben(self):
+        inicios = fixture.turnos(datetime.date(2025, 1, 1), datetime.date(2025, 1, 1), fixture.HORARIOS_DEFAULT, 90)
+        cruces = [c for ronda in fixture.round_robin(8) for c in ronda]
+        with self.assertRaises(fixture.FixtureError):
+            fixture.programar(cruces, [(k,) for k in range(8)], inicios, 1, 90, 0)
+
+    def test_endpoint(self):
+        jugadores = Usuario.objects.bulk_create([
+            Usuario(email=f"f{i}@test.com", nombre_completo=f"F {i}") for i in range(12)
+        ])
+        torneo = Torneo.objects.create(
+            nombre="Fixture", sede="Sede", fecha_inicio=datetime.date(2025, 3, 1),
+            fecha_fin=datetime.date(2025, 3, 3), imagen_url="https://example.com/t.png",
+        )
+        parejas = [[str(jugadores[2 * k].id), str(jugadores[2 * k + 1].id)] for k in range(6)]
+
+        trabajo = self.pedir(torneo, {'parejas': parejas, 'canchas': 2, 'horarios': [{'inicio': '10:00', 'fin': '20:00'}]})
+
+        self.assertEqual(trabajo.estado, 'hecho')
+        self.assertEqual(trabajo.resultado['partidos'], 15)
+        partidos = Partido.objects.filter(torneo=torneo)
+        self.assertEqual(partidos.count(), 15)
+        self.assertEqual(Participacion.objects.filter(partido__torneo=torneo).count(), 60)
+        self.assertFalse(partidos.filter(cancha__isnull=True).exists())
+
+    def test_duracion_corta_sin_falsos_choques(self):
+        """Los partidos se guardan con la duración del fixture y la agenda usa esa, no 90 fijos."""
+        jugadores = Usuario.objects.bulk_create([
+            Usuario(email=f"d{i}@test.com", nombre_completo=f"D {i}") for i in range(8)
+        ])
+        torneo = Torneo.objects.create(
+            nombre="Express", sede="Sede", fecha_inicio=datetime.date(2025, 4, 1),
+            fecha_fin=datetime.date(2025, 4, 1), imagen_url="https://example.com/t.png",
+        )
+        parejas = [[str(jugadores[2 * k].id), str(jugadores[2 * k + 1].id)] for k in range(4)]
+        self.assertEqual(self.pedir(torneo, {'parejas': parejas, 'canchas': 1, 'duracion': 60, 'descanso': 0}).estado, 'hecho')
+        self.assertEqual(set(Partido.objects.filter(torneo=torneo).values_list('duracion', flat=True)), {60})
+        self.assertEqual(APIClient().get(f'/api/torneos/{torneo.id}/conflictos/').data['total'], 0)
+
+    def test_errores(self):
+        jugadores = Usuario.objects.bulk_create([
+            Usuario(email=f"e{i}@test.com", nombre_completo=f"E {i}") for i in range(16)
+        ])
+        torneo = Torneo.objects.create(
+            nombre="Corto", sede="Sede", fecha_inicio=datetime.date(2025, 5, 1),
+            fecha_fin=datetime.date(2025, 5, 1), imagen_url="https://example.com/t.png",
+        )
+        parejas = [[str(jugadores[2 * k].id), str(jugadores[2 * k + 1].id)] for k in range(8)]
+
+        # Un jugador inexistente se rechaza en el request, sin encolar
+        response = APIClient().post(
+            f'/api/torneos/{torneo.id}/fixture/',
+            {'parejas': parejas[:-1] + [[parejas[-1][0], '00000000-0000-0000-0000-000000000000']]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Trabajo.objects.exists())
+
+        # 28 partidos en un día y una cancha no caben: falla una vez, sin reintentos
+        trabajo = self.pedir(torneo, {'parejas': parejas, 'canchas': 1})
+        self.assertEqual((trabajo.estado, trabajo.intentos), ('fallido', 1))
+        self.assertIn('turnos', trabajo.error)
@@ -0,0 +1,147 @@
+import datetime
+
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from AppV1.condicional import ConditionalGetMixin
+from AppV1.pagination import ConteoMixin, KeysetPagination
+from aprobaciones import trabajos
+from partidos.agenda import conflictos_torneo
+from usuarios.models import Usuario
+from .models import Torneo
+from .serializers import TorneoSerializer, FixtureSerializer
+
+ESTADOS = ('proximo', 'en_curso', 'pasado')
+
+
+class TorneoPagination(KeysetPagination):
+    ordering = ('-fecha_inicio', '-id')  # Índice torneo_inicio_id_idx
+
+
+class TorneoViewSet(ConteoMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = Torneo.objects.prefetch_related('tags')  # Una consulta de tags para toda la lista
+    serializer_class = TorneoSerializer
+    pagination_class = TorneoPagination
+    campo_modificado = 'modifiedT'
+
+    def get_queryset(self):
+        """
+        Filtros del listado y de conteo/ (todos opcionales y combinables):
+        ?desde=&hasta=   torneos que se traslapan con el rango (YYYY-MM-DD)
+        ?sede=           sede exacta, sin importar mayúsculas
+        ?tags=a,b        torneos con TODOS esos tags
+        ?estado=         proximo | en_curso | pasado (respecto a hoy)
+        ?q=              palabras que deben aparecer en nombre o sede
+        """
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'conteo'):
+            return queryset
+        params = self.request.query_params
+
+        desde, hasta = self._parse_fecha('desde'), self._parse_fecha('hasta')
+        if desde:
+            queryset = queryset.filter(fecha_fin__gte=desde)
+        if hasta:
+            queryset = queryset.filter(fecha_inicio__lte=hasta)
+
+        if params.get('sede'):
+            queryset = queryset.filter(sede__iexact=params['sede'].strip())
+
+        # Un EXISTS por tag en vez de un JOIN: no duplica torneos y deja
+        # intacto el prefetch, que sigue trayendo todos los tags de cada uno.
+        for nombre in {t.strip() for t in params.get('tags', '').split(',') if t.strip()}:
+            queryset = queryset.filter(Exists(
+                Torneo.tags.through.objects.filter(torneo_id=OuterRef('pk'), tag__nombre=nombre)
+            ))
+
+        estado = params.get('estado')
+        if estado:
+            if estado not in ESTADOS:
+                raise ValidationError({"estado": f"Debe ser uno de: {', '.join(ESTADOS)}."})
+            hoy = timezone.localdate()
+            if estado == 'proximo':
+                queryset = queryset.filter(fecha_inicio__gt=hoy)
+            elif estado == 'en_curso':
+                queryset = queryset.filter(fecha_inicio__lte=hoy, fecha_fin__gte=hoy)
+            else:
+                queryset = queryset.filter(fecha_fin__lt=hoy)
+
+        # En Postgres icontains usa los índices trigram de la migración 0003
+        for palabra in params.get('q', '').split():
+            queryset = queryset.filter(Q(nombre__icontains=palabra) | Q(sede__icontains=palabra))
+        return queryset
+
+    def _parse_fecha(self, param):
+        valor = self.request.query_params.get(param)
+        if not valor:
+            return None
+        try:
+            return datetime.date.fromisoformat(valor)
+        except ValueError:
+            raise ValidationError({param: "Formato de fecha inválido, usa YYYY-MM-DD."})
+
+    def create(self, request, *args, **kwargs):
+        print("Datos recibidos:", request.data)  # Muestra los datos en la terminal
+        print("Errores:", self.serializer_class(data=request.data).is_valid(raise_exception=False))
+        return super().create(request, *args, **kwargs)
+
+    @action(detail=True, methods=['get'])
+    def conflictos(self, request, pk=None):
+        """
+        GET /api/torneos/<id>/conflictos/
+        Jugadores con dos partidos encimados donde al menos uno es de este torneo
+        (el otro puede ser de otro torneo). Ver partidos/agenda.py.
+        """
+        torneo = self.get_object()
+        reporte = conflictos_torneo(torneo.id)
+        return Response({"torneo": torneo.id, "total": len(reporte), "conflictos": reporte})
+
+    @action(detail=True, methods=['post'])
+    def fixture(self, request, pk=None):
+        """
+        POST /api/torneos/<id>/fixture/
+        {"formato": "round_robin"|"eliminatoria", "parejas": [[id, id], ...], "canchas": 4,
+         "horarios": [{"inicio": "09:00", "fin": "21:00"}], "duracion": 90, "descanso": 30}
+        Genera los cruces, les asigna día/hora/cancha entre fecha_inicio y fecha_fin
+        sin encimar jugadores (tampoco con sus partidos de otros torneos) y los
+        crea en bloque. Con eliminatoria crea la primera ronda, sembrada por rating.
+
+        Sólo valida y encola (torneos/programacion.py en la cola de
+        aprobaciones/trabajos.py): responde 202 con el trabajo, cuyo resultado
+        (partidos creados, rango de fechas, byes) se consulta en su url.
+        """
+        torneo = self.get_object()
+        serializer = FixtureSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        jugadores = {j for pareja in serializer.validated_data['parejas'] for j in pareja}
+        faltan = jugadores - set(Usuario.objects.filter(id__in=jugadores).values_list('id', flat=True))
+        if faltan:
+            raise ValidationError({"parejas": f"Jugadores inexistentes: {', '.join(sorted(map(str, faltan)))}"})
+
+        datos = {campo: request.data[campo] for campo in serializer.fields if campo in request.data}
+        trabajo = trabajos.encolar('fixture', [torneo.id], datos)
+        return Response(
+            {
+                "detail": "El fixture se está generando.",
+                "trabajo_id": trabajo.id,
+                "estado": trabajo.estado,
+                "url": reverse('aprobacion-trabajo', kwargs={'trabajo_id': trabajo.id}, request=request),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+#from django.shortcuts import render
+
+# Create your views here.
+#from rest_framework import viewsets
+#from .models import Torneo
+#from .serializers import TorneoSerializer
+
+#class TorneoViewSet(viewsets.ModelViewSet):
+#    queryset = Torneo.objects.all()
+#    serializer_class = TorneoSerializer
\ No newline at end of file
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='rating',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=6, null=True, verbose_name='Rating Elo actual'),
+        ),
+    ]
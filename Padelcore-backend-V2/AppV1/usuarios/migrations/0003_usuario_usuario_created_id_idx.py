@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 00:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('usuarios', '0002_usuario_rating'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(fields=['-createdU', '-id'], name='usuario_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from rest_framework import viewsets
+from rest_framework.response import Response
+from AppV1.condicional import ConditionalGetMixin
+from AppV1.pagination import ConteoMixin, KeysetPagination
+from .models import Usuario
+from .serializers import UsuarioSerializer
+from actividad import outbox
+from actividad.models import ActividadReciente
+from django.db import transaction
+from django.utils import timezone
+
+
+class UsuarioPagination(KeysetPagination):
+    ordering = ('-createdU', '-id')  # Índice usuario_created_id_idx
+
+
+class UsuarioViewSet(ConteoMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = Usuario.objects.all()
+    serializer_class = UsuarioSerializer
+    pagination_class = UsuarioPagination
+    campo_modificado = 'modifiedU'
+
+    @transaction.atomic  # Usuario, actividad y evento se confirman (o revierten) juntos
+    def create(self, request, *args, **kwargs):
+        # 1) Llamamos al create original de DRF, que crea el usuario y retorna su data
+        response = super().create(request, *args, **kwargs)
+        
+        # 2) Con el 'id' recién creado, obtenemos la instancia del usuario
+        new_user_id = response.data["id"]  # asumiendo que 'id' viene en la respuesta
+        usuario = Usuario.objects.get(id=new_user_id)
+        
+        # 3) Creamos la actividad: tipo='usuario', estado=''
+        actividad = ActividadReciente.objects.create(
+            fecha=timezone.now(),
+            tipo='usuario',
+            descripcion=f"Se ha registrado un jugador: {usuario.nombre_completo}",
+            estado='directo',  
+        )
+        
+        # 4) Dejamos el evento de WebSocket en el outbox (lo manda relevar_eventos)
+        data = {
+            "id": actividad.id,       # para identificar la actividad
+            "fecha": str(actividad.fecha),
+            "tipo": actividad.tipo, 
+            "descripcion": actividad.descripcion,
+            "estado": actividad.estado,
+        }
+        outbox.publicar("actividad", "actividad_message", data)  # "actividad" coincide con ActividadConsumer
+
+        # 5) Retornamos la misma respuesta
+        return response
+
+
+
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { motion } from 'framer-motion';
 import { Card } from '@/components/ui/card';
 import { Input } from '@/components/ui/input';
@@ -46,6 +46,7 @@ import {
   fetchTorneos,
   fetchUsuarios,
   fetchPartidos,
+  fetchConteo,
   fetchActividades
 } from '@/lib/api';
 
@@ -155,11 +156,15 @@ export function AdminDashboard() {
     };
 
     socket.onmessage = (event) => {
-      const data = JSON.parse(event.data) as Aprobacion;
+      const data = JSON.parse(event.data) as Aprobacion & { ids?: number[] };
       console.log('Mensaje WS aprobaciones:', data);
 
       // Lógica para insertar o quitar de la lista:
-      if (data.status === 'pending') {
+      if (data.ids) {
+        // Lote aprobado/rechazado: un solo mensaje con todos los ids
+        const procesadas = new Set(data.ids);
+        setPendingApprovals((prev) => prev.filter((ap) => !procesadas.has(ap.id)));
+      } else if (data.status === 'pending') {
         // Inserta en pendingApprovals si no existe
         setPendingApprovals((prev) => {
           const exists = prev.find((ap) => ap.id === data.id);
@@ -202,16 +207,15 @@ export function AdminDashboard() {
     loadActividades();
   }, []);
   //Websockets para "actividad"
+  // Cada mensaje trae `seq`; al reconectar pedimos sólo lo que nos faltó (?since=)
+  // en lugar de recargar todo el listado.
+  const actividadSeq = useRef<number | null>(null);
   useEffect(() => {
-    const socket = new WebSocket('ws://127.0.0.1:8000/ws/actividad/');
-    socket.onopen = () => {
-      console.log('WS Actividad conectado');
-    };
-    socket.onmessage = async (event) => {
-      console.log('Mensaje WS actividad:', event.data);
+    let socket: WebSocket;
+    let reintento: ReturnType<typeof setTimeout>;
+    let cerrado = false;
 
-      // Cada vez que llegue un mensaje, re-fetch para tener
-      // la lista actualizada (en lugar de insertar local).
+    const recargar = async () => {
       try {
         const data = await fetchActividades();
         setActividades(data);
@@ -219,10 +223,39 @@ export function AdminDashboard() {
         console.error('Error al recargar actividades tras WS:', error);
       }
     };
-    socket.onclose = () => console.log('WS Actividad cerrado');
-    socket.onerror = (err) => console.error('WS Actividad error:', err);
 
-    return () => socket.close();
+    const conectar = () => {
+      const since = actividadSeq.current !== null ? `?since=${actividadSeq.current}` : '';
+      socket = new WebSocket(`ws://127.0.0.1:8000/ws/actividad/${since}`);
+      socket.onopen = () => {
+        console.log('WS Actividad conectado');
+      };
+      socket.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (data.recargar) {
+          // El servidor ya no tiene el historial desde nuestro seq
+          actividadSeq.current = null;
+          recargar();
+          return;
+        }
+        if (typeof data.seq === 'number') actividadSeq.current = data.seq;
+        // Un resumen de ráfaga ("37 nuevos jugadores registrados") trae en `ids` las actividades que agrupa
+        const ids: number[] = data.resumen ? data.ids : [data.id];
+        setActividades((prev) => [data, ...prev.filter((item) => !ids.includes(item.id))]);
+      };
+      socket.onclose = () => {
+        console.log('WS Actividad cerrado');
+        if (!cerrado) reintento = setTimeout(conectar, 1000);
+      };
+      socket.onerror = (err) => console.error('WS Actividad error:', err);
+    };
+
+    conectar();
+    return () => {
+      cerrado = true;
+      clearTimeout(reintento);
+      socket.close();
+    };
   }, []);
   // =======================
   // Cargar Usuarios, Torneos, Partidos => y calcular stats
@@ -231,9 +264,9 @@ export function AdminDashboard() {
   useEffect(() => {
     const loadUsuarios = async () => {
       try {
-        const data = await fetchUsuarios();
+        const data = await fetchUsuarios(); // Todas las páginas: se usan en los selectores de equipos
         setUsuarios(data);
-        setUsuariosActivos(data.length); //Usuarios Activos BETA, será 0 por el momento
+        setUsuariosActivos(await fetchConteo('usuarios')); //Usuarios Activos BETA: por ahora, todos los registrados
       } catch (error) {
         console.error('Error al cargar usuarios:', error);
       }
@@ -247,18 +280,8 @@ export function AdminDashboard() {
       try {
         const data = await fetchTorneos();
         setTorneos(data);
-        //Torneos activos
-        const hoy = new Date();
-        let countActivos = 0;
-        data.forEach((torneo: Torneo) => {
-          const inicio = new Date(torneo.fecha_inicio);
-          const fin = new Date(torneo.fecha_fin);
-
-          if (hoy >= inicio && hoy <= fin) {
-            countActivos++;
-          }
-        });
-        setTorneosActivos(countActivos);
+        //Torneos activos (el backend filtra por fecha de hoy)
+        setTorneosActivos(await fetchConteo('torneos', { estado: 'en_curso' }));
       } catch (error) {
         console.error('Error al cargar torneos:', error);
       }
@@ -270,15 +293,11 @@ export function AdminDashboard() {
   useEffect(() => {
     const loadPartidos = async () => {
       try {
-        const data = await fetchPartidos();
-        setPartidos(data);
-        // “Partidos Hoy”: filtra los que tengan fecha == hoy (YYYY-MM-DD)
+        // “Partidos Hoy”: el backend filtra por fecha (YYYY-MM-DD)
         const hoyIso = new Date().toISOString().split('T')[0];
-        const hoyCount = data.filter((partido) => partido.fecha_hora.split('T')[0] === hoyIso).length;
-
-        // OJO: en tu “Partido” has 'fecha_hora'; verifica si es parted
-        // Si usas 'fecha' y 'hora' separadas, hazlo distinto. Ajusta la lógica
-        setPartidosHoy(hoyCount);
+        const data = await fetchPartidos({ fecha: hoyIso });
+        setPartidos(data);
+        setPartidosHoy(data.length);
       } catch (error) {
         console.error('Error al cargar partidos:', error);
       }
@@ -293,14 +312,14 @@ export function AdminDashboard() {
       if (isApproved) {
         await approveAprobacion(id); // PATCH /aprobaciones/<id>/approve/
         toast({
-          title: 'Aprobado',
-          description: 'La solicitud ha sido aprobada exitosamente.',
+          title: 'Aprobando',
+          description: 'La solicitud se está procesando; se actualizará al terminar.',
         });
       } else {
         await rejectAprobacion(id); // PATCH /aprobaciones/<id>/reject/
         toast({
-          title: 'Rechazado',
-          description: 'La solicitud ha sido rechazada.',
+          title: 'Rechazando',
+          description: 'La solicitud se está procesando; se actualizará al terminar.',
           variant: 'destructive',
         });
       }
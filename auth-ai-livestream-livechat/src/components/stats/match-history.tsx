@@ -10,7 +10,7 @@ import {
 } from '@/components/ui/table';
 import { Badge } from '@/components/ui/badge';
 import { useAuth } from '../auth/auth-provider';
-import { fetchPartidos } from '@/lib/api';
+import { fetchHistorialJugador } from '@/lib/api';
 import { Partido } from '@/lib/types';
 
 
@@ -24,22 +24,8 @@ export function MatchHistory() {
 
     const loadMatches = async () => {
       try {
-        // 1) Obtener todos los partidos del backend
-        const allMatches = await fetchPartidos()
-
-        // 2) Filtrar los que involucren al user actual:
-        //    equipo_1 y equipo_2 son arrays de IDs (string[]),
-        //    y user.id lo convertimos a string para comparar
-        const userId = String(user.id)
-
-        const filtered = allMatches.filter((match) => {
-          return (
-            match.equipo_1.includes(userId) ||
-            match.equipo_2.includes(userId)
-          )
-        })
-
-        setMatches(filtered)
+        // Sólo los partidos del user actual, filtrados en el backend (todas las páginas)
+        setMatches(await fetchHistorialJugador(String(user.id)))
       } catch (error) {
         console.error('Error al cargar partidos:', error)
       }
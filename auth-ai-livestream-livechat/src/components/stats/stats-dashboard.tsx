@@ -8,27 +8,24 @@ import { HeadToHead } from './head-to-head';
 import { ProgressTracking } from './progress-tracking';
 import { Trophy, TrendingUp, Users, Activity } from 'lucide-react';
 import { useAuth } from '../auth/auth-provider';
-import { fetchPartidos, fetchDailyRanking } from '@/lib/api';
-import { Partido, RankingRecord } from '@/lib/types';
+import { fetchEstadisticasJugador, fetchPosicionRanking } from '@/lib/api';
 
 
 export function StatsDashboard() {
   const { user } = useAuth();
   const [partidosCount, setPartidosCount] = useState(0)
+  const [victorias, setVictorias] = useState(0)
   const [playerRank, setPlayerRank] = useState<string | number>('---');
 
-  // 2) Cargar la lista de partidos y filtrar
+  // 2) Partidos y victorias del jugador, de su fila de estadísticas (GET /estadisticas/<id>/)
   useEffect(() => {
     if (!user) return
-    const userId = String(user.id)
 
     const loadMatches = async () => {
       try {
-        const allMatches = await fetchPartidos()
-        const filtered = allMatches.filter((match: Partido) => 
-          match.equipo_1.includes(userId) || match.equipo_2.includes(userId)
-        )
-        setPartidosCount(filtered.length);
+        const estadisticas = await fetchEstadisticasJugador(String(user.id))
+        setPartidosCount(estadisticas.partidos);
+        setVictorias(estadisticas.ganados);
       } catch (error) {
         console.error('Error al cargar partidos:', error)
       }
@@ -44,16 +41,9 @@ export function StatsDashboard() {
       try {
         // Asumimos 'hoy' => date= new Date().toISOString().split('T')[0]
         const todayIso = new Date().toISOString().split('T')[0]
-        const rankingRecords = await fetchDailyRanking(todayIso)
-
-        // Buscar si hay un RankingRecord del user
-        const record = rankingRecords.find((r: RankingRecord) => r.user === user.id)
-        if (record) {
-          setPlayerRank(record.position) // p.ej. 1, 2, etc.
-        } else {
-          // no está en la lista => '---'
-          setPlayerRank('---')
-        }
+        // Sólo la posición del user (around con radius=0), no el ranking completo
+        const position = await fetchPosicionRanking(String(user.id), todayIso)
+        setPlayerRank(position ?? '---') // no está en la lista => '---'
       } catch (error) {
         console.error('Error loading daily ranking:', error)
         setPlayerRank('---')
@@ -65,7 +55,7 @@ export function StatsDashboard() {
     { label: 'Ranking', value: playerRank, icon: Trophy },         
     { label: 'Puntos', value: user?.rating_inicial ?? 0, icon: TrendingUp },
     { label: 'Partidos', value: partidosCount, icon: Activity },
-    { label: 'Victorias', value: '0', icon: Users },         // dummy
+    { label: 'Victorias', value: victorias, icon: Users },
   ];
 
   return (
@@ -2,6 +2,7 @@ import axios from 'axios';
 import { 
     Usuario,  
     Partido, 
+    Torneo,
     Aprobacion,
     ActividadReciente,
     UsuarioForm,
@@ -13,27 +14,58 @@ const API = axios.create({
     baseURL: 'http://127.0.0.1:8000/api', // Dirección base del backend
 });
 
+// Los listados vienen paginados: { next, previous, results }. Para tener el
+// conjunto completo hay que seguir `next` (ya trae los filtros) hasta que sea null.
+async function fetchTodas<T>(url: string, params: Record<string, string | number> = {}): Promise<T[]> {
+    let response = await API.get(url, { params });
+    const resultados: T[] = [...response.data.results];
+    while (response.data.next) {
+        response = await API.get(response.data.next);
+        resultados.push(...response.data.results);
+    }
+    return resultados;
+}
+
+// Total de un listado con sus filtros, sin traer las filas: GET /<recurso>/conteo/
+export const fetchConteo = async (
+    recurso: 'usuarios' | 'partidos' | 'torneos',
+    params: Record<string, string | number> = {},
+): Promise<number> => {
+    const response = await API.get(`/${recurso}/conteo/`, { params });
+    return response.data.count;
+};
+
 // Función para obtener todos los usuarios
 export const fetchUsuarios = async (): Promise<Usuario[]> => {
-    const response = await API.get('/usuarios/');
-    return response.data;
+    return fetchTodas<Usuario>('/usuarios/', { page_size: 500 });
   };
   
 
-// Función para obtener todos los torneos
-export const fetchTorneos = async () => {
+// Función para obtener todos los torneos (paginados por cursor, más recientes primero)
+// Filtros opcionales: desde, hasta, sede, tags ("a,b"), estado (proximo|en_curso|pasado), q
+export const fetchTorneos = async (params: Record<string, string | number> = {}): Promise<Torneo[]> => {
     try {
-        const response = await API.get('/torneos/');
-        return response.data;
+        return await fetchTodas<Torneo>('/torneos/', { page_size: 500, ...params });
     } catch (error: any) {
         console.error('Error fetching torneos:', error.response || error.message);
         throw new Error('Error al obtener torneos');
     }
 };
 
-//función para obtener todos los partidos
-export const fetchPartidos = async (): Promise<Partido[]> => {
-    const response = await API.get('/partidos/');
+//función para obtener todos los partidos (filtro opcional: fecha=YYYY-MM-DD)
+export const fetchPartidos = async (params: Record<string, string | number> = {}): Promise<Partido[]> => {
+    return fetchTodas<Partido>('/partidos/', { page_size: 500, ...params });
+  };
+
+// Partidos de un jugador (GET /partidos/historial/?user=), filtrados en el backend
+export const fetchHistorialJugador = async (userId: string): Promise<Partido[]> => {
+    const filas = await fetchTodas<{ partido: Partido }>('/partidos/historial/', { user: userId, page_size: 500 });
+    return filas.map((fila) => fila.partido);
+  };
+
+// Estadísticas de perfil del jugador: partidos, ganados, perdidos, racha...
+export const fetchEstadisticasJugador = async (userId: string) => {
+    const response = await API.get(`/estadisticas/${userId}/`);
     return response.data;
   };
 
@@ -64,6 +96,15 @@ export const rejectAprobacion = async (id: number) => {
     const response = await API.patch(`/aprobaciones/${id}/reject/`);
     return response.data;
   };
+// Aprobar / rechazar varias solicitudes en un solo request
+export const approveAprobaciones = async (ids: number[]) => {
+    const response = await API.post('/aprobaciones/batch-approve/', { ids });
+    return response.data;
+  };
+export const rejectAprobaciones = async (ids: number[]) => {
+    const response = await API.post('/aprobaciones/batch-reject/', { ids });
+    return response.data;
+  };
 // 4)Función para mandar a la tabla de aprobaciones
 export const createAprobacion = async (payload: {
     tipo: 'tournament' | 'match';
@@ -75,12 +116,23 @@ export const createAprobacion = async (payload: {
   };
   export const fetchActividades = async (): Promise<ActividadReciente[]> => {
     const response = await API.get('/actividades/');
-    return response.data;
+    return response.data.results;
   };
 
 
 export async function fetchDailyRanking(date: string): Promise<RankingRecord[]> {
     // Ejemplo: GET /api/ranking/records/?date=2025-07-01
-    const response = await API.get(`/ranking/records/?date=${date}`)
-    return response.data
+    // La respuesta viene paginada: { count, next, previous, results }; juntamos todas las páginas
+    return fetchTodas<RankingRecord>('/ranking/records/', { date })
+}
+
+// Posición de un jugador en el ranking de la fecha (null si no aparece)
+export async function fetchPosicionRanking(userId: string, date: string): Promise<number | null> {
+    try {
+        const response = await API.get('/ranking/records/around/', { params: { user: userId, date, radius: 0 } })
+        return response.data.position
+    } catch (error: any) {
+        if (error.response?.status === 404) return null
+        throw error
+    }
 }
\ No newline at end of file